@@ -3,27 +3,58 @@
 from __future__ import annotations
 
 from datetime import datetime, UTC
+from typing import AsyncIterator, Iterator
 
-from fastapi import APIRouter, Query
+import anyio
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 
+from app.core import config
+from app.core.admission import PRIORITY_DETAIL, PRIORITY_EXPORT, request_priority
 from app.core.api_docs import (
     BrowseGenreResponse,
     BrowseTitlesResponse,
+    ContributorSearchResponse,
     DEFAULT_ERROR_RESPONSES,
     ErrorResponse,
 )
 from app.core.exceptions import InvalidInputError
+from app.core.query_control import statement_timeout
 from app.service_logic.browse_service_logic import (
     browse_genres as browse_genres_service,
     browse_titles as browse_titles_service,
+    export_titles as export_titles_service,
+)
+from app.service_logic.contributor_service_logic import (
+    search_contributors as search_contributors_service,
 )
 
 router = APIRouter(prefix="/browse", tags=["browse"])
 MAX_PAGE_SIZE = 50
+MAX_FILTER_GENRES = 20
+MAX_NAME_FILTER_LENGTH = 50
+MAX_CONTRIBUTOR_QUERY_LENGTH = 100
+GENRE_MODES = ("any", "all")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+BROWSE_SORTS = (
+    "title_asc",
+    "title_desc",
+    "release_year_asc",
+    "release_year_desc",
+    "cast_size_desc",
+    "relevance",
+)
+MATCH_MODES = ("auto", "exact", "fuzzy")
+BROWSE_FACETS = ("genre", "year")
 
 
 @router.get(
     "/genres",
+    dependencies=[
+        Depends(request_priority(PRIORITY_DETAIL)),
+        Depends(statement_timeout(config.STATEMENT_TIMEOUT_DETAIL_MS)),
+    ],
     response_model=list[BrowseGenreResponse],
     summary="List Browse Genres",
     description=(
@@ -42,15 +73,147 @@ def browse_genres() -> list[dict]:
     return browse_genres_service()
 
 
+def browse_filter_params(
+    search_text: str | None = Query(
+        None,
+        description=(
+            "Optional free-text query. Search tokens are matched against movie title, "
+            "contributor name, genre name, and release year text."
+        ),
+        examples=["matrix keanu"],
+    ),
+    release_year: str | None = Query(
+        None,
+        description=(
+            "Optional release year filter. Expected type: integer. "
+            "Must be less than the current year."
+        ),
+        examples=["1999"],
+    ),
+    genre: str | None = Query(
+        None,
+        description="Optional genre filter. Expected type: integer genre ID.",
+        examples=["1"],
+    ),
+    year_from: str | None = Query(
+        None,
+        description=(
+            "Optional inclusive lower release year bound. Expected type: integer. "
+            "Must be less than the current year."
+        ),
+        examples=["1990"],
+    ),
+    year_to: str | None = Query(
+        None,
+        description=(
+            "Optional inclusive upper release year bound. Expected type: integer. "
+            "Must be less than the current year and not below `year_from`."
+        ),
+        examples=["1999"],
+    ),
+    genres: str | None = Query(
+        None,
+        description=(
+            "Optional comma-separated genre IDs, combined according to `genre_mode`. "
+            f"At most {MAX_FILTER_GENRES} IDs."
+        ),
+        examples=["1,2,3"],
+    ),
+    genre_mode: str | None = Query(
+        None,
+        description=(
+            "How `genres` are combined: `any` (movie has at least one) or `all` "
+            "(movie has every genre). Defaults to `any`."
+        ),
+        examples=["all"],
+    ),
+    media_type: str | None = Query(
+        None,
+        description="Optional media type name filter, e.g. `movie`.",
+        examples=["movie"],
+    ),
+    contributor_id: str | None = Query(
+        None,
+        description="Optional filter to movies linked to one contributor. Expected type: integer.",
+        examples=["7"],
+    ),
+    role: str | None = Query(
+        None,
+        description=(
+            "Optional contributor role name (e.g. `director`) narrowing `contributor_id`. "
+            "Requires `contributor_id`."
+        ),
+        examples=["director"],
+    ),
+) -> dict:
+    """Parse and validate the search text and filters shared by browse routes."""
+    current_year = datetime.now(UTC).year
+    parsed_release_year = _parse_optional_int_value(release_year, "release_year")
+    parsed_genre = _parse_optional_int_value(genre, "genre")
+
+    if parsed_release_year is not None and (
+        parsed_release_year <= 0 or parsed_release_year >= current_year
+    ):
+        raise InvalidInputError("release_year")
+    if parsed_genre is not None and parsed_genre <= 0:
+        raise InvalidInputError("genre")
+
+    parsed_year_from = _parse_optional_int_value(year_from, "year_from")
+    parsed_year_to = _parse_optional_int_value(year_to, "year_to")
+    if parsed_year_from is not None and (
+        parsed_year_from <= 0 or parsed_year_from >= current_year
+    ):
+        raise InvalidInputError("year_from")
+    if parsed_year_to is not None and (
+        parsed_year_to <= 0
+        or parsed_year_to >= current_year
+        or (parsed_year_from is not None and parsed_year_to < parsed_year_from)
+    ):
+        raise InvalidInputError("year_to")
+
+    parsed_genres = _parse_genre_ids(genres)
+    normalized_genre_mode = (genre_mode or "").strip().lower() or "any"
+    if normalized_genre_mode not in GENRE_MODES:
+        raise InvalidInputError("genre_mode")
+
+    normalized_media_type = _parse_optional_name_value(media_type, "media_type")
+    parsed_contributor_id = _parse_optional_int_value(contributor_id, "contributor_id")
+    if parsed_contributor_id is not None and parsed_contributor_id <= 0:
+        raise InvalidInputError("contributor_id")
+    normalized_role = _parse_optional_name_value(role, "role")
+    if normalized_role is not None and parsed_contributor_id is None:
+        raise InvalidInputError("role")
+
+    normalized_search_text = search_text.strip() if search_text is not None else None
+    if normalized_search_text == "":
+        normalized_search_text = None
+
+    return {
+        "search_text": normalized_search_text,
+        "release_year": parsed_release_year,
+        "genre": parsed_genre,
+        "year_from": parsed_year_from,
+        "year_to": parsed_year_to,
+        "genres": parsed_genres,
+        "genre_mode": normalized_genre_mode,
+        "media_type": normalized_media_type,
+        "contributor_id": parsed_contributor_id,
+        "role": normalized_role,
+    }
+
+
 @router.get(
     "",
+    dependencies=[Depends(statement_timeout(config.STATEMENT_TIMEOUT_SEARCH_MS))],
     response_model=BrowseTitlesResponse,
     summary="Browse Movies",
     description=(
         "Returns a paginated movie list. Supports free-text search across movie titles, "
-        "contributors, genres, and release year text, with optional structured filters."
+        "contributors, genres, and release year text, with optional structured filters "
+        "and optional per-genre / per-year facet counts over all matches."
     ),
     responses=DEFAULT_ERROR_RESPONSES,
+    response_model_exclude_unset=True,
 )
 def browse_titles(
     offset: str | None = Query(
@@ -66,59 +229,198 @@ def browse_titles(
         ),
         examples=["28"],
     ),
-    search_text: str | None = Query(
+    sort: str | None = Query(
         None,
         description=(
-            "Optional free-text query. Search tokens are matched against movie title, "
-            "contributor name, genre name, and release year text."
+            "Result order: `title_asc` (default), `title_desc`, `release_year_asc`, "
+            "`release_year_desc`, `cast_size_desc` or `relevance` (with `search_text`; "
+            "otherwise title order). Ties are broken by movie ID. Fuzzy pages "
+            "(`match_mode` `fuzzy`) are always in relevance order, so `match=fuzzy` "
+            "only accepts `relevance`."
         ),
-        examples=["matrix keanu"],
+        examples=["release_year_desc"],
     ),
-    release_year: str | None = Query(
+    facets: str | None = Query(
         None,
         description=(
-            "Optional release year filter. Expected type: integer. "
-            "Must be less than the current year."
+            "Optional comma-separated facet names to count over all matching movies: "
+            "`genre`, `year`."
         ),
-        examples=["1999"],
+        examples=["genre,year"],
     ),
-    genre: str | None = Query(
+    match: str | None = Query(
         None,
-        description="Optional genre filter. Expected type: integer genre ID.",
-        examples=["1"],
+        description=(
+            "How `search_text` words match: `exact`, `fuzzy` (typo-tolerant, ordered by "
+            "similarity) or `auto` (default: exact, answered fuzzily when the first page "
+            "has too few exact hits). The mode used is returned as `match_mode`; facet "
+            "counts use the same matching."
+        ),
+        examples=["fuzzy"],
     ),
+    similarity_threshold: str | None = Query(
+        None,
+        description=(
+            "Minimum similarity of fuzzy matches. Expected type: number greater than 0 "
+            "and at most 1. Defaults to the server setting."
+        ),
+        examples=["0.4"],
+    ),
+    filters: dict = Depends(browse_filter_params),
 ) -> dict:
     """Browse titles by optional search text and filters."""
-    current_year = datetime.now(UTC).year
     parsed_offset = _parse_required_paging_value(offset, 0, "offset")
     parsed_page_size = _parse_required_paging_value(page_size, 10, "page_size")
-    parsed_release_year = _parse_optional_int_value(release_year, "release_year")
-    parsed_genre = _parse_optional_int_value(genre, "genre")
 
     if parsed_offset < 0:
         raise InvalidInputError("offset")
     if parsed_page_size <= 0 or parsed_page_size > MAX_PAGE_SIZE:
         raise InvalidInputError("page_size")
-    if parsed_release_year is not None and (
-        parsed_release_year <= 0 or parsed_release_year >= current_year
-    ):
-        raise InvalidInputError("release_year")
-    if parsed_genre is not None and parsed_genre <= 0:
-        raise InvalidInputError("genre")
 
-    normalized_search_text = search_text.strip() if search_text is not None else None
-    if normalized_search_text == "":
-        normalized_search_text = None
+    normalized_sort = (sort or "").strip().lower() or "title_asc"
+    if normalized_sort not in BROWSE_SORTS:
+        raise InvalidInputError("sort")
+
+    parsed_facets = _parse_facets(facets)
+
+    normalized_match = (match or "").strip().lower() or "auto"
+    if normalized_match not in MATCH_MODES:
+        raise InvalidInputError("match")
+    if normalized_match == "fuzzy" and sort is not None and normalized_sort != "relevance":
+        # Fuzzy pages are ordered by similarity; other orders are not applied.
+        raise InvalidInputError("sort")
+    parsed_threshold = _parse_similarity_threshold(similarity_threshold)
 
     return browse_titles_service(
-        search_text=normalized_search_text,
-        release_year=parsed_release_year,
-        genre=parsed_genre,
+        **filters,
         offset=parsed_offset,
         page_size=parsed_page_size,
+        facets=parsed_facets,
+        sort=normalized_sort,
+        match=normalized_match,
+        similarity_threshold=parsed_threshold,
+    )
+
+
+@router.get(
+    "/contributors",
+    dependencies=[Depends(statement_timeout(config.STATEMENT_TIMEOUT_SEARCH_MS))],
+    response_model=ContributorSearchResponse,
+    summary="Search Contributors",
+    description=(
+        "Returns contributors (actors/directors) whose name resembles `q`, ranked by "
+        "trigram word similarity, then by number of movies. Typos are tolerated, except "
+        "on the SQLite snapshot backend, which matches names containing `q`. "
+        "Pages are keyset-paginated through `cursor`."
+    ),
+    responses=DEFAULT_ERROR_RESPONSES,
+)
+def search_contributors(
+    q: str | None = Query(
+        None,
+        description=(
+            f"Contributor name query. Required, at most {MAX_CONTRIBUTOR_QUERY_LENGTH} "
+            "characters."
+        ),
+        examples=["keanu"],
+    ),
+    page_size: str | None = Query(
+        None,
+        description=(
+            "Page size. Expected type: integer. Defaults to 10. "
+            "Accepted range: 1 to 50."
+        ),
+        examples=["10"],
+    ),
+    cursor: str | None = Query(
+        None,
+        description="Opaque `next_cursor` from the previous page. Omit for the first page.",
+    ),
+) -> dict:
+    """Search contributors by name."""
+    normalized_query = (q or "").strip()
+    if (
+        not normalized_query
+        or len(normalized_query) > MAX_CONTRIBUTOR_QUERY_LENGTH
+        or "\x00" in normalized_query
+    ):
+        raise InvalidInputError("q")
+
+    parsed_page_size = _parse_required_paging_value(page_size, 10, "page_size")
+    if parsed_page_size <= 0 or parsed_page_size > MAX_PAGE_SIZE:
+        raise InvalidInputError("page_size")
+
+    normalized_cursor = cursor.strip() if cursor is not None else None
+    return search_contributors_service(
+        normalized_query,
+        page_size=parsed_page_size,
+        cursor=normalized_cursor or None,
     )
 
 
+@router.get(
+    "/export",
+    dependencies=[
+        Depends(request_priority(PRIORITY_EXPORT)),
+        Depends(statement_timeout(config.STATEMENT_TIMEOUT_EXPORT_MS)),
+    ],
+    summary="Export Movies",
+    description=(
+        "Streams every movie matching the browse search text and filters (the whole "
+        "catalog when none are given) as NDJSON or CSV, ordered by movie ID. Rows are "
+        "read through a server-side cursor, so memory use does not grow with the "
+        "result size."
+    ),
+    responses={
+        **DEFAULT_ERROR_RESPONSES,
+        200: {
+            "description": "Stream of movie rows.",
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+        },
+    },
+)
+def export_titles(
+    export_format: str | None = Query(
+        None,
+        alias="format",
+        description="Output format: `ndjson` (default) or `csv`.",
+        examples=["csv"],
+    ),
+    filters: dict = Depends(browse_filter_params),
+) -> StreamingResponse:
+    """Stream titles matching the browse filters."""
+    normalized_format = (export_format or "").strip().lower() or "ndjson"
+    if normalized_format not in EXPORT_MEDIA_TYPES:
+        raise InvalidInputError("format")
+
+    chunks = export_titles_service(**filters, export_format=normalized_format)
+    return StreamingResponse(
+        _close_on_disconnect(chunks),
+        media_type=EXPORT_MEDIA_TYPES[normalized_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="titles.{normalized_format}"',
+        },
+    )
+
+
+async def _close_on_disconnect(chunks: Iterator[str]) -> AsyncIterator[str]:
+    """Pull export chunks one at a time off the event loop, closing the source when done.
+
+    The next chunk is only produced after the previous one was sent, and when the
+    client disconnects the cancelled stream closes `chunks`, which closes its
+    server-side cursor and returns the DB connection.
+    """
+    try:
+        async for chunk in iterate_in_threadpool(chunks):
+            yield chunk
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            # Shielded: on disconnect this runs inside an already-cancelled scope.
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(close)
+
+
 def _parse_required_paging_value(value: str | None, default: int, field_name: str) -> int:
     """Parse paging value with fallback default for missing/empty input."""
     if value is None or value.strip() == "":
@@ -137,3 +439,54 @@ def _parse_optional_int_value(value: str | None, field_name: str) -> int | None:
         return int(value)
     except ValueError as exc:
         raise InvalidInputError(field_name) from exc
+
+
+def _parse_similarity_threshold(value: str | None) -> float | None:
+    """Parse an optional similarity threshold in (0, 1], treating missing/empty as None."""
+    if value is None or value.strip() == "":
+        return None
+    try:
+        threshold = float(value)
+    except ValueError as exc:
+        raise InvalidInputError("similarity_threshold") from exc
+    if not 0 < threshold <= 1:
+        raise InvalidInputError("similarity_threshold")
+    return threshold
+
+
+def _parse_genre_ids(value: str | None) -> list[int] | None:
+    """Parse a comma-separated list of positive genre IDs, treating missing/empty as None."""
+    if value is None or value.strip() == "":
+        return None
+    try:
+        genre_ids = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError as exc:
+        raise InvalidInputError("genres") from exc
+    genre_ids = list(dict.fromkeys(genre_ids))
+    if (
+        not genre_ids
+        or len(genre_ids) > MAX_FILTER_GENRES
+        or any(genre_id <= 0 for genre_id in genre_ids)
+    ):
+        raise InvalidInputError("genres")
+    return genre_ids
+
+
+def _parse_optional_name_value(value: str | None, field_name: str) -> str | None:
+    """Normalize an optional lookup name filter, treating missing/empty as None."""
+    if value is None or value.strip() == "":
+        return None
+    normalized = value.strip().lower()
+    if len(normalized) > MAX_NAME_FILTER_LENGTH or "\x00" in normalized:
+        raise InvalidInputError(field_name)
+    return normalized
+
+
+def _parse_facets(value: str | None) -> list[str] | None:
+    """Parse a comma-separated facet list, treating missing/empty as None."""
+    if value is None or value.strip() == "":
+        return None
+    facets = [name.strip() for name in value.split(",") if name.strip()]
+    if not facets or any(name not in BROWSE_FACETS for name in facets):
+        raise InvalidInputError("facets")
+    return list(dict.fromkeys(facets))
@@ -1,18 +1,33 @@
 """Contributor controller routes."""
 
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Depends, Path, Query
 
+from app.core import config
+from app.core.admission import PRIORITY_DETAIL, request_priority
 from app.core.api_docs import (
     ContributorDetailsResponse,
+    ContributorPathResponse,
     DEFAULT_ERROR_RESPONSES,
     ErrorResponse,
 )
 from app.core.exceptions import InvalidInputError
+from app.core.field_selection import parse_field_selection
+from app.core.query_control import statement_timeout
 from app.service_logic.contributor_service_logic import (
+    CONTRIBUTOR_HEADER_FIELDS,
+    CONTRIBUTOR_SECTIONS,
     get_contributor_details as get_contributor_details_service,
+    get_contributor_path as get_contributor_path_service,
 )
 
-router = APIRouter(prefix="/contributor", tags=["contributor"])
+router = APIRouter(
+    prefix="/contributor",
+    tags=["contributor"],
+    dependencies=[
+        Depends(request_priority(PRIORITY_DETAIL)),
+        Depends(statement_timeout(config.STATEMENT_TIMEOUT_DETAIL_MS)),
+    ],
+)
 
 
 @router.get(
@@ -21,7 +36,8 @@ router = APIRouter(prefix="/contributor", tags=["contributor"])
     summary="Get Contributor Details",
     description=(
         "Returns detailed information for one contributor (actor/director), including "
-        "all related movies and role names for each movie."
+        "all related movies and role names for each movie. `fields` and `include` trim "
+        "the response; the filmography is not queried when left out."
     ),
     responses={
         **DEFAULT_ERROR_RESPONSES,
@@ -30,16 +46,97 @@ router = APIRouter(prefix="/contributor", tags=["contributor"])
             "description": "Contributor not found for the provided ID.",
         },
     },
+    response_model_exclude_unset=True,
 )
 def get_contributor_details(
     contributor_id: int = Path(
         ...,
         description="Contributor identifier. Expected type: integer greater than 0.",
         examples=[7],
-    )
+    ),
+    fields: str | None = Query(
+        None,
+        description=(
+            "Optional comma-separated top-level fields to return: `imdb_reference_id`, "
+            "`name`, `titles`. `id` is always returned."
+        ),
+        examples=["name"],
+    ),
+    include: str | None = Query(
+        None,
+        description=(
+            "Optional sections to return: `titles`, or `none` for the contributor fields "
+            "only. Defaults to all sections."
+        ),
+        examples=["none"],
+    ),
 ) -> dict:
     """Return contributor details with associated titles and roles."""
     if not isinstance(contributor_id, int) or contributor_id <= 0:
         raise InvalidInputError("contributor ID")
 
-    return get_contributor_details_service(contributor_id)
+    selected_fields = parse_field_selection(
+        fields, include, CONTRIBUTOR_HEADER_FIELDS, CONTRIBUTOR_SECTIONS
+    )
+    return get_contributor_details_service(contributor_id, fields=selected_fields)
+
+
+@router.get(
+    "/{contributor_id}/path/{other_contributor_id}",
+    response_model=ContributorPathResponse,
+    summary="Get Contributor Connection Path",
+    description=(
+        "Returns the shortest chain of movies and contributors connecting two "
+        "contributors (\"degrees of separation\"). `degrees` is the number of movies "
+        "on the path."
+    ),
+    responses={
+        **DEFAULT_ERROR_RESPONSES,
+        404: {
+            "model": ErrorResponse,
+            "description": (
+                "Contributor not found, or no connection found within the search limits."
+            ),
+        },
+    },
+)
+def get_contributor_path(
+    contributor_id: int = Path(
+        ...,
+        description="Starting contributor identifier. Expected type: integer greater than 0.",
+        examples=[7],
+    ),
+    other_contributor_id: int = Path(
+        ...,
+        description="Target contributor identifier. Expected type: integer greater than 0.",
+        examples=[9],
+    ),
+    max_degrees: str | None = Query(
+        None,
+        description=(
+            "Maximum number of movies on the path. Expected type: integer. "
+            f"Defaults to and may not exceed {config.CONTRIBUTOR_PATH_MAX_DEGREES}."
+        ),
+        examples=["3"],
+    ),
+) -> dict:
+    """Return the shortest contributor/title chain between two contributors."""
+    if not isinstance(contributor_id, int) or contributor_id <= 0:
+        raise InvalidInputError("contributor ID")
+    if not isinstance(other_contributor_id, int) or other_contributor_id <= 0:
+        raise InvalidInputError("other contributor ID")
+
+    parsed_max_degrees = None
+    if max_degrees is not None and max_degrees.strip() != "":
+        try:
+            parsed_max_degrees = int(max_degrees)
+        except ValueError as exc:
+            raise InvalidInputError("max_degrees") from exc
+        if parsed_max_degrees <= 0 or parsed_max_degrees > config.CONTRIBUTOR_PATH_MAX_DEGREES:
+            raise InvalidInputError("max_degrees")
+
+    return get_contributor_path_service(
+        contributor_id,
+        other_contributor_id,
+        max_degrees=parsed_max_degrees,
+    )
@@ -1,16 +1,35 @@
 """Title controller routes."""
 
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Depends, Path, Query
 
-from app.core.api_docs import DEFAULT_ERROR_RESPONSES, ErrorResponse, TitleDetailsResponse
+from app.core import config
+from app.core.admission import PRIORITY_DETAIL, request_priority
+from app.core.api_docs import (
+    DEFAULT_ERROR_RESPONSES,
+    ErrorResponse,
+    TitleDetailsResponse,
+    TitleRelatedResponse,
+)
 from app.core.exceptions import InvalidInputError
+from app.core.field_selection import parse_field_selection
+from app.core.query_control import statement_timeout
 
 from app.service_logic.title_service_logic import (
+    TITLE_HEADER_FIELDS,
+    TITLE_SECTIONS,
+    get_related_titles as get_related_titles_service,
     get_title_details as get_title_details_service,
 )
 
 
-router = APIRouter(prefix="/title", tags=["title"])
+router = APIRouter(
+    prefix="/title",
+    tags=["title"],
+    dependencies=[
+        Depends(request_priority(PRIORITY_DETAIL)),
+        Depends(statement_timeout(config.STATEMENT_TIMEOUT_DETAIL_MS)),
+    ],
+)
 
 
 @router.get(
@@ -19,7 +38,8 @@ router = APIRouter(prefix="/title", tags=["title"])
     summary="Get Movie Details",
     description=(
         "Returns detailed information for one movie, including genres and contributors "
-        "(actors/directors) with their roles."
+        "(actors/directors) with their roles. `fields` and `include` trim the response; "
+        "sections left out are not queried."
     ),
     responses={
         **DEFAULT_ERROR_RESPONSES,
@@ -28,16 +48,83 @@ router = APIRouter(prefix="/title", tags=["title"])
             "description": "Movie not found for the provided ID.",
         },
     },
+    response_model_exclude_unset=True,
 )
 def get_title_details(
     title_id: int = Path(
         ...,
         description="Movie identifier. Expected type: integer greater than 0.",
         examples=[10],
-    )
+    ),
+    fields: str | None = Query(
+        None,
+        description=(
+            "Optional comma-separated top-level fields to return: `imdb_reference_id`, "
+            "`title`, `release_year`, `media_type`, `genres`, `contributors`. "
+            "`id` is always returned."
+        ),
+        examples=["title,release_year"],
+    ),
+    include: str | None = Query(
+        None,
+        description=(
+            "Optional comma-separated sections to return: `genres`, `contributors`, or "
+            "`none` for the movie fields only. Defaults to all sections."
+        ),
+        examples=["genres"],
+    ),
 ) -> dict:
     """Return title details with contributors and their roles."""
     if not isinstance(title_id, int) or title_id <= 0:
         raise InvalidInputError("title ID")
 
-    return get_title_details_service(title_id)
+    selected_fields = parse_field_selection(fields, include, TITLE_HEADER_FIELDS, TITLE_SECTIONS)
+    return get_title_details_service(title_id, fields=selected_fields)
+
+
+@router.get(
+    "/{title_id}/related",
+    response_model=TitleRelatedResponse,
+    summary="Get Related Movies",
+    description=(
+        "Returns movies related to one movie, most similar first. Similarity is "
+        "precomputed offline from shared contributors and genres."
+    ),
+    responses={
+        **DEFAULT_ERROR_RESPONSES,
+        404: {
+            "model": ErrorResponse,
+            "description": "Movie not found for the provided ID.",
+        },
+    },
+)
+def get_related_titles(
+    title_id: int = Path(
+        ...,
+        description="Movie identifier. Expected type: integer greater than 0.",
+        examples=[10],
+    ),
+    limit: str | None = Query(
+        None,
+        description=(
+            "Number of related movies to return. Expected type: integer. "
+            f"Defaults to {config.RELATED_TITLES_DEFAULT_LIMIT}, "
+            f"maximum {config.RELATED_TITLES_MAX_LIMIT}."
+        ),
+        examples=["5"],
+    ),
+) -> dict:
+    """Return related titles for a title."""
+    if not isinstance(title_id, int) or title_id <= 0:
+        raise InvalidInputError("title ID")
+
+    parsed_limit = config.RELATED_TITLES_DEFAULT_LIMIT
+    if limit is not None and limit.strip() != "":
+        try:
+            parsed_limit = int(limit)
+        except ValueError as exc:
+            raise InvalidInputError("limit") from exc
+        if parsed_limit <= 0 or parsed_limit > config.RELATED_TITLES_MAX_LIMIT:
+            raise InvalidInputError("limit")
+
+    return get_related_titles_service(title_id, parsed_limit)
@@ -0,0 +1,143 @@
+"""Admission control for database connection checkouts.
+
+Every pooled connection checkout takes a slot. When all slots are busy,
+callers wait in a bounded queue ordered by request priority (detail lookups
+before searches before bulk exports); a full queue or an expired wait fails
+fast with 503 and Retry-After instead of piling up threads.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable
+
+from app.core import config
+from app.core.exceptions import ServiceOverloadedError
+
+PRIORITY_DETAIL = 0
+PRIORITY_SEARCH = 1
+PRIORITY_EXPORT = 2
+PRIORITY_NAMES = {PRIORITY_DETAIL: "detail", PRIORITY_SEARCH: "search", PRIORITY_EXPORT: "export"}
+
+# Set per request by the `request_priority` route dependency; background work
+# (readiness, dataset watcher) runs at search priority.
+_request_priority: ContextVar[int] = ContextVar("admission_priority", default=PRIORITY_SEARCH)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    rejected: bool = field(default=False, compare=False)
+
+
+class AdmissionController:
+    """Counting semaphore with a bounded, priority-ordered wait queue."""
+
+    def __init__(self, capacity: int, max_queue: int, max_wait_seconds: float) -> None:
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.in_use = 0
+        self._waiters: list[_Waiter] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._stats = {
+            name: {"admitted": 0, "queued": 0, "rejected": 0} for name in PRIORITY_NAMES.values()
+        }
+
+    def acquire(self, priority: int) -> None:
+        """Take a slot, waiting in priority order; raise ServiceOverloadedError when shed."""
+        stats = self._stats[PRIORITY_NAMES[priority]]
+        with self._condition:
+            if self.in_use < self.capacity and not self._waiters:
+                self.in_use += 1
+                stats["admitted"] += 1
+                return
+
+            waiter = _Waiter(priority, next(self._sequence))
+            if len(self._waiters) >= self.max_queue:
+                lowest = max(self._waiters, default=None)
+                if lowest is None or lowest < waiter:
+                    stats["rejected"] += 1
+                    raise ServiceOverloadedError(config.ADMISSION_RETRY_AFTER_SECONDS)
+                # Shed the lowest-priority (newest) waiter to make room.
+                lowest.rejected = True
+                self._remove(lowest)
+            heapq.heappush(self._waiters, waiter)
+            stats["queued"] += 1
+            deadline = time.monotonic() + self.max_wait_seconds
+
+            while True:
+                if waiter.rejected:
+                    stats["rejected"] += 1
+                    raise ServiceOverloadedError(config.ADMISSION_RETRY_AFTER_SECONDS)
+                if self._waiters[0] is waiter and self.in_use < self.capacity:
+                    heapq.heappop(self._waiters)
+                    self.in_use += 1
+                    stats["admitted"] += 1
+                    self._condition.notify_all()
+                    return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._remove(waiter)
+                    stats["rejected"] += 1
+                    raise ServiceOverloadedError(config.ADMISSION_RETRY_AFTER_SECONDS)
+                self._condition.wait(remaining)
+
+    def release(self) -> None:
+        """Return a slot and wake the waiters."""
+        with self._condition:
+            self.in_use -= 1
+            self._condition.notify_all()
+
+    def snapshot(self) -> dict:
+        """Return slot usage, queue length and per-priority counters."""
+        with self._condition:
+            return {
+                "capacity": self.capacity,
+                "in_use": self.in_use,
+                "queued": len(self._waiters),
+                "by_priority": {name: dict(counts) for name, counts in self._stats.items()},
+            }
+
+    def _remove(self, waiter: _Waiter) -> None:
+        self._waiters.remove(waiter)
+        heapq.heapify(self._waiters)
+        self._condition.notify_all()
+
+
+_controller = AdmissionController(
+    capacity=config.ADMISSION_MAX_CONCURRENCY,
+    max_queue=config.ADMISSION_MAX_QUEUE,
+    max_wait_seconds=config.ADMISSION_MAX_WAIT_SECONDS,
+)
+
+
+def get_admission_controller() -> AdmissionController:
+    """Return the process-wide admission controller."""
+    return _controller
+
+
+def acquire_slot() -> None:
+    """Take a slot at the current request's priority."""
+    _controller.acquire(_request_priority.get())
+
+
+def release_slot() -> None:
+    """Return a slot taken by `acquire_slot`."""
+    _controller.release()
+
+
+def request_priority(priority: int) -> Callable[[], None]:
+    """Build a route dependency that sets the admission priority of the request."""
+
+    async def set_priority() -> None:
+        _request_priority.set(priority)
+
+    return set_priority
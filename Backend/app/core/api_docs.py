@@ -23,12 +23,55 @@ class BrowseTitleItemResponse(BaseModel):
     media_type: str = Field(..., examples=["movie"])
 
 
+class BrowseGenreFacetResponse(BaseModel):
+    """Number of matching titles in one genre."""
+
+    id: int = Field(..., examples=[1])
+    name: str = Field(..., examples=["Action"])
+    count: int = Field(..., examples=[1203])
+
+
+class BrowseYearFacetResponse(BaseModel):
+    """Number of matching titles released in one year."""
+
+    year: int = Field(..., examples=[1999])
+    count: int = Field(..., examples=[42])
+
+
+class BrowseFacetsResponse(BaseModel):
+    """Facet counts over all titles matching a browse query."""
+
+    genre: list[BrowseGenreFacetResponse] | None = None
+    year: list[BrowseYearFacetResponse] | None = None
+
+
 class BrowseTitlesResponse(BaseModel):
     """Paginated browse response."""
 
     offset: int = Field(..., examples=[0])
     page_size: int = Field(..., examples=[28])
     results: list[BrowseTitleItemResponse]
+    match_mode: str | None = Field(None, examples=["exact"])
+    facets: BrowseFacetsResponse | None = None
+
+
+class ContributorSearchItemResponse(BaseModel):
+    """One contributor matching a contributor search."""
+
+    id: int = Field(..., examples=[7])
+    imdb_reference_id: str | None = Field(..., examples=["nm0000206"])
+    name: str = Field(..., examples=["Keanu Reeves"])
+    title_count: int | None = Field(None, examples=[42])
+    score: float = Field(..., examples=[0.83])
+
+
+class ContributorSearchResponse(BaseModel):
+    """Keyset-paginated contributor search response."""
+
+    q: str = Field(..., examples=["keanu"])
+    page_size: int = Field(..., examples=[10])
+    results: list[ContributorSearchItemResponse]
+    next_cursor: str | None = Field(..., examples=["MC44MzozNDo3"])
 
 
 class BrowseGenreResponse(BaseModel):
@@ -48,15 +91,33 @@ class ContributorSummaryResponse(BaseModel):
 
 
 class TitleDetailsResponse(BaseModel):
-    """Detailed title response."""
+    """Detailed title response; fields left out by `fields`/`include` are omitted."""
 
     id: int = Field(..., examples=[10])
-    imdb_reference_id: str | None = Field(..., examples=["tt0133093"])
-    title: str = Field(..., examples=["The Matrix"])
-    release_year: int | None = Field(..., examples=[1999])
+    imdb_reference_id: str | None = Field(None, examples=["tt0133093"])
+    title: str | None = Field(None, examples=["The Matrix"])
+    release_year: int | None = Field(None, examples=[1999])
+    media_type: str | None = Field(None, examples=["movie"])
+    genres: list[str] | None = Field(None, examples=[["Action", "Sci-Fi"]])
+    contributors: list[ContributorSummaryResponse] | None = None
+
+
+class RelatedTitleResponse(BaseModel):
+    """One related movie with its similarity score."""
+
+    id: int = Field(..., examples=[11])
+    imdb_reference_id: str | None = Field(..., examples=["tt0234215"])
+    title: str = Field(..., examples=["The Matrix Reloaded"])
+    release_year: int | None = Field(..., examples=[2003])
     media_type: str = Field(..., examples=["movie"])
-    genres: list[str] = Field(..., examples=[["Action", "Sci-Fi"]])
-    contributors: list[ContributorSummaryResponse]
+    score: float = Field(..., examples=[0.83])
+
+
+class TitleRelatedResponse(BaseModel):
+    """Movies related to one movie, most similar first."""
+
+    title_id: int = Field(..., examples=[10])
+    results: list[RelatedTitleResponse]
 
 
 class ContributorTitleResponse(BaseModel):
@@ -71,12 +132,30 @@ class ContributorTitleResponse(BaseModel):
 
 
 class ContributorDetailsResponse(BaseModel):
-    """Detailed contributor response."""
+    """Detailed contributor response; fields left out by `fields`/`include` are omitted."""
 
     id: int = Field(..., examples=[7])
-    imdb_reference_id: str | None = Field(..., examples=["nm0000206"])
-    name: str = Field(..., examples=["Keanu Reeves"])
-    titles: list[ContributorTitleResponse]
+    imdb_reference_id: str | None = Field(None, examples=["nm0000206"])
+    name: str | None = Field(None, examples=["Keanu Reeves"])
+    titles: list[ContributorTitleResponse] | None = None
+
+
+class ContributorPathStepResponse(BaseModel):
+    """One node (contributor or title) on a contributor connection path."""
+
+    type: str = Field(..., examples=["title"])
+    id: int = Field(..., examples=[10])
+    imdb_reference_id: str | None = Field(..., examples=["tt0133093"])
+    name: str = Field(..., examples=["The Matrix"])
+
+
+class ContributorPathResponse(BaseModel):
+    """Shortest chain of shared titles connecting two contributors."""
+
+    contributor_id: int = Field(..., examples=[7])
+    other_contributor_id: int = Field(..., examples=[9])
+    degrees: int = Field(..., examples=[1])
+    path: list[ContributorPathStepResponse]
 
 
 DEFAULT_ERROR_RESPONSES: dict[int, dict] = {
@@ -88,5 +167,13 @@ DEFAULT_ERROR_RESPONSES: dict[int, dict] = {
         "model": ErrorResponse,
         "description": "Internal server error.",
     },
+    503: {
+        "model": ErrorResponse,
+        "description": "Service overloaded; retry after the `Retry-After` seconds.",
+    },
+    504: {
+        "model": ErrorResponse,
+        "description": "Query exceeded the endpoint's statement timeout.",
+    },
 }
 
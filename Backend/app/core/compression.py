@@ -0,0 +1,226 @@
+"""Negotiated response compression with a cache of compressed bodies."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: "br" is only offered when the package is installed
+    brotli = None
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    zstd = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+COMPRESSIBLE_CONTENT_TYPES = ("application/json", "text/")
+
+ENCODERS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda body: gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+}
+if brotli is not None:
+    ENCODERS["br"] = lambda body: brotli.compress(body, quality=BROTLI_QUALITY)
+if zstd is not None:
+    ENCODERS["zstd"] = lambda body: zstd.compress(body, level=ZSTD_LEVEL)
+# Server preference when the client weighs several encodings equally.
+ENCODING_PREFERENCE = tuple(name for name in ("zstd", "br", "gzip") if name in ENCODERS)
+
+_metrics_lock = threading.Lock()
+_metrics: dict[str, dict[str, int]] = {}
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Return the supported encoding the client weighs highest, or None for identity."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+
+    wildcard = weights.get("*", 0.0)
+    best_name, best_weight = None, 0.0
+    for name in ENCODING_PREFERENCE:
+        weight = weights.get(name, wildcard)
+        if weight > best_weight:
+            best_name, best_weight = name, weight
+    return best_name
+
+
+def compression_metrics() -> dict[str, dict[str, int]]:
+    """Return counters per encoding: responses, bytes in/out, bytes saved and cache hits."""
+    with _metrics_lock:
+        return {encoding: dict(counters) for encoding, counters in _metrics.items()}
+
+
+def reset_compression_metrics() -> None:
+    """Clear all compression counters."""
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def _record(encoding: str, raw_size: int, compressed_size: int, cache_hit: bool) -> None:
+    with _metrics_lock:
+        counters = _metrics.setdefault(
+            encoding,
+            {"responses": 0, "bytes_in": 0, "bytes_out": 0, "bytes_saved": 0, "cache_hits": 0},
+        )
+        counters["responses"] += 1
+        counters["bytes_in"] += raw_size
+        counters["bytes_out"] += compressed_size
+        counters["bytes_saved"] += raw_size - compressed_size
+        counters["cache_hits"] += int(cache_hit)
+
+
+class CompressedBodyCache:
+    """Bounded LRU of compressed variants keyed by (raw body digest, encoding)."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[bytes, str], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[bytes, str]) -> bytes | None:
+        """Return the cached compressed body for `key`, or None, marking it recently used."""
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+            return compressed
+
+    def put(self, key: tuple[bytes, str], compressed: bytes) -> None:
+        """Store a compressed body, evicting the least recently used beyond max_entries."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = compressed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class CompressionMiddleware:
+    """Compress complete response bodies with the best encoding the client accepts.
+
+    Streaming responses (more than one body message) pass through untouched.
+    Compressed variants of cacheable responses (GET, 200, not `no-store`) are
+    kept in an LRU keyed by the raw body, so repeated payloads are compressed once.
+    Bodies of at least `thread_offload_size` bytes are compressed in a worker thread
+    so they do not block the event loop.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        cache_entries: int = 512,
+        thread_offload_size: int = 65536,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.thread_offload_size = thread_offload_size
+        self.cache = CompressedBodyCache(cache_entries)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(scope=start)
+            if message.get("more_body", False) or not self._is_compressible(headers):
+                await send(start)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            body = message.get("body", b"")
+            if len(body) < self.minimum_size:
+                await send(start)
+                await send(message)
+                return
+
+            cacheable = self._is_cacheable(scope, start, headers)
+            if len(body) >= self.thread_offload_size:
+                compressed = await anyio.to_thread.run_sync(
+                    self._compress, body, encoding, cacheable
+                )
+            else:
+                compressed = self._compress(body, encoding, cacheable)
+            if compressed is None:
+                await send(start)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compress(self, body: bytes, encoding: str, cacheable: bool) -> bytes | None:
+        """Return the compressed body, or None when compressing does not make it smaller."""
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        compressed = self.cache.get(key) if cacheable else None
+        cache_hit = compressed is not None
+        if compressed is None:
+            compressed = ENCODERS[encoding](body)
+            if cacheable:
+                self.cache.put(key, compressed)
+        if len(compressed) >= len(body):
+            return None
+        _record(encoding, len(body), len(compressed), cache_hit)
+        return compressed
+
+    @staticmethod
+    def _is_compressible(headers: MutableHeaders) -> bool:
+        content_type = headers.get("content-type", "")
+        return "content-encoding" not in headers and content_type.startswith(
+            COMPRESSIBLE_CONTENT_TYPES
+        )
+
+    @staticmethod
+    def _is_cacheable(scope: Scope, start: Message, headers: MutableHeaders) -> bool:
+        return (
+            scope.get("method") == "GET"
+            and start["status"] == 200
+            and "no-store" not in headers.get("cache-control", "")
+        )
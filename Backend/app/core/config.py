@@ -5,3 +5,84 @@ load_dotenv()
 
 ENV = os.getenv("ENV", "prod")
 DATABASE_URL = os.getenv("DATABASE_URL", "")
+
+# Comma-separated read replica DSNs. Reads fall back to DATABASE_URL when empty.
+DATABASE_REPLICA_URLS = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+# Replica balancing strategy: "round_robin" or "least_outstanding".
+REPLICA_ROUTING = os.getenv("REPLICA_ROUTING", "round_robin")
+REPLICA_HEALTH_CHECK_INTERVAL_SECONDS = float(
+    os.getenv("REPLICA_HEALTH_CHECK_INTERVAL_SECONDS", "5")
+)
+# Replicas lagging more than this many seconds are skipped. Empty disables the cutoff.
+REPLICA_MAX_LAG_SECONDS = (
+    float(os.environ["REPLICA_MAX_LAG_SECONDS"])
+    if os.getenv("REPLICA_MAX_LAG_SECONDS", "").strip()
+    else None
+)
+# Bounds on replica health probes (run by a background thread), so a dead replica
+# cannot hold a probe for a full TCP timeout.
+REPLICA_CONNECT_TIMEOUT_SECONDS = int(os.getenv("REPLICA_CONNECT_TIMEOUT_SECONDS", "2"))
+REPLICA_PROBE_TIMEOUT_MS = int(os.getenv("REPLICA_PROBE_TIMEOUT_MS", "1000"))
+
+# Read backend for the data providers: "postgres", "snapshot" (read-only SQLite file)
+# or "memory" (in-process NumPy catalog engine loaded from Postgres).
+DATA_BACKEND = os.getenv("DATA_BACKEND", "postgres")
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "")
+# Browse search backend: "postgres" (ILIKE over joins) or "memory" (in-process inverted index).
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "postgres")
+# Browse search words matching more than this fraction of all titles (per the
+# search_token_stats table) are dropped as stopwords; the rest are searched rarest first.
+SEARCH_STOPWORD_FRACTION = float(os.getenv("SEARCH_STOPWORD_FRACTION", "0.1"))
+# Token counts cached per process between dataset changes.
+SEARCH_TOKEN_STATS_CACHE_SIZE = int(os.getenv("SEARCH_TOKEN_STATS_CACHE_SIZE", "50000"))
+# Typo-tolerant browse search (Postgres pg_trgm): with `match=auto`, a first page with
+# fewer exact hits than this is answered by trigram word similarity instead.
+SEARCH_FUZZY_MIN_EXACT_HITS = int(os.getenv("SEARCH_FUZZY_MIN_EXACT_HITS", "3"))
+# Default minimum word similarity (0-1) for fuzzy matches; overridable per request.
+SEARCH_FUZZY_SIMILARITY_THRESHOLD = float(os.getenv("SEARCH_FUZZY_SIMILARITY_THRESHOLD", "0.5"))
+# Run Alembic migrations, CSV seeding and the related-titles job in a background
+# thread at startup (serialized across processes by an advisory lock); see GET /ready.
+STARTUP_MIGRATE_AND_SEED = os.getenv("STARTUP_MIGRATE_AND_SEED", "true").lower() == "true"
+# How often in-process engines/caches poll the database for a changed dataset.
+DATASET_CHECK_INTERVAL_SECONDS = float(os.getenv("DATASET_CHECK_INTERVAL_SECONDS", "60"))
+
+# Admission control for pooled database checkouts. Concurrency defaults to the
+# pool size; excess requests wait (detail lookups first, exports last) in a
+# bounded queue and are shed with 503 + Retry-After when it is full or the wait expires.
+ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "10"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "50"))
+ADMISSION_MAX_WAIT_SECONDS = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "2"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+
+# Per-endpoint Postgres statement_timeout in milliseconds (0 disables). Queries over
+# the limit, or cancelled because the client disconnected, return 504 (error code 507).
+# The export limit applies to each batch fetched from its server-side cursor.
+STATEMENT_TIMEOUT_DETAIL_MS = int(os.getenv("STATEMENT_TIMEOUT_DETAIL_MS", "2000"))
+STATEMENT_TIMEOUT_SEARCH_MS = int(os.getenv("STATEMENT_TIMEOUT_SEARCH_MS", "5000"))
+STATEMENT_TIMEOUT_EXPORT_MS = int(os.getenv("STATEMENT_TIMEOUT_EXPORT_MS", "30000"))
+
+# Limits for GET /contributor/{id}/path/{other_id} (bidirectional BFS on the in-memory graph).
+CONTRIBUTOR_PATH_MAX_DEGREES = int(os.getenv("CONTRIBUTOR_PATH_MAX_DEGREES", "6"))
+CONTRIBUTOR_PATH_MAX_VISITED = int(os.getenv("CONTRIBUTOR_PATH_MAX_VISITED", "500000"))
+CONTRIBUTOR_PATH_TIME_BUDGET_MS = float(os.getenv("CONTRIBUTOR_PATH_TIME_BUDGET_MS", "250"))
+# Load the in-memory catalog engine during startup warm-up (before /ready) even when
+# only contributor paths use it; otherwise the first path request loads it.
+# DATA_BACKEND=memory and SEARCH_BACKEND=memory always load it at startup.
+CATALOG_ENGINE_WARM_UP = os.getenv("CATALOG_ENGINE_WARM_UP", "false").lower() == "true"
+
+# GET /title/{id}/related page size; the maximum matches the top-K stored by
+# app/scripts/compute_title_similarity.py.
+RELATED_TITLES_DEFAULT_LIMIT = int(os.getenv("RELATED_TITLES_DEFAULT_LIMIT", "10"))
+RELATED_TITLES_MAX_LIMIT = int(os.getenv("RELATED_TITLES_MAX_LIMIT", "20"))
+
+# Rows fetched per server-side cursor round trip by GET /browse/export.
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+
+# Responses smaller than this many bytes are sent uncompressed.
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+# Compressed variants kept for repeated GET payloads; 0 disables the cache.
+COMPRESSION_CACHE_ENTRIES = int(os.getenv("COMPRESSION_CACHE_ENTRIES", "512"))
+# Bodies of at least this many bytes are compressed in a worker thread, off the event loop.
+COMPRESSION_THREAD_OFFLOAD_SIZE = int(os.getenv("COMPRESSION_THREAD_OFFLOAD_SIZE", "65536"))
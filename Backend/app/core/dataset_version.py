@@ -0,0 +1,78 @@
+"""Dataset change detection for in-process caches and indexes."""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from app.core import db
+
+# Bumped by app/scripts/insert_csv_to_postgres.py in the transaction that changes the catalog.
+DATASET_SIGNATURE_QUERY = "SELECT COALESCE(max(version), 0) FROM dataset_version"
+
+_listeners: list[Callable[[], None]] = []
+_current_signature: tuple | None = None
+_stop_event: threading.Event | None = None
+_watcher_thread: threading.Thread | None = None
+
+
+def read_dataset_signature() -> tuple:
+    """Read the loaded catalog's dataset version from the primary."""
+    conn = db.get_db_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(DATASET_SIGNATURE_QUERY)
+            return tuple(cur.fetchone())
+    finally:
+        db.release_db_connection(conn)
+
+
+def register_dataset_change_listener(listener: Callable[[], None]) -> None:
+    """Call `listener` (with no arguments) whenever the dataset signature changes."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def check_for_dataset_change() -> bool:
+    """Compare the dataset signature with the last seen one and notify listeners on change."""
+    global _current_signature
+    signature = read_dataset_signature()
+    if _current_signature is None or signature == _current_signature:
+        _current_signature = signature
+        return False
+
+    _current_signature = signature
+    for listener in list(_listeners):
+        listener()
+    return True
+
+
+def start_dataset_watcher(interval_seconds: float) -> None:
+    """Record the current signature and poll for changes on a daemon thread."""
+    global _current_signature, _stop_event, _watcher_thread
+    if _watcher_thread is not None:
+        return
+
+    _current_signature = read_dataset_signature()
+    stop_event = threading.Event()
+
+    def watch() -> None:
+        while not stop_event.wait(interval_seconds):
+            try:
+                check_for_dataset_change()
+            except Exception:
+                # A failed poll (e.g. DB restart) is retried on the next interval.
+                continue
+
+    _stop_event = stop_event
+    _watcher_thread = threading.Thread(target=watch, name="dataset-watcher", daemon=True)
+    _watcher_thread.start()
+
+
+def stop_dataset_watcher() -> None:
+    """Stop the polling thread started by start_dataset_watcher."""
+    global _stop_event, _watcher_thread
+    if _stop_event is not None:
+        _stop_event.set()
+    _stop_event = None
+    _watcher_thread = None
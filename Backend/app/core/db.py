@@ -3,34 +3,333 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
 
 from psycopg2 import pool
+from psycopg2.extensions import QueryCanceledError
 
-from app.core.exceptions import ConnectionPoolNotInitializedError
+from app.core import admission, config, query_control
+from app.core.exceptions import (
+    ConnectionPoolNotInitializedError,
+    DataProviderError,
+    QueryTimeoutError,
+    ServiceOverloadedError,
+)
 
-connection_pool: pool.SimpleConnectionPool | None = None
+POOL_MIN_CONNECTIONS = 1
+POOL_MAX_CONNECTIONS = 10
+
+REPLICA_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+connection_pool: pool.ThreadedConnectionPool | None = None
+replica_pools: list[ReplicaPool] = []
+
+_routing_lock = threading.Lock()
+_round_robin_position = 0
+# Maps id(connection) -> replica that handed it out, so release goes to the right pool.
+_replica_checkouts: dict[int, ReplicaPool] = {}
+# id(connection) of read checkouts holding an admission slot.
+_admitted_checkouts: set[int] = set()
+_health_checker: threading.Thread | None = None
+_health_checker_stop = threading.Event()
+
+
+class ReplicaPool:
+    """Connection pool for one read replica, with health and load bookkeeping."""
+
+    def __init__(self, dsn: str) -> None:
+        self.dsn = dsn
+        self.pool: pool.ThreadedConnectionPool | None = None
+        self.healthy = False
+        self.lag_seconds: float | None = None
+        self.outstanding = 0
+        self.last_checked_at = 0.0
+
+    def needs_health_check(self, now: float) -> bool:
+        """Return True when the last health check is older than the configured interval."""
+        return now - self.last_checked_at >= config.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS
+
+    def check_health(self) -> None:
+        """Probe the replica, (re)creating its pool if needed, and record lag/health.
+
+        A pool with every connection checked out is busy, not unhealthy, so the
+        previous verdict is kept.
+        """
+        self.last_checked_at = time.monotonic()
+        try:
+            if self.pool is None:
+                self.pool = pool.ThreadedConnectionPool(
+                    POOL_MIN_CONNECTIONS,
+                    POOL_MAX_CONNECTIONS,
+                    dsn=self.dsn,
+                    connect_timeout=config.REPLICA_CONNECT_TIMEOUT_SECONDS,
+                )
+            conn = self.pool.getconn()
+        except pool.PoolError:
+            return
+        except Exception:
+            self.mark_unhealthy()
+            return
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SET LOCAL statement_timeout = %s", (config.REPLICA_PROBE_TIMEOUT_MS,))
+                cur.execute(REPLICA_LAG_QUERY)
+                self.lag_seconds = float(cur.fetchone()[0])
+            conn.rollback()
+        except Exception:
+            self.pool.putconn(conn, close=True)
+            self.mark_unhealthy()
+            return
+
+        self.pool.putconn(conn)
+        max_lag = config.REPLICA_MAX_LAG_SECONDS
+        self.healthy = max_lag is None or self.lag_seconds <= max_lag
+
+    def mark_unhealthy(self) -> None:
+        """Take the replica out of rotation until the next successful health check."""
+        self.healthy = False
+        self.last_checked_at = time.monotonic()
+
+    def close(self) -> None:
+        """Close all connections held by this replica pool."""
+        if self.pool is not None:
+            self.pool.closeall()
+            self.pool = None
+        self.healthy = False
 
 
 def init_db() -> None:
-    """Initialize the shared Postgres connection pool."""
-    global connection_pool
+    """Initialize the shared Postgres connection pool and any read replica pools."""
+    global connection_pool, replica_pools
     database_url = os.getenv("DATABASE_URL", "")
     if not database_url:
         raise RuntimeError("DATABASE_URL is not configured.")
 
-    connection_pool = pool.SimpleConnectionPool(1, 10, dsn=database_url)
+    connection_pool = pool.ThreadedConnectionPool(
+        POOL_MIN_CONNECTIONS,
+        POOL_MAX_CONNECTIONS,
+        dsn=database_url,
+    )
+
+    replica_pools = [ReplicaPool(dsn) for dsn in config.DATABASE_REPLICA_URLS]
+    for replica in replica_pools:
+        replica.check_health()
+    if replica_pools:
+        _start_health_checker()
 
 
 def close_db() -> None:
     """Close all pooled connections."""
-    global connection_pool
+    global connection_pool, replica_pools
+    _stop_health_checker()
     if connection_pool:
         connection_pool.closeall()
         connection_pool = None
+    for replica in replica_pools:
+        replica.close()
+    replica_pools = []
+    _replica_checkouts.clear()
+    _admitted_checkouts.clear()
 
 
 def get_db_connection():
     """Get one connection from the pool."""
     if connection_pool is None:
         raise ConnectionPoolNotInitializedError()
-    return connection_pool.getconn()
+    try:
+        return connection_pool.getconn()
+    except pool.PoolError as exc:
+        # Every pooled connection is checked out (e.g. by background jobs).
+        raise ServiceOverloadedError(config.ADMISSION_RETRY_AFTER_SECONDS) from exc
+
+
+def get_read_connection():
+    """Get a connection for a read-only query, preferring a healthy replica.
+
+    The checkout first takes an admission slot at the request's priority and
+    raises ServiceOverloadedError when shed. Falls back to the primary pool when
+    no replicas are configured or none is currently healthy. The request's
+    statement timeout is set for the connection's transaction, and the
+    connection is cancelled if the HTTP client disconnects while it is in use.
+    """
+    admission.acquire_slot()
+    try:
+        conn = _checkout_read_connection()
+    except Exception:
+        admission.release_slot()
+        raise
+    with _routing_lock:
+        _admitted_checkouts.add(id(conn))
+
+    timeout_ms = query_control.current_statement_timeout_ms()
+    if timeout_ms > 0:
+        try:
+            with conn.cursor() as cur:
+                # SET LOCAL ends with the transaction, which is rolled back on release.
+                cur.execute("SET LOCAL statement_timeout = %s", (timeout_ms,))
+        except Exception as exc:
+            release_db_connection(conn)
+            raise DataProviderError() from exc
+    query_control.track_connection(conn)
+    return conn
+
+
+@contextmanager
+def read_cursor(similarity_threshold: float | None = None) -> Iterator:
+    """Yield a cursor on a read connection (see get_read_connection), then release it.
+
+    `similarity_threshold` sets pg_trgm's word similarity threshold for the
+    transaction. Cancelled queries raise QueryTimeoutError; any other failure
+    raises DataProviderError.
+    """
+    conn = get_read_connection()
+    try:
+        with translate_query_errors(), conn.cursor() as cur:
+            if similarity_threshold is not None:
+                cur.execute(
+                    "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                    (str(similarity_threshold),),
+                )
+            yield cur
+    finally:
+        release_db_connection(conn)
+
+
+@contextmanager
+def translate_query_errors() -> Iterator[None]:
+    """Raise QueryTimeoutError for cancelled queries and DataProviderError for other failures."""
+    try:
+        yield
+    except QueryCanceledError as exc:
+        raise QueryTimeoutError() from exc
+    except Exception as exc:
+        raise DataProviderError() from exc
+
+
+def _checkout_read_connection():
+    exhausted: set[int] = set()
+    while True:
+        replica = _choose_replica(exclude=exhausted)
+        if replica is None:
+            return get_db_connection()
+        try:
+            conn = replica.pool.getconn()
+        except pool.PoolError:
+            # Busy, not broken: try another replica (or the primary) this time only.
+            with _routing_lock:
+                replica.outstanding -= 1
+            exhausted.add(id(replica))
+            continue
+        except Exception:
+            with _routing_lock:
+                replica.outstanding -= 1
+            replica.mark_unhealthy()
+            continue
+        with _routing_lock:
+            _replica_checkouts[id(conn)] = replica
+        return conn
+
+
+def release_db_connection(conn) -> None:
+    """Return a connection to the pool it was checked out from."""
+    if conn is None:
+        return
+
+    query_control.untrack_connection(conn)
+    with _routing_lock:
+        replica = _replica_checkouts.pop(id(conn), None)
+        if replica is not None:
+            replica.outstanding -= 1
+        admitted = id(conn) in _admitted_checkouts
+        _admitted_checkouts.discard(id(conn))
+
+    try:
+        _return_connection(conn, replica)
+    finally:
+        # Free the slot only once the connection is back, so the next admitted
+        # request finds it in the pool.
+        if admitted:
+            admission.release_slot()
+
+
+def _return_connection(conn, replica: ReplicaPool | None) -> None:
+    if replica is None:
+        if connection_pool is not None:
+            connection_pool.putconn(conn)
+        return
+
+    if replica.pool is None:
+        conn.close()
+        return
+    if conn.closed:
+        replica.pool.putconn(conn, close=True)
+        replica.mark_unhealthy()
+        return
+    replica.pool.putconn(conn)
+
+
+def _choose_replica(exclude: set[int] = frozenset()) -> ReplicaPool | None:
+    """Pick a healthy replica per REPLICA_ROUTING and reserve one outstanding slot on it.
+
+    Replicas whose id() is in `exclude` are skipped. Health comes from the
+    background checker; requests never probe replicas themselves.
+    """
+    global _round_robin_position
+    if not replica_pools:
+        return None
+
+    with _routing_lock:
+        candidates = [
+            replica
+            for replica in replica_pools
+            if replica.healthy and replica.pool is not None and id(replica) not in exclude
+        ]
+        if not candidates:
+            return None
+
+        if config.REPLICA_ROUTING == "least_outstanding":
+            chosen = min(candidates, key=lambda replica: replica.outstanding)
+        else:
+            chosen = candidates[_round_robin_position % len(candidates)]
+            _round_robin_position += 1
+
+        chosen.outstanding += 1
+        return chosen
+
+
+def _start_health_checker() -> None:
+    """Start the daemon thread that probes replicas every health check interval."""
+    global _health_checker
+    _health_checker_stop.clear()
+    _health_checker = threading.Thread(
+        target=_run_health_checks,
+        name="replica-health-checker",
+        daemon=True,
+    )
+    _health_checker.start()
+
+
+def _stop_health_checker() -> None:
+    global _health_checker
+    _health_checker_stop.set()
+    if _health_checker is not None:
+        _health_checker.join()
+        _health_checker = None
+
+
+def _run_health_checks() -> None:
+    while not _health_checker_stop.wait(config.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS):
+        now = time.monotonic()
+        for replica in list(replica_pools):
+            if replica.needs_health_check(now):
+                replica.check_health()
@@ -4,11 +4,18 @@
 class AppException(Exception):
     """Base exception for application errors."""
 
-    def __init__(self, message: str, status_code: int, error_code: int) -> None:
+    def __init__(
+        self,
+        message: str,
+        status_code: int,
+        error_code: int,
+        headers: dict[str, str] | None = None,
+    ) -> None:
         super().__init__(message)
         self.message = message
         self.status_code = status_code
         self.error_code = error_code
+        self.headers = headers
 
 
 class TitleNotFound(AppException):
@@ -33,6 +40,34 @@ class ContributorNotFound(AppException):
         )
 
 
+class ContributorPathNotFound(AppException):
+    """Raised when two contributors are not connected within the allowed degrees."""
+
+    def __init__(self, contributor_id: int, other_contributor_id: int) -> None:
+        super().__init__(
+            message=(
+                f"No connection found between contributors {contributor_id} "
+                f"and {other_contributor_id}"
+            ),
+            status_code=404,
+            error_code=1003,
+        )
+
+
+class ContributorPathSearchLimitExceeded(AppException):
+    """Raised when a contributor path search runs out of its node or time budget."""
+
+    def __init__(self, contributor_id: int, other_contributor_id: int) -> None:
+        super().__init__(
+            message=(
+                f"No connection found between contributors {contributor_id} "
+                f"and {other_contributor_id} within the search limits"
+            ),
+            status_code=404,
+            error_code=1004,
+        )
+
+
 class InvalidInputError(AppException):
     """Raised when client input is invalid."""
 
@@ -64,3 +99,59 @@ class ConnectionPoolNotInitializedError(AppException):
             status_code=500,
             error_code=502,
         )
+
+
+class SnapshotNotInitializedError(AppException):
+    """Raised when the snapshot read backend is selected but no snapshot is open."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            message="Internal Server Error",
+            status_code=500,
+            error_code=503,
+        )
+
+
+class CatalogEngineNotInitializedError(AppException):
+    """Raised when the in-memory catalog engine is used before it has been loaded."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            message="Internal Server Error",
+            status_code=500,
+            error_code=504,
+        )
+
+
+class SearchIndexNotInitializedError(AppException):
+    """Raised when the in-memory search index is used before it has been built."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            message="Internal Server Error",
+            status_code=500,
+            error_code=505,
+        )
+
+
+class ServiceOverloadedError(AppException):
+    """Raised when admission control sheds a request because the database is saturated."""
+
+    def __init__(self, retry_after_seconds: int) -> None:
+        super().__init__(
+            message="Service overloaded, retry later",
+            status_code=503,
+            error_code=506,
+            headers={"Retry-After": str(retry_after_seconds)},
+        )
+
+
+class QueryTimeoutError(AppException):
+    """Raised when a query exceeds its statement timeout or is cancelled for a gone client."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            message="Query timed out",
+            status_code=504,
+            error_code=507,
+        )
@@ -0,0 +1,44 @@
+"""Sparse fieldsets (`fields=` / `include=`) for detail endpoints."""
+
+from __future__ import annotations
+
+from app.core.exceptions import InvalidInputError
+
+# `include=none` asks for the header fields only.
+INCLUDE_NONE = "none"
+
+
+def parse_field_selection(
+    fields: str | None,
+    include: str | None,
+    header_fields: tuple[str, ...],
+    sections: tuple[str, ...],
+) -> set[str] | None:
+    """Resolve `fields` and `include` into the response fields to return (None for all).
+
+    `fields` lists top-level fields (header fields and sections); without it every
+    header field is returned. `include` lists the sections to add, or `none`;
+    without either parameter every section is returned. `id` is always returned.
+    """
+    selected_fields = _parse_names(fields, "fields", (*header_fields, *sections))
+    included_sections = _parse_names(include, "include", (*sections, INCLUDE_NONE))
+    if included_sections is not None and INCLUDE_NONE in included_sections:
+        if len(included_sections) > 1:
+            raise InvalidInputError("include")
+        included_sections = set()
+
+    if selected_fields is None and included_sections is None:
+        return None
+    if selected_fields is None:
+        selected_fields = set(header_fields)
+    return {"id", *selected_fields, *(included_sections or ())}
+
+
+def _parse_names(value: str | None, field_name: str, allowed: tuple[str, ...]) -> set[str] | None:
+    """Parse a comma-separated list of allowed names, treating missing/empty as None."""
+    if value is None or value.strip() == "":
+        return None
+    names = {name.strip().lower() for name in value.split(",") if name.strip()}
+    if not names or any(name not in allowed for name in names):
+        raise InvalidInputError(field_name)
+    return names
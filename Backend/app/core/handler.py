@@ -15,6 +15,7 @@ async def app_exception_handler(_request: Request, exc: AppException) -> JSONRes
             "error_code": exc.error_code,
             "status_code": exc.status_code,
         },
+        headers=exc.headers,
     )
 
 
@@ -0,0 +1,133 @@
+"""Per-request statement timeouts and cancellation of queries on client disconnect."""
+
+from __future__ import annotations
+
+import threading
+from contextvars import ContextVar
+from typing import Callable
+
+import anyio
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Set per request by the `statement_timeout` route dependency; 0 leaves the
+# server default (no limit) in place, e.g. for background jobs.
+_statement_timeout_ms: ContextVar[int] = ContextVar("statement_timeout_ms", default=0)
+
+
+class RequestQueries:
+    """Connections in use by one request, cancelled together when its client goes away.
+
+    Cancels are sent while holding the lock and connections are unregistered
+    before they go back to the pool, so a cancel can never reach a connection
+    that has already been handed to another request.
+    """
+
+    def __init__(self) -> None:
+        self.disconnected = False
+        self._connections: dict[int, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, conn) -> None:
+        """Track a connection, cancelling it at once if the client already disconnected."""
+        with self._lock:
+            self._connections[id(conn)] = conn
+            if self.disconnected:
+                _cancel(conn)
+
+    def unregister(self, conn) -> None:
+        """Forget a connection; waits for a cancel in progress to finish."""
+        with self._lock:
+            self._connections.pop(id(conn), None)
+
+    def cancel_all(self) -> None:
+        """Cancel the statement running on every registered connection."""
+        with self._lock:
+            self.disconnected = True
+            for conn in self._connections.values():
+                _cancel(conn)
+
+
+def _cancel(conn) -> None:
+    try:
+        conn.cancel()
+    except Exception:
+        # The connection may have been closed by the server.
+        pass
+
+
+# Connections checked out on behalf of the current HTTP request.
+_active_queries: ContextVar[RequestQueries | None] = ContextVar("active_queries", default=None)
+
+
+def statement_timeout(milliseconds: int) -> Callable[[], None]:
+    """Build a route dependency that sets the statement timeout for the request's queries."""
+
+    async def set_statement_timeout() -> None:
+        _statement_timeout_ms.set(milliseconds)
+
+    return set_statement_timeout
+
+
+def current_statement_timeout_ms() -> int:
+    """Return the statement timeout of the current request in milliseconds (0 for none)."""
+    return _statement_timeout_ms.get()
+
+
+def track_connection(conn) -> None:
+    """Register a checked-out connection with the current request, if any."""
+    queries = _active_queries.get()
+    if queries is not None:
+        queries.register(conn)
+
+
+def untrack_connection(conn) -> None:
+    """Forget a connection returned to its pool."""
+    queries = _active_queries.get()
+    if queries is not None:
+        queries.unregister(conn)
+
+
+class QueryCancellationMiddleware:
+    """Cancel a request's running queries as soon as its client disconnects.
+
+    Incoming ASGI messages are read by a watcher task and handed to the app
+    through a buffer, so the disconnect is noticed while a (threadpool) endpoint
+    is still blocked on the database.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = _active_queries.set(queries)
+        send_message, receive_message = anyio.create_memory_object_stream[Message](
+            max_buffer_size=float("inf")
+        )
+
+        async def watch_disconnect() -> None:
+            while True:
+                message = await receive()
+                await send_message.send(message)
+                if message["type"] == "http.disconnect":
+                    await anyio.to_thread.run_sync(queries.cancel_all)
+                    return
+
+        async def buffered_receive() -> Message:
+            return await receive_message.receive()
+
+        try:
+            async with anyio.create_task_group() as task_group:
+                task_group.start_soon(watch_disconnect)
+                try:
+                    await self.app(scope, buffered_receive, send)
+                finally:
+                    task_group.cancel_scope.cancel()
+        finally:
+            _active_queries.reset(token)
+            send_message.close()
+            receive_message.close()
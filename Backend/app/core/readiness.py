@@ -0,0 +1,227 @@
+"""Background bootstrap (migrations, seeding, warm-up) and readiness reporting."""
+
+from __future__ import annotations
+
+import re
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Callable
+
+import psycopg2
+
+from app.core import config, db
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS_DIR = BACKEND_ROOT / "app" / "scripts"
+# Serializes migrations and seeding across API processes sharing one database.
+BOOTSTRAP_LOCK_KEY = 7_261_350_042
+DATASET_POLL_SECONDS = 2.0
+PROGRESS_PATTERN = re.compile(r"(\d{1,3})%")
+# Steps run under the advisory lock, then the steps every process runs itself.
+LOCKED_STEPS = ("migrations", "seed", "related_titles")
+BOOTSTRAP_STEPS = (*LOCKED_STEPS, "dataset_version", "warm_up")
+
+STEP_PENDING = "pending"
+STEP_RUNNING = "running"
+STEP_DONE = "done"
+STEP_FAILED = "failed"
+STEP_SKIPPED = "skipped"
+
+_state_lock = threading.Lock()
+_steps: dict[str, dict] = {}
+_stop_event = threading.Event()
+_bootstrap_thread: threading.Thread | None = None
+
+
+def readiness_report() -> dict:
+    """Return {"ready": bool, "steps": {name: {"status", "detail", "progress"}}}."""
+    with _state_lock:
+        steps = {name: dict(step) for name, step in _steps.items()}
+    ready = bool(steps) and all(
+        step["status"] in (STEP_DONE, STEP_SKIPPED) for step in steps.values()
+    )
+    return {"ready": ready, "steps": steps}
+
+
+def _set_step(name: str, **fields) -> None:
+    with _state_lock:
+        _steps[name].update(fields)
+
+
+def _reset_steps(names: list[str]) -> None:
+    with _state_lock:
+        _steps.clear()
+        for name in names:
+            _steps[name] = {"status": STEP_PENDING, "detail": None, "progress": None}
+
+
+def mark_ready(detail: str) -> None:
+    """Report ready without a bootstrap (e.g. when serving a read-only snapshot)."""
+    _reset_steps(["startup"])
+    _set_step("startup", status=STEP_DONE, detail=detail, progress=100)
+
+
+def run_script(name: str, arguments: list[str]) -> None:
+    """Run a Python script or module in a subprocess, streaming its output into step detail.
+
+    Lines containing "<n>%" update the step's progress.
+    """
+    process = subprocess.Popen(
+        [sys.executable, "-u", *arguments],
+        cwd=BACKEND_ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    for line in process.stdout:
+        line = line.strip()
+        if not line:
+            continue
+        match = PROGRESS_PATTERN.search(line)
+        if match:
+            _set_step(name, detail=line, progress=min(100, int(match.group(1))))
+        else:
+            _set_step(name, detail=line)
+    if process.wait() != 0:
+        raise RuntimeError(f"{name} exited with status {process.returncode}")
+
+
+def run_migrations() -> None:
+    """Apply Alembic migrations up to head."""
+    run_script("migrations", ["-m", "alembic", "upgrade", "head"])
+
+
+def run_seed() -> None:
+    """Seed the catalog from the sample CSV files (a no-op when data exists)."""
+    run_script(
+        "seed",
+        [
+            str(SCRIPTS_DIR / "insert_csv_to_postgres.py"),
+            "--database-url",
+            config.DATABASE_URL,
+            "--resume",
+        ],
+    )
+
+
+def run_related_titles() -> None:
+    """Precompute related titles unless they already exist."""
+    run_script(
+        "related_titles",
+        [
+            str(SCRIPTS_DIR / "compute_title_similarity.py"),
+            "--database-url",
+            config.DATABASE_URL,
+            "--skip-if-present",
+        ],
+    )
+
+
+def read_loaded_dataset_version() -> int | None:
+    """Return the dataset version when the catalog has titles, else None."""
+    conn = db.get_db_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT (SELECT max(version) FROM dataset_version)
+                WHERE EXISTS (SELECT 1 FROM title)
+                """
+            )
+            row = cur.fetchone()
+        return row[0] if row else None
+    finally:
+        conn.rollback()
+        db.release_db_connection(conn)
+
+
+def wait_for_dataset_version() -> None:
+    """Block until a loaded dataset version is visible (possibly seeded by another process)."""
+    while True:
+        try:
+            version = read_loaded_dataset_version()
+        except psycopg2.Error:
+            version = None
+        if version is not None:
+            _set_step("dataset_version", detail=f"version {version}", progress=100)
+            return
+        _set_step("dataset_version", detail="waiting for a loaded dataset")
+        if _stop_event.wait(DATASET_POLL_SECONDS):
+            raise RuntimeError("stopped while waiting for a dataset")
+
+
+def _run_locked(steps: list[tuple[str, Callable[[], None]]]) -> None:
+    """Run steps while holding the cross-process bootstrap advisory lock."""
+    try:
+        lock_conn = psycopg2.connect(config.DATABASE_URL)
+    except psycopg2.Error as exc:
+        _set_step(steps[0][0], status=STEP_FAILED, detail=str(exc))
+        raise
+    try:
+        with lock_conn:
+            lock_conn.autocommit = True
+            with lock_conn.cursor() as cur:
+                for name, _ in steps:
+                    _set_step(name, detail="waiting for bootstrap lock")
+                cur.execute("SELECT pg_advisory_lock(%s)", (BOOTSTRAP_LOCK_KEY,))
+                try:
+                    for name, step in steps:
+                        _run_step(name, step)
+                finally:
+                    cur.execute("SELECT pg_advisory_unlock(%s)", (BOOTSTRAP_LOCK_KEY,))
+    finally:
+        lock_conn.close()
+
+
+def _run_step(name: str, step: Callable[[], None]) -> None:
+    _set_step(name, status=STEP_RUNNING, detail=None)
+    try:
+        step()
+    except Exception as exc:
+        _set_step(name, status=STEP_FAILED, detail=str(exc))
+        raise
+    _set_step(name, status=STEP_DONE, progress=100)
+
+
+def start_background_bootstrap(migrate_and_seed: bool, warm_up: Callable[[], None]) -> None:
+    """Run migrations, seeding, the dataset check and `warm_up` on a daemon thread.
+
+    `/ready` reports ready once every step is done. A failed step stops the
+    bootstrap and stays visible in the report.
+    """
+    global _bootstrap_thread
+    if _bootstrap_thread is not None:
+        return
+
+    step_functions = {
+        "migrations": run_migrations,
+        "seed": run_seed,
+        "related_titles": run_related_titles,
+    }
+    _reset_steps(list(BOOTSTRAP_STEPS))
+    if not migrate_and_seed:
+        for name in LOCKED_STEPS:
+            _set_step(name, status=STEP_SKIPPED)
+    _stop_event.clear()
+
+    def bootstrap() -> None:
+        try:
+            if migrate_and_seed:
+                _run_locked([(name, step_functions[name]) for name in LOCKED_STEPS])
+            _run_step("dataset_version", wait_for_dataset_version)
+            _run_step("warm_up", warm_up)
+        except Exception:
+            # The failed step is recorded in the readiness report.
+            pass
+
+    _bootstrap_thread = threading.Thread(target=bootstrap, name="bootstrap", daemon=True)
+    _bootstrap_thread.start()
+
+
+def stop_background_bootstrap() -> None:
+    """Stop waiting for a dataset; running subprocess steps finish on their own."""
+    global _bootstrap_thread
+    _stop_event.set()
+    _bootstrap_thread = None
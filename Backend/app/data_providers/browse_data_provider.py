@@ -2,99 +2,485 @@
 
 from __future__ import annotations
 
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator
+
 from app.core import db
-from app.core.exceptions import DataProviderError
+from app.data_providers.facet_index import ensure_facet_index
+from app.data_providers.read_backend import routed_to_read_backend
+
+# ORDER BY per browse sort; every order ends in an id tiebreak and has a matching
+# title index (title/id, release_year/id both ways, cast_count/id) except relevance,
+# whose placeholder takes the search words.
+BROWSE_SORT_ORDER_BY = {
+    "title_asc": "t.title, t.id",
+    "title_desc": "t.title DESC, t.id DESC",
+    "release_year_asc": "t.release_year ASC NULLS LAST, t.id",
+    "release_year_desc": "t.release_year DESC NULLS LAST, t.id DESC",
+    "cast_size_desc": "t.cast_count DESC, t.id",
+    "relevance": "similarity(t.title, %s) DESC, t.title, t.id",
+}
+EXPORT_ORDER_BY = "t.id"
+
+# Shortest search word the pg_trgm GIN indexes can narrow down.
+TRIGRAM_MIN_WORD_LENGTH = 3
+# A search word that is a whole release year matches that year by equality (an
+# ix_title_release_year lookup) instead of a text match on the year.
+YEAR_WORD_PATTERN = re.compile(r"(18[89]\d|19\d\d|20\d\d)")
+# Compiled browse queries kept per predicate shape.
+COMPILED_QUERY_CACHE_SIZE = 256
+
+BROWSE_SELECT = """
+    SELECT t.id, t.imdb_reference_id, t.title, t.release_year, mt.name
+    FROM title t
+    JOIN media_type_lkup mt ON mt.id = t.media_type
+"""
+# Typo-tolerant candidates: titles whose name, or one of whose contributors' names,
+# contains an extent similar to the search text. `<%` is served by the pg_trgm GIN
+# indexes and compares against pg_trgm.word_similarity_threshold.
+FUZZY_BROWSE_SELECT = """
+    SELECT t.id, t.imdb_reference_id, t.title, t.release_year, mt.name
+    FROM (
+        SELECT scored.title_id, max(scored.score) AS score
+        FROM (
+            SELECT ft.id AS title_id, word_similarity(%s, ft.title) AS score
+            FROM title ft
+            WHERE %s <%% ft.title
+            UNION ALL
+            SELECT fctm.title_id, word_similarity(%s, fc.name)
+            FROM contributor fc
+            JOIN contributor_title_mapping fctm ON fctm.contributor_id = fc.id
+            WHERE %s <%% fc.name
+        ) AS scored
+        GROUP BY scored.title_id
+    ) AS fuzzy
+    JOIN title t ON t.id = fuzzy.title_id
+    JOIN media_type_lkup mt ON mt.id = t.media_type
+"""
+FUZZY_ORDER_BY = "fuzzy.score DESC, t.title, t.id"
+# Ids of every title an (unordered, unpaged) browse query matches; facet counts
+# intersect them with the facet bitmaps, so they follow the page's matching rules.
+MATCH_IDS_QUERY = "SELECT m.id FROM ({matches}) AS m"
+
+# SQL per predicate key. Keys are (name, variant); search-word variants say
+# whether the word can match a release year: False, True (digits only, matched
+# as text) or "year" (a whole year, matched by equality).
+_WORD_MATCH_SQL = """
+    (
+        t.title ILIKE %s
+        OR EXISTS (
+            SELECT 1
+            FROM contributor_title_mapping wctm
+            JOIN contributor wc ON wc.id = wctm.contributor_id
+            WHERE wctm.title_id = t.id AND wc.name ILIKE %s
+        )
+        OR EXISTS (
+            SELECT 1
+            FROM title_genre wtg
+            JOIN genre_type_lkup wg ON wg.id = wtg.genre_id
+            WHERE wtg.title_id = t.id AND wg.name ILIKE %s
+        ){year_match}
+    )
+"""
+_CANDIDATE_SQL = """
+    t.id IN (
+        SELECT st.id FROM title st WHERE st.title ILIKE %s
+        UNION
+        SELECT sctm.title_id
+        FROM contributor sc
+        JOIN contributor_title_mapping sctm ON sctm.contributor_id = sc.id
+        WHERE sc.name ILIKE %s
+        UNION
+        SELECT stg.title_id
+        FROM genre_type_lkup sg
+        JOIN title_genre stg ON stg.genre_id = sg.id
+        WHERE sg.name ILIKE %s{year_match}
+    )
+"""
+PREDICATE_SQL = {
+    ("search_candidates", False): _CANDIDATE_SQL.format(year_match=""),
+    ("search_candidates", True): _CANDIDATE_SQL.format(
+        year_match="""
+        UNION
+        SELECT sy.id FROM title sy WHERE CAST(sy.release_year AS TEXT) ILIKE %s"""
+    ),
+    ("search_candidates", "year"): _CANDIDATE_SQL.format(
+        year_match="""
+        UNION
+        SELECT sy.id FROM title sy WHERE sy.release_year = %s"""
+    ),
+    ("search_word", False): _WORD_MATCH_SQL.format(year_match=""),
+    ("search_word", True): _WORD_MATCH_SQL.format(
+        year_match="\n        OR CAST(t.release_year AS TEXT) ILIKE %s"
+    ),
+    ("search_word", "year"): _WORD_MATCH_SQL.format(
+        year_match="\n        OR t.release_year = %s"
+    ),
+    ("release_year", None): "t.release_year = %s",
+    # Year bounds are range scans on ix_title_release_year.
+    ("year_from", None): "t.release_year >= %s",
+    ("year_to", None): "t.release_year <= %s",
+    ("genre", None): """
+        EXISTS (
+            SELECT 1
+            FROM title_genre gtg
+            WHERE gtg.title_id = t.id AND gtg.genre_id = %s
+        )
+    """,
+    ("genres", "any"): """
+        EXISTS (
+            SELECT 1
+            FROM title_genre gtg
+            WHERE gtg.title_id = t.id AND gtg.genre_id = ANY(%s)
+        )
+    """,
+    ("genres", "all"): """
+        t.id IN (
+            SELECT gtg.title_id
+            FROM title_genre gtg
+            WHERE gtg.genre_id = ANY(%s)
+            GROUP BY gtg.title_id
+            HAVING COUNT(DISTINCT gtg.genre_id) = %s
+        )
+    """,
+    # Compared by id so ix_title_media_type applies.
+    ("media_type", None): "t.media_type = (SELECT id FROM media_type_lkup WHERE name = %s)",
+    ("contributor", None): """
+        EXISTS (
+            SELECT 1
+            FROM contributor_title_mapping cctm
+            WHERE cctm.title_id = t.id AND cctm.contributor_id = %s
+        )
+    """,
+    ("contributor", "role"): """
+        EXISTS (
+            SELECT 1
+            FROM contributor_title_mapping cctm
+            JOIN contributor_type_lkup cctl ON cctl.id = cctm.type_id
+            WHERE cctm.title_id = t.id AND cctm.contributor_id = %s AND cctl.name = %s
+        )
+    """,
+}
+
+
+@dataclass(frozen=True)
+class BrowseQueryShape:
+    """What a browse query looks like, independent of its parameter values."""
+
+    predicates: tuple[tuple[str, object], ...]
+    order_by: str
+    paged: bool
+    fuzzy: bool = False
+
 
+@lru_cache(maxsize=COMPILED_QUERY_CACHE_SIZE)
+def compile_browse_query(shape: BrowseQueryShape) -> str:
+    """Return the SQL for a query shape; only the predicates' own semi-joins are emitted.
 
+    Placeholders follow the fuzzy search text (four times) when fuzzy, then the
+    predicate order, then the ORDER BY, then LIMIT/OFFSET when paged, matching the
+    params of `_browse_predicates`. An empty `order_by` leaves the rows unordered.
+    """
+    query = FUZZY_BROWSE_SELECT if shape.fuzzy else BROWSE_SELECT
+    if shape.predicates:
+        query += " WHERE " + " AND ".join(PREDICATE_SQL[key] for key in shape.predicates)
+    if shape.order_by:
+        query += f" ORDER BY {shape.order_by}"
+    if shape.paged:
+        query += " LIMIT %s OFFSET %s"
+    return query
+
+
+@lru_cache(maxsize=COMPILED_QUERY_CACHE_SIZE)
+def compile_match_ids_query(shape: BrowseQueryShape) -> str:
+    """Return the SQL selecting the id of every row of an unpaged query shape."""
+    return MATCH_IDS_QUERY.format(matches=compile_browse_query(shape))
+
+
+@routed_to_read_backend
 def fetch_browse_genres() -> list[dict]:
     """Fetch all genre ids and names for browse filters."""
-    conn = db.get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT g.id, g.name
-                FROM genre_type_lkup g
-                ORDER BY g.name, g.id
-                """
-            )
-            rows = cur.fetchall()
-    except Exception as exc:
-        raise DataProviderError() from exc
-    finally:
-        if conn is not None and db.connection_pool is not None:
-            db.connection_pool.putconn(conn)
+    with db.read_cursor() as cur:
+        cur.execute(
+            """
+            SELECT g.id, g.name
+            FROM genre_type_lkup g
+            ORDER BY g.name, g.id
+            """
+        )
+        rows = cur.fetchall()
 
     return [{"id": row[0], "name": row[1]} for row in rows]
 
 
+@routed_to_read_backend
+def fetch_search_token_counts(tokens: list[str]) -> dict[str, int]:
+    """Fetch titles per search token; the empty token carries the total title count.
+
+    Tokens missing from search_token_stats are left out of the result.
+    """
+    with db.read_cursor() as cur:
+        cur.execute(
+            """
+            SELECT token, title_count
+            FROM search_token_stats
+            WHERE token = ANY(%s)
+            """,
+            (list(tokens),),
+        )
+        rows = cur.fetchall()
+
+    return dict(rows)
+
+
+@routed_to_read_backend
 def fetch_browse_titles(
     search_words: list[str],
     release_year: int | None,
     genre_id: int | None,
     offset: int,
     page_size: int,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    genre_ids: list[int] | None = None,
+    genre_mode: str = "any",
+    media_type: str | None = None,
+    contributor_id: int | None = None,
+    role: str | None = None,
+    sort: str = "title_asc",
 ) -> list[tuple]:
-    """Fetch paginated titles based on search words and filters."""
-    conn = db.get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            query = """
-                SELECT DISTINCT t.id, t.imdb_reference_id, t.title, t.release_year, mt.name
-                FROM title t
-                JOIN media_type_lkup mt ON mt.id = t.media_type
-                LEFT JOIN contributor_title_mapping ctm ON ctm.title_id = t.id
-                LEFT JOIN contributor c ON c.id = ctm.contributor_id
-                LEFT JOIN title_genre tg ON tg.title_id = t.id
-                LEFT JOIN genre_type_lkup g ON g.id = tg.genre_id
-            """
+    """Fetch paginated titles based on search words and filters.
 
-            where_clauses: list[str] = []
-            params: list[object] = []
-
-            if search_words:
-                for word in search_words:
-                    pattern = f"%{word}%"
-                    where_clauses.append(
-                        """
-                        (
-                            t.title ILIKE %s
-                            OR c.name ILIKE %s
-                            OR g.name ILIKE %s
-                            OR CAST(t.release_year AS TEXT) ILIKE %s
-                        )
-                        """
-                    )
-                    params.extend([pattern, pattern, pattern, pattern])
-
-            if release_year is not None:
-                where_clauses.append("t.release_year = %s")
-                params.append(release_year)
-
-            if genre_id is not None:
-                where_clauses.append(
-                    """
-                    EXISTS (
-                        SELECT 1
-                        FROM title_genre tg2
-                        WHERE tg2.title_id = t.id AND tg2.genre_id = %s
-                    )
-                    """
-                )
-                params.append(genre_id)
+    `genre_ids` matches titles in any (genre_mode="any") or all ("all") of the
+    genres; `role` narrows `contributor_id` to one contributor type name.
+    `sort` is a key of BROWSE_SORT_ORDER_BY; "relevance" ranks by title
+    trigram similarity to the search words.
+    """
+    predicates = _browse_predicates(
+        search_words,
+        release_year,
+        genre_id,
+        year_from=year_from,
+        year_to=year_to,
+        genre_ids=genre_ids,
+        genre_mode=genre_mode,
+        media_type=media_type,
+        contributor_id=contributor_id,
+        role=role,
+    )
+    query = compile_browse_query(
+        BrowseQueryShape(
+            predicates=tuple(key for key, _ in predicates),
+            order_by=BROWSE_SORT_ORDER_BY[sort],
+            paged=True,
+        )
+    )
+    params = [param for _, predicate_params in predicates for param in predicate_params]
+    if sort == "relevance":
+        params.append(" ".join(search_words))
+    params.extend([page_size, offset])
+
+    with db.read_cursor() as cur:
+        cur.execute(query, tuple(params))
+        rows = cur.fetchall()
 
-            if where_clauses:
-                query += " WHERE " + " AND ".join(where_clauses)
+    return rows
+
+
+def fetch_fuzzy_browse_titles(
+    search_words: list[str],
+    release_year: int | None,
+    genre_id: int | None,
+    offset: int,
+    page_size: int,
+    similarity_threshold: float,
+    **filters,
+) -> list[tuple]:
+    """Fetch titles whose name or contributors' names resemble the search words.
 
-            query += " ORDER BY t.title, t.id LIMIT %s OFFSET %s"
-            params.extend([page_size, offset])
+    Postgres only. Titles are ranked by trigram word similarity to the joined
+    words; `similarity_threshold` (0-1) is the minimum similarity. `filters`
+    are the structured filters of fetch_browse_titles.
+    """
+    search_text = " ".join(search_words)
+    predicates = _browse_predicates([], release_year, genre_id, **filters)
+    query = compile_browse_query(
+        BrowseQueryShape(
+            predicates=tuple(key for key, _ in predicates),
+            order_by=FUZZY_ORDER_BY,
+            paged=True,
+            fuzzy=True,
+        )
+    )
+    params = [search_text] * 4
+    params.extend(param for _, predicate_params in predicates for param in predicate_params)
+    params.extend([page_size, offset])
 
+    with db.read_cursor(similarity_threshold=similarity_threshold) as cur:
+        cur.execute(query, tuple(params))
+        rows = cur.fetchall()
+
+    return rows
+
+
+def fetch_browse_facets(
+    search_words: list[str],
+    release_year: int | None,
+    genre_id: int | None,
+    facets: list[str],
+    similarity_threshold: float | None = None,
+    **filters,
+) -> dict[str, list[dict]]:
+    """Count all titles matching a browse query per genre and/or release year.
+
+    The read backend's matches (see fetch_browse_match_ids) are intersected
+    with the genre and year bitmaps of facet_index. Genres come most common
+    first; years in ascending order.
+    """
+    if similarity_threshold is not None:
+        filters["similarity_threshold"] = similarity_threshold
+    title_ids = fetch_browse_match_ids(search_words, release_year, genre_id, **filters)
+    return ensure_facet_index().counts(title_ids, facets)
+
+
+@routed_to_read_backend
+def fetch_browse_match_ids(
+    search_words: list[str],
+    release_year: int | None,
+    genre_id: int | None,
+    similarity_threshold: float | None = None,
+    **filters,
+) -> list[int] | None:
+    """Fetch the ids of all titles matching a browse query, or None when nothing narrows it.
+
+    Titles are matched exactly as fetch_browse_titles does, or as
+    fetch_fuzzy_browse_titles does when `similarity_threshold` is given.
+    """
+    fuzzy = similarity_threshold is not None
+    predicates = _browse_predicates(
+        [] if fuzzy else search_words, release_year, genre_id, **filters
+    )
+    if not predicates and not fuzzy:
+        return None
+    query = compile_match_ids_query(
+        BrowseQueryShape(
+            predicates=tuple(key for key, _ in predicates),
+            order_by="",
+            paged=False,
+            fuzzy=fuzzy,
+        )
+    )
+    params = [" ".join(search_words)] * 4 if fuzzy else []
+    params.extend(param for _, predicate_params in predicates for param in predicate_params)
+
+    with db.read_cursor(similarity_threshold=similarity_threshold) as cur:
+        cur.execute(query, tuple(params))
+        rows = cur.fetchall()
+
+    return [row[0] for row in rows]
+
+
+@routed_to_read_backend
+def iter_browse_titles(
+    search_words: list[str],
+    release_year: int | None,
+    genre_id: int | None,
+    batch_size: int,
+    **filters,
+) -> Iterator[list[tuple]]:
+    """Yield every title matching the browse search and filters in id order, in batches.
+
+    Rows are read through a named (server-side) cursor fetching `batch_size` rows at
+    a time, so memory stays flat for any result size. `filters` are the structured
+    filters of fetch_browse_titles. Closing the generator early closes the cursor
+    and returns the connection to its pool.
+    """
+    conn = db.get_read_connection()
+    cur = None
+    try:
+        with db.translate_query_errors():
+            predicates = _browse_predicates(search_words, release_year, genre_id, **filters)
+            # Without predicates this is a plain primary-key order scan of title.
+            query = compile_browse_query(
+                BrowseQueryShape(
+                    predicates=tuple(key for key, _ in predicates),
+                    order_by=EXPORT_ORDER_BY,
+                    paged=False,
+                )
+            )
+            params = [param for _, predicate_params in predicates for param in predicate_params]
+
+            cur = conn.cursor(name="browse_export")
+            cur.itersize = batch_size
             cur.execute(query, tuple(params))
-            rows = cur.fetchall()
-    except Exception as exc:
-        raise DataProviderError() from exc
+            while batch := cur.fetchmany(batch_size):
+                yield batch
     finally:
-        if conn is not None and db.connection_pool is not None:
-            db.connection_pool.putconn(conn)
+        try:
+            if cur is not None:
+                cur.close()
+            # End the read transaction that kept the cursor's snapshot open.
+            conn.rollback()
+        except Exception:
+            pass
+        db.release_db_connection(conn)
 
-    return rows
+
+def _browse_predicates(
+    search_words: list[str],
+    release_year: int | None,
+    genre_id: int | None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    genre_ids: list[int] | None = None,
+    genre_mode: str = "any",
+    media_type: str | None = None,
+    contributor_id: int | None = None,
+    role: str | None = None,
+) -> list[tuple[tuple[str, object], list[object]]]:
+    """Return the active browse predicates as (PREDICATE_SQL key, params) pairs.
+
+    A word matches when it occurs in the title, a contributor name, a genre name
+    or the release year. `search_words` come most selective first (see
+    service_logic.search_planner): the first one also drives a candidate set
+    through the trigram indexes, and the rest are only checked on those candidates.
+    """
+    predicates: list[tuple[tuple[str, object], list[object]]] = []
+
+    for position, word in enumerate(search_words):
+        # Only digits can occur in a release year.
+        matches_year: bool | str = word.isdigit()
+        patterns: list[object] = [f"%{word}%"] * 3
+        if YEAR_WORD_PATTERN.fullmatch(word):
+            matches_year = "year"
+            patterns.append(int(word))
+        elif matches_year:
+            patterns.append(f"%{word}%")
+        if position == 0 and len(word) >= TRIGRAM_MIN_WORD_LENGTH:
+            predicates.append((("search_candidates", matches_year), patterns))
+        predicates.append((("search_word", matches_year), patterns))
+
+    if release_year is not None:
+        predicates.append((("release_year", None), [release_year]))
+    if genre_id is not None:
+        predicates.append((("genre", None), [genre_id]))
+    if year_from is not None:
+        predicates.append((("year_from", None), [year_from]))
+    if year_to is not None:
+        predicates.append((("year_to", None), [year_to]))
+    if genre_ids:
+        if genre_mode == "all":
+            predicates.append((("genres", "all"), [list(genre_ids), len(set(genre_ids))]))
+        else:
+            predicates.append((("genres", "any"), [list(genre_ids)]))
+    if media_type is not None:
+        predicates.append((("media_type", None), [media_type]))
+    if contributor_id is not None:
+        if role is not None:
+            predicates.append((("contributor", "role"), [contributor_id, role]))
+        else:
+            predicates.append((("contributor", None), [contributor_id]))
+
+    return predicates
@@ -0,0 +1,506 @@
+"""In-process columnar catalog engine backing the data provider functions.
+
+Titles, contributors and their role mappings are loaded into NumPy arrays with
+compressed-sparse-row (CSR) adjacency in both directions, so detail lookups
+become array slices instead of SQL round trips. Selected with DATA_BACKEND=memory.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+
+from app.core import config, db
+from app.core.dataset_version import register_dataset_change_listener, start_dataset_watcher
+from app.core.exceptions import (
+    CatalogEngineNotInitializedError,
+    ContributorPathSearchLimitExceeded,
+)
+from app.data_providers import snapshot_data_provider
+
+NO_RELEASE_YEAR = -1
+CONTRIBUTOR_NODE = "contributor"
+TITLE_NODE = "title"
+LOAD_BATCH_SIZE = 100_000
+
+_engine: CatalogEngine | None = None
+_load_lock = threading.Lock()
+_ensure_lock = threading.Lock()
+
+
+class CatalogEngine:
+    """Immutable columnar copy of the catalog with CSR title/contributor adjacency."""
+
+    def __init__(
+        self,
+        media_types: list[tuple],
+        roles: list[tuple],
+        genres: list[tuple],
+        titles: list[tuple],
+        contributors: list[tuple],
+        mappings: np.ndarray,
+        title_genres: np.ndarray,
+    ) -> None:
+        """Build arrays from lookup rows, entity rows and (a, b[, c]) id arrays.
+
+        `titles` rows are (id, imdb_reference_id, title, media_type, release_year),
+        `contributors` rows are (id, imdb_reference_id, name), `mappings` holds
+        (contributor_id, type_id, title_id) and `title_genres` (title_id, genre_id).
+        """
+        self.media_type_ids = np.array([row[0] for row in media_types], dtype=np.int64)
+        self.media_type_names = [sys.intern(row[1]) for row in media_types]
+        self.role_ids = np.array([row[0] for row in roles], dtype=np.int64)
+        self.role_names = [sys.intern(row[1]) for row in roles]
+        genres = sorted(genres, key=lambda row: (row[1], row[0]))
+        self.genre_ids = np.array([row[0] for row in genres], dtype=np.int64)
+        self.genre_names = [sys.intern(row[1]) for row in genres]
+
+        titles = sorted(titles, key=lambda row: row[0])
+        self.title_ids = np.array([row[0] for row in titles], dtype=np.int64)
+        self.title_imdb_ids = _interned_array(row[1] for row in titles)
+        self.title_names = _interned_array(row[2] for row in titles)
+        self.title_media_types = codes_for(
+            self.media_type_ids, np.array([row[3] for row in titles], dtype=np.int64)
+        ).astype(np.int16)
+        self.title_release_years = np.array(
+            [NO_RELEASE_YEAR if row[4] is None else row[4] for row in titles],
+            dtype=np.int32,
+        )
+
+        contributors = sorted(contributors, key=lambda row: row[0])
+        self.contributor_ids = np.array([row[0] for row in contributors], dtype=np.int64)
+        self.contributor_imdb_ids = _interned_array(row[1] for row in contributors)
+        self.contributor_names = _interned_array(row[2] for row in contributors)
+
+        # Sort ranks approximate the Postgres ORDER BY name used by the SQL providers.
+        self.title_name_ranks = _name_ranks(self.title_names)
+        self.contributor_name_ranks = _name_ranks(self.contributor_names)
+        role_name_ranks = _name_ranks(np.array(self.role_names, dtype=object))
+
+        mappings = mappings.reshape(-1, 3)
+        mapping_contributors = codes_for(self.contributor_ids, mappings[:, 0])
+        mapping_roles = codes_for(self.role_ids, mappings[:, 1]).astype(np.int16)
+        mapping_titles = codes_for(self.title_ids, mappings[:, 2])
+        valid = (mapping_contributors >= 0) & (mapping_roles >= 0) & (mapping_titles >= 0)
+        mapping_contributors = mapping_contributors[valid]
+        mapping_roles = mapping_roles[valid]
+        mapping_titles = mapping_titles[valid]
+
+        order = np.lexsort(
+            (
+                role_name_ranks[mapping_roles],
+                self.contributor_name_ranks[mapping_contributors],
+                mapping_titles,
+            )
+        )
+        self.title_contributor_indptr = _indptr(mapping_titles, len(self.title_ids))
+        self.title_contributor_indices = mapping_contributors[order].astype(np.int32)
+        self.title_contributor_roles = mapping_roles[order]
+
+        order = np.lexsort(
+            (
+                role_name_ranks[mapping_roles],
+                self.title_name_ranks[mapping_titles],
+                mapping_contributors,
+            )
+        )
+        self.contributor_title_indptr = _indptr(mapping_contributors, len(self.contributor_ids))
+        self.contributor_title_indices = mapping_titles[order].astype(np.int32)
+        self.contributor_title_roles = mapping_roles[order]
+
+        title_genres = title_genres.reshape(-1, 2)
+        genre_titles = codes_for(self.title_ids, title_genres[:, 0])
+        genre_codes = codes_for(self.genre_ids, title_genres[:, 1])
+        valid = (genre_titles >= 0) & (genre_codes >= 0)
+        genre_titles = genre_titles[valid]
+        genre_codes = genre_codes[valid]
+        # Genre codes follow name order, so sorting by code gives ORDER BY g.name.
+        order = np.lexsort((genre_codes, genre_titles))
+        self.title_genre_indptr = _indptr(genre_titles, len(self.title_ids))
+        self.title_genre_indices = genre_codes[order].astype(np.int16)
+
+    def title_index(self, title_id: int) -> int | None:
+        """Return the array position of a title id, or None when unknown."""
+        return _position_of(self.title_ids, title_id)
+
+    def contributor_index(self, contributor_id: int) -> int | None:
+        """Return the array position of a contributor id, or None when unknown."""
+        return _position_of(self.contributor_ids, contributor_id)
+
+    def title_row(self, index: int) -> tuple:
+        """Return the provider-shaped title row for an array position."""
+        release_year = int(self.title_release_years[index])
+        return (
+            int(self.title_ids[index]),
+            self.title_imdb_ids[index],
+            self.title_names[index],
+            None if release_year == NO_RELEASE_YEAR else release_year,
+            self.media_type_names[self.title_media_types[index]],
+        )
+
+    def fetch_browse_genres(self) -> list[dict]:
+        """Fetch all genre ids and names for browse filters."""
+        return [
+            {"id": int(genre_id), "name": name}
+            for genre_id, name in zip(self.genre_ids, self.genre_names)
+        ]
+
+    def fetch_title_by_id(self, title_id: int) -> tuple | None:
+        """Fetch title row by id."""
+        index = self.title_index(title_id)
+        return None if index is None else self.title_row(index)
+
+    def fetch_genres_by_title_id(self, title_id: int) -> list[str]:
+        """Fetch genre names for a title."""
+        index = self.title_index(title_id)
+        if index is None:
+            return []
+        start, end = self.title_genre_indptr[index], self.title_genre_indptr[index + 1]
+        return [self.genre_names[code] for code in self.title_genre_indices[start:end]]
+
+    def fetch_contributor_by_id(self, contributor_id: int) -> tuple | None:
+        """Fetch contributor row by id."""
+        index = self.contributor_index(contributor_id)
+        if index is None:
+            return None
+        return (
+            int(self.contributor_ids[index]),
+            self.contributor_imdb_ids[index],
+            self.contributor_names[index],
+        )
+
+    def fetch_contributors_by_title_id(self, title_id: int) -> list[tuple]:
+        """Fetch contributor-role rows for a title."""
+        index = self.title_index(title_id)
+        if index is None:
+            return []
+        start, end = self.title_contributor_indptr[index], self.title_contributor_indptr[index + 1]
+        return [
+            (
+                int(self.contributor_ids[contributor]),
+                self.contributor_imdb_ids[contributor],
+                self.contributor_names[contributor],
+                self.role_names[role],
+            )
+            for contributor, role in zip(
+                self.title_contributor_indices[start:end],
+                self.title_contributor_roles[start:end],
+            )
+        ]
+
+    def fetch_titles_by_contributor_id(self, contributor_id: int) -> list[tuple]:
+        """Fetch title-role rows for a contributor."""
+        index = self.contributor_index(contributor_id)
+        if index is None:
+            return []
+        start, end = self.contributor_title_indptr[index], self.contributor_title_indptr[index + 1]
+        return [
+            (*self.title_row(title), self.role_names[role])
+            for title, role in zip(
+                self.contributor_title_indices[start:end],
+                self.contributor_title_roles[start:end],
+            )
+        ]
+
+    def fetch_contributor_path(
+        self,
+        contributor_id: int,
+        other_contributor_id: int,
+        max_degrees: int,
+        max_visited: int,
+        time_budget_seconds: float,
+    ) -> list[tuple] | None:
+        """Find a shortest contributor/title chain between two contributors.
+
+        Runs a bidirectional BFS over the contributor<->title bipartite graph,
+        always expanding the side with the smaller frontier. Returns rows of
+        ("contributor", id, imdb_reference_id, name) and ("title", id,
+        imdb_reference_id, title) from the first to the second contributor, or
+        None when either contributor is unknown or no chain of at most
+        `max_degrees` titles exists. Raises ContributorPathSearchLimitExceeded
+        when `max_visited` nodes or the time budget are used up first.
+        """
+        source = self.contributor_index(contributor_id)
+        target = self.contributor_index(other_contributor_id)
+        if source is None or target is None:
+            return None
+        if source == target:
+            return [self._path_row(CONTRIBUTOR_NODE, source)]
+
+        deadline = time.monotonic() + time_budget_seconds
+        sides = [_SearchSide(self, source), _SearchSide(self, target)]
+        visited = 2
+
+        while sides[0].depth + sides[1].depth < 2 * max_degrees:
+            if any(len(side.frontier) == 0 for side in sides):
+                return None
+            if visited > max_visited or time.monotonic() > deadline:
+                raise ContributorPathSearchLimitExceeded(contributor_id, other_contributor_id)
+
+            expanding = 0 if len(sides[0].frontier) <= len(sides[1].frontier) else 1
+            side, other = sides[expanding], sides[1 - expanding]
+            new_nodes = side.expand()
+            visited += len(new_nodes)
+
+            meetings = new_nodes[other.visited[side.frontier_kind][new_nodes]]
+            if len(meetings):
+                depths = [other.parents[side.frontier_kind][int(node)][1] for node in meetings]
+                meeting = int(meetings[int(np.argmin(depths))])
+                path = side.path_to(side.frontier_kind, meeting)[::-1]
+                path += other.path_to(side.frontier_kind, meeting)[1:]
+                if expanding == 1:
+                    path.reverse()
+                return [self._path_row(kind, node) for kind, node in path]
+
+        return None
+
+    def _path_row(self, kind: str, index: int) -> tuple:
+        """Return the provider-shaped row for one node of a contributor path."""
+        if kind == CONTRIBUTOR_NODE:
+            contributor_id = int(self.contributor_ids[index])
+            return (CONTRIBUTOR_NODE, *self.fetch_contributor_by_id(contributor_id))
+        title_row = self.title_row(index)
+        return (TITLE_NODE, title_row[0], title_row[1], title_row[2])
+
+    def memory_footprint(self) -> dict[str, int]:
+        """Return approximate bytes held per array, plus a `total` entry.
+
+        Object (string) arrays count their pointer storage plus each distinct
+        interned string once.
+        """
+        report: dict[str, int] = {}
+        for name, value in vars(self).items():
+            if not isinstance(value, np.ndarray):
+                continue
+            size = value.nbytes
+            if value.dtype == object:
+                size += sum(sys.getsizeof(item) for item in {id(v): v for v in value}.values())
+            report[name] = size
+        report["total"] = sum(report.values())
+        return report
+
+
+class _SearchSide:
+    """One direction of a bidirectional contributor path search."""
+
+    def __init__(self, engine: CatalogEngine, start: int) -> None:
+        self.engine = engine
+        self.visited = {
+            CONTRIBUTOR_NODE: np.zeros(len(engine.contributor_ids), dtype=bool),
+            TITLE_NODE: np.zeros(len(engine.title_ids), dtype=bool),
+        }
+        # node -> (parent node of the other kind, depth in edges); -1 marks the start.
+        self.parents: dict[str, dict[int, tuple[int, int]]] = {
+            CONTRIBUTOR_NODE: {start: (-1, 0)},
+            TITLE_NODE: {},
+        }
+        self.visited[CONTRIBUTOR_NODE][start] = True
+        self.frontier = np.array([start], dtype=np.int64)
+        self.frontier_kind = CONTRIBUTOR_NODE
+        self.depth = 0
+
+    def expand(self) -> np.ndarray:
+        """Advance the frontier one edge and return the newly reached nodes."""
+        if self.frontier_kind == CONTRIBUTOR_NODE:
+            indptr = self.engine.contributor_title_indptr
+            indices = self.engine.contributor_title_indices
+            next_kind = TITLE_NODE
+        else:
+            indptr = self.engine.title_contributor_indptr
+            indices = self.engine.title_contributor_indices
+            next_kind = CONTRIBUTOR_NODE
+
+        neighbors, parents = _gather_neighbors(self.frontier, indptr, indices)
+        unseen = ~self.visited[next_kind][neighbors]
+        neighbors, first = np.unique(neighbors[unseen], return_index=True)
+        parents = parents[unseen][first]
+
+        self.depth += 1
+        self.visited[next_kind][neighbors] = True
+        self.parents[next_kind].update(
+            (node, (parent, self.depth))
+            for node, parent in zip(neighbors.tolist(), parents.tolist())
+        )
+        self.frontier = neighbors
+        self.frontier_kind = next_kind
+        return neighbors
+
+    def path_to(self, kind: str, node: int) -> list[tuple[str, int]]:
+        """Return the (kind, node) steps from `node` back to this side's start."""
+        steps = []
+        while node != -1:
+            steps.append((kind, node))
+            node = self.parents[kind][node][0]
+            kind = TITLE_NODE if kind == CONTRIBUTOR_NODE else CONTRIBUTOR_NODE
+        return steps
+
+
+def load_catalog_engine(conn=None) -> CatalogEngine:
+    """Load the catalog into a new engine and make it the active one.
+
+    Reads through `conn` when given (Postgres or snapshot SQLite connection),
+    otherwise through a primary pool connection. That connection takes no
+    admission slot and carries no request statement timeout, since a load
+    triggered by a request serves every later request too.
+    """
+    global _engine
+    with _load_lock:
+        if conn is not None:
+            engine = _read_catalog(conn)
+        else:
+            pooled_conn = db.get_db_connection()
+            try:
+                engine = _read_catalog(pooled_conn)
+            finally:
+                db.release_db_connection(pooled_conn)
+        _engine = engine
+    return engine
+
+
+def reload_catalog_engine() -> None:
+    """Dataset-change hook: rebuild the engine and swap it in atomically."""
+    load_catalog_engine()
+
+
+def unload_catalog_engine() -> None:
+    """Drop the active engine."""
+    global _engine
+    _engine = None
+
+
+def ensure_catalog_engine() -> CatalogEngine:
+    """Return the active engine, loading it on first use.
+
+    Engines loaded from Postgres are rebuilt whenever the dataset changes;
+    with DATA_BACKEND=snapshot the engine is read from the snapshot file.
+    """
+    with _ensure_lock:
+        if _engine is not None:
+            return _engine
+        if config.DATA_BACKEND == "snapshot":
+            return load_catalog_engine(snapshot_data_provider.get_snapshot_connection())
+
+        engine = load_catalog_engine()
+        register_dataset_change_listener(reload_catalog_engine)
+        start_dataset_watcher(config.DATASET_CHECK_INTERVAL_SECONDS)
+        return engine
+
+
+def get_catalog_engine() -> CatalogEngine:
+    """Return the active engine or raise when none has been loaded."""
+    if _engine is None:
+        raise CatalogEngineNotInitializedError()
+    return _engine
+
+
+def _read_catalog(conn) -> CatalogEngine:
+    """Read all catalog tables through one connection and build an engine."""
+    return CatalogEngine(
+        media_types=fetch_all_rows(conn, "SELECT id, name FROM media_type_lkup"),
+        roles=fetch_all_rows(conn, "SELECT id, name FROM contributor_type_lkup"),
+        genres=fetch_all_rows(conn, "SELECT id, name FROM genre_type_lkup"),
+        titles=fetch_all_rows(
+            conn,
+            "SELECT id, imdb_reference_id, title, media_type, release_year FROM title",
+        ),
+        contributors=fetch_all_rows(conn, "SELECT id, imdb_reference_id, name FROM contributor"),
+        mappings=fetch_int_array(
+            conn,
+            "SELECT contributor_id, type_id, title_id FROM contributor_title_mapping",
+            columns=3,
+        ),
+        title_genres=fetch_int_array(
+            conn, "SELECT title_id, genre_id FROM title_genre", columns=2
+        ),
+    )
+
+
+def fetch_all_rows(conn, sql: str) -> list[tuple]:
+    """Fetch every row of a query in batches."""
+    rows: list[tuple] = []
+    for batch in _iter_batches(conn, sql):
+        rows.extend(batch)
+    return rows
+
+
+def fetch_int_array(conn, sql: str, columns: int) -> np.ndarray:
+    """Fetch an all-integer query into one (n, columns) int64 array without row tuples."""
+    chunks = [np.array(batch, dtype=np.int64) for batch in _iter_batches(conn, sql)]
+    if not chunks:
+        return np.empty((0, columns), dtype=np.int64)
+    return np.concatenate(chunks)
+
+
+def _iter_batches(conn, sql: str):
+    """Yield row batches, using a server-side cursor on Postgres connections."""
+    if isinstance(conn, sqlite3.Connection):
+        cur = conn.execute(sql)
+        while batch := cur.fetchmany(LOAD_BATCH_SIZE):
+            yield batch
+        return
+
+    with conn.cursor(name="catalog_engine_load") as cur:
+        cur.itersize = LOAD_BATCH_SIZE
+        cur.execute(sql)
+        while batch := cur.fetchmany(LOAD_BATCH_SIZE):
+            yield batch
+
+
+def _gather_neighbors(
+    nodes: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return (neighbor, source node) pairs for all CSR rows in `nodes`."""
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    total = int(counts.sum())
+    offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+    neighbors = indices[np.repeat(starts, counts) + offsets].astype(np.int64)
+    return neighbors, np.repeat(nodes, counts)
+
+
+def _interned_array(values) -> np.ndarray:
+    """Build an object array of interned strings so repeated values share storage."""
+    return np.array(
+        [sys.intern(value) if isinstance(value, str) else value for value in values],
+        dtype=object,
+    )
+
+
+def _name_ranks(names: np.ndarray) -> np.ndarray:
+    """Return each name's position in case-insensitive sorted order."""
+    order = sorted(range(len(names)), key=lambda index: (names[index].casefold(), names[index]))
+    ranks = np.empty(len(names), dtype=np.int64)
+    ranks[order] = np.arange(len(names), dtype=np.int64)
+    return ranks
+
+
+def codes_for(sorted_ids: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Map ids to positions in `sorted_ids`, using -1 for ids that are not present."""
+    if len(sorted_ids) == 0:
+        return np.full(len(ids), -1, dtype=np.int64)
+    order = np.argsort(sorted_ids, kind="stable")
+    positions = np.searchsorted(sorted_ids, ids, sorter=order)
+    positions = np.minimum(positions, len(sorted_ids) - 1)
+    codes = order[positions]
+    return np.where(sorted_ids[codes] == ids, codes, -1)
+
+
+def _indptr(row_indices: np.ndarray, row_count: int) -> np.ndarray:
+    """Build a CSR index pointer array from (unsorted) row indices."""
+    indptr = np.zeros(row_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_indices, minlength=row_count), out=indptr[1:])
+    return indptr
+
+
+def _position_of(sorted_ids: np.ndarray, entity_id: int) -> int | None:
+    """Binary-search an id in an ascending id array."""
+    position = int(np.searchsorted(sorted_ids, entity_id))
+    if position < len(sorted_ids) and sorted_ids[position] == entity_id:
+        return position
+    return None
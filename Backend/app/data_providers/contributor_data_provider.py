@@ -3,54 +3,111 @@
 from __future__ import annotations
 
 from app.core import db
-from app.core.exceptions import DataProviderError
+from app.data_providers.catalog_engine import ensure_catalog_engine
+from app.data_providers.read_backend import routed_to_read_backend
 
+# Contributors whose name contains an extent similar to the query (`<%`, served by
+# ix_contributor_name_trgm), best match first; ties go to the most credited.
+CONTRIBUTOR_SEARCH_SELECT = """
+    SELECT matches.id, matches.imdb_reference_id, matches.name, matches.title_count,
+        matches.score
+    FROM (
+        SELECT c.id, c.imdb_reference_id, c.name, c.title_count,
+            word_similarity(%s, c.name) AS score
+        FROM contributor c
+        WHERE %s <%% c.name
+    ) AS matches
+"""
+# Keyset continuation after the (score, title_count, id) of the previous page's last row.
+CONTRIBUTOR_SEARCH_AFTER = """
+    WHERE (-matches.score, -matches.title_count, matches.id) > (-%s::real, -%s, %s)
+"""
+CONTRIBUTOR_SEARCH_ORDER = """
+    ORDER BY matches.score DESC, matches.title_count DESC, matches.id
+    LIMIT %s
+"""
 
+
+@routed_to_read_backend
 def fetch_contributor_by_id(contributor_id: int) -> tuple | None:
     """Fetch contributor row by id."""
-    conn = db.get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT c.id, c.imdb_reference_id, c.name
-                FROM contributor c
-                WHERE c.id = %s
-                LIMIT 1
-                """,
-                (contributor_id,),
-            )
-            contributor_row = cur.fetchone()
-    except Exception as exc:
-        raise DataProviderError() from exc
-    finally:
-        if conn is not None and db.connection_pool is not None:
-            db.connection_pool.putconn(conn)
+    with db.read_cursor() as cur:
+        cur.execute(
+            """
+            SELECT c.id, c.imdb_reference_id, c.name
+            FROM contributor c
+            WHERE c.id = %s
+            LIMIT 1
+            """,
+            (contributor_id,),
+        )
+        contributor_row = cur.fetchone()
 
     return contributor_row
 
 
+@routed_to_read_backend
 def fetch_contributors_by_title_id(title_id: int) -> list[tuple]:
     """Fetch contributor-role rows for a title."""
-    conn = db.get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT c.id, c.imdb_reference_id, c.name, ctl.name
-                FROM contributor_title_mapping ctm
-                JOIN contributor c ON c.id = ctm.contributor_id
-                JOIN contributor_type_lkup ctl ON ctl.id = ctm.type_id
-                WHERE ctm.title_id = %s
-                ORDER BY c.name, ctl.name
-                """,
-                (title_id,),
-            )
-            contributor_rows = cur.fetchall()
-    except Exception as exc:
-        raise DataProviderError() from exc
-    finally:
-        if conn is not None and db.connection_pool is not None:
-            db.connection_pool.putconn(conn)
+    with db.read_cursor() as cur:
+        cur.execute(
+            """
+            SELECT c.id, c.imdb_reference_id, c.name, ctl.name
+            FROM contributor_title_mapping ctm
+            JOIN contributor c ON c.id = ctm.contributor_id
+            JOIN contributor_type_lkup ctl ON ctl.id = ctm.type_id
+            WHERE ctm.title_id = %s
+            ORDER BY c.name, ctl.name
+            """,
+            (title_id,),
+        )
+        contributor_rows = cur.fetchall()
 
     return contributor_rows
+
+
+def fetch_contributor_path(
+    contributor_id: int,
+    other_contributor_id: int,
+    max_degrees: int,
+    max_visited: int,
+    time_budget_seconds: float,
+) -> list[tuple] | None:
+    """Fetch the shortest contributor/title chain between two contributors.
+
+    Served from the in-memory catalog graph, which is loaded on first use.
+    """
+    return ensure_catalog_engine().fetch_contributor_path(
+        contributor_id,
+        other_contributor_id,
+        max_degrees=max_degrees,
+        max_visited=max_visited,
+        time_budget_seconds=time_budget_seconds,
+    )
+
+
+@routed_to_read_backend
+def fetch_contributor_search(
+    query: str,
+    page_size: int,
+    similarity_threshold: float,
+    after: tuple[float, int, int] | None = None,
+) -> list[tuple]:
+    """Fetch contributors whose name resembles `query`, ranked by word similarity.
+
+    Rows are (id, imdb_reference_id, name, title_count, score);
+    `after` is the (score, title_count, id) of the last row of the previous page.
+    """
+    sql = CONTRIBUTOR_SEARCH_SELECT
+    params: list = [query, query]
+    if after is not None:
+        sql += CONTRIBUTOR_SEARCH_AFTER
+        params.extend(after)
+    sql += CONTRIBUTOR_SEARCH_ORDER
+    params.append(page_size)
+
+    with db.read_cursor(similarity_threshold=similarity_threshold) as cur:
+        cur.execute(sql, tuple(params))
+        rows = cur.fetchall()
+
+    return rows
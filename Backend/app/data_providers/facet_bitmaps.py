@@ -0,0 +1,188 @@
+"""Roaring-style compressed bitmaps for browse facet counts.
+
+Title positions are split into chunks of 2**16. Inside a chunk, a facet value's
+titles are kept either as a sorted uint16 array (sparse chunks) or as a
+1024-word uint64 bitmap (dense chunks), whichever is smaller. All bitmaps of a
+facet family (every genre, or every release year) are counted together against
+one dense bitmap of the current search result. TitleFacets pairs the genre and
+year families with the facet rows the browse API returns.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+WORDS_PER_CHUNK = CHUNK_SIZE // 64
+# A chunk with more members than this is stored as a bitmap (8 KiB) instead of an array.
+ARRAY_CONTAINER_LIMIT = 4096
+GENRE_FACET = "genre"
+YEAR_FACET = "year"
+
+
+def dense_bitmap(positions: np.ndarray, title_count: int) -> np.ndarray:
+    """Return title positions as a dense uint64 bitmap covering whole chunks."""
+    chunk_count = max(1, -(-title_count // CHUNK_SIZE))
+    mask = np.zeros(chunk_count * CHUNK_SIZE, dtype=bool)
+    mask[positions] = True
+    return np.packbits(mask, bitorder="little").view("<u8")
+
+
+class BitmapFamily:
+    """Compressed title bitmaps for each value of one facet, counted in a single pass."""
+
+    def __init__(self, value_codes: np.ndarray, positions: np.ndarray, value_count: int) -> None:
+        self.value_count = value_count
+        # Sorted, de-duplicated (value, position) pairs.
+        span = int(positions.max(initial=0)) + 1
+        keys = np.unique(value_codes.astype(np.int64) * span + positions.astype(np.int64))
+        value_codes, positions = keys // span, keys % span
+        self.cardinalities = np.bincount(value_codes, minlength=value_count)
+
+        chunks = positions >> CHUNK_BITS
+        _, container_starts, container_sizes = np.unique(
+            value_codes * (int(chunks.max(initial=0)) + 1) + chunks,
+            return_index=True,
+            return_counts=True,
+        )
+        container_values = value_codes[container_starts]
+        container_chunks = chunks[container_starts]
+
+        # Sparse chunks: low 16 bits of each member, containers laid out back to back.
+        is_array = container_sizes <= ARRAY_CONTAINER_LIMIT
+        element_is_array = np.repeat(is_array, container_sizes)
+        self.array_lows = (positions[element_is_array] & (CHUNK_SIZE - 1)).astype(np.uint16)
+        self.array_sizes = container_sizes[is_array]
+        self.array_chunks = container_chunks[is_array].astype(np.int32)
+        self.array_values = container_values[is_array].astype(np.int32)
+
+        # Dense chunks: one 1024-word row per container.
+        bitmap_count = int((~is_array).sum())
+        bitmap_rows = np.repeat(
+            np.arange(bitmap_count, dtype=np.int64),
+            container_sizes[~is_array],
+        )
+        self.bitmap_words = np.zeros((bitmap_count, WORDS_PER_CHUNK), dtype=np.uint64)
+        lows = positions[~element_is_array] & (CHUNK_SIZE - 1)
+        np.bitwise_or.at(
+            self.bitmap_words,
+            (bitmap_rows, lows >> 6),
+            np.left_shift(np.uint64(1), (lows & 63).astype(np.uint64)),
+        )
+        self.bitmap_chunks = container_chunks[~is_array].astype(np.int32)
+        self.bitmap_values = container_values[~is_array].astype(np.int32)
+
+    def count(self, matches: np.ndarray) -> np.ndarray:
+        """Return per-value counts of titles in both the value's bitmap and `matches`.
+
+        `matches` is a dense bitmap from `dense_bitmap`.
+        """
+        counts = np.zeros(self.value_count, dtype=np.int64)
+
+        if len(self.array_lows):
+            lows = self.array_lows.astype(np.int64)
+            chunks = np.repeat(self.array_chunks.astype(np.int64), self.array_sizes)
+            word_index = chunks * WORDS_PER_CHUNK + (lows >> 6)
+            hits = (matches[word_index] >> (lows & 63).astype(np.uint64)) & np.uint64(1)
+            container_hits = np.add.reduceat(
+                hits.astype(np.int64),
+                np.cumsum(self.array_sizes) - self.array_sizes,
+            )
+            counts += np.bincount(
+                self.array_values,
+                weights=container_hits,
+                minlength=self.value_count,
+            ).astype(np.int64)
+
+        if len(self.bitmap_words):
+            chunk_words = matches.reshape(-1, WORDS_PER_CHUNK)[self.bitmap_chunks]
+            container_hits = np.bitwise_count(self.bitmap_words & chunk_words).sum(
+                axis=1,
+                dtype=np.int64,
+            )
+            counts += np.bincount(
+                self.bitmap_values,
+                weights=container_hits,
+                minlength=self.value_count,
+            ).astype(np.int64)
+
+        return counts
+
+    def memory_footprint(self) -> int:
+        """Return the number of bytes held by the compressed containers."""
+        return sum(
+            array.nbytes
+            for array in (
+                self.array_lows,
+                self.array_sizes,
+                self.array_chunks,
+                self.array_values,
+                self.bitmap_words,
+                self.bitmap_chunks,
+                self.bitmap_values,
+            )
+        )
+
+
+class TitleFacets:
+    """Genre and release-year bitmap families over title positions."""
+
+    def __init__(
+        self,
+        genres: list[tuple],
+        genre_codes: np.ndarray,
+        genre_positions: np.ndarray,
+        release_years: np.ndarray,
+    ) -> None:
+        """Build both families.
+
+        `genres` are (id, name) rows in genre-code order, `genre_codes` and
+        `genre_positions` the (genre, title) pairs, and `release_years` one year
+        per title position (negative when unknown).
+        """
+        self.title_count = len(release_years)
+        self.genre_ids = [int(row[0]) for row in genres]
+        self.genre_names = [row[1] for row in genres]
+        year_positions = np.flatnonzero(release_years >= 0)
+        self.distinct_years, year_codes = np.unique(
+            release_years[year_positions],
+            return_inverse=True,
+        )
+        self.genres = BitmapFamily(genre_codes, genre_positions, len(genres))
+        self.years = BitmapFamily(year_codes, year_positions, len(self.distinct_years))
+
+    def counts(self, matches: np.ndarray | None, facets: list[str]) -> dict[str, list[dict]]:
+        """Return non-zero genre and/or year counts over the match set (None: every title).
+
+        `matches` holds title positions. Genres come most common first; years in
+        ascending order.
+        """
+        dense_matches = dense_bitmap(matches, self.title_count) if matches is not None else None
+
+        def counts_for(family: BitmapFamily) -> np.ndarray:
+            if dense_matches is None:
+                return family.cardinalities
+            return family.count(dense_matches)
+
+        result: dict[str, list[dict]] = {}
+        if GENRE_FACET in facets:
+            genre_counts = counts_for(self.genres)
+            result[GENRE_FACET] = sorted(
+                (
+                    {
+                        "id": self.genre_ids[code],
+                        "name": self.genre_names[code],
+                        "count": int(genre_counts[code]),
+                    }
+                    for code in np.flatnonzero(genre_counts)
+                ),
+                key=lambda facet: (-facet["count"], facet["name"]),
+            )
+        if YEAR_FACET in facets:
+            year_counts = counts_for(self.years)
+            result[YEAR_FACET] = [
+                {"year": int(self.distinct_years[code]), "count": int(year_counts[code])}
+                for code in np.flatnonzero(year_counts)
+            ]
+        return result
@@ -0,0 +1,126 @@
+"""Genre and release-year facet bitmaps for the SQL read backends.
+
+Postgres and the SQLite snapshot find the titles a browse query matches; facet
+counts then intersect those titles with per-genre and per-year bitmaps (see
+facet_bitmaps) instead of grouping the match set in SQL. Only integer columns
+and the genre names are loaded, so the index is small next to the catalog engine.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+from app.core import config, db
+from app.core.dataset_version import register_dataset_change_listener, start_dataset_watcher
+from app.data_providers import snapshot_data_provider
+from app.data_providers.catalog_engine import (
+    NO_RELEASE_YEAR,
+    codes_for,
+    fetch_all_rows,
+    fetch_int_array,
+)
+from app.data_providers.facet_bitmaps import TitleFacets
+
+_index: FacetIndex | None = None
+_load_lock = threading.Lock()
+_ensure_lock = threading.Lock()
+
+
+class FacetIndex:
+    """Facet bitmaps over every title, addressed by title id."""
+
+    def __init__(self, genres: list[tuple], titles: np.ndarray, title_genres: np.ndarray) -> None:
+        """Build the bitmaps from genre rows and title / title-genre id arrays.
+
+        `genres` are (id, name) rows, `titles` holds (title_id, release_year)
+        with NO_RELEASE_YEAR for unknown years, and `title_genres` (title_id, genre_id).
+        """
+        titles = titles.reshape(-1, 2)
+        titles = titles[np.argsort(titles[:, 0], kind="stable")]
+        self.title_ids = titles[:, 0]
+
+        genres = sorted(genres, key=lambda row: (row[1], row[0]))
+        genre_ids = np.array([row[0] for row in genres], dtype=np.int64)
+        title_genres = title_genres.reshape(-1, 2)
+        genre_positions = codes_for(self.title_ids, title_genres[:, 0])
+        genre_codes = codes_for(genre_ids, title_genres[:, 1])
+        valid = (genre_positions >= 0) & (genre_codes >= 0)
+        self.facets = TitleFacets(
+            genres,
+            genre_codes[valid],
+            genre_positions[valid],
+            titles[:, 1],
+        )
+
+    def counts(self, title_ids: list[int] | None, facets: list[str]) -> dict[str, list[dict]]:
+        """Return non-zero genre and/or year counts over the given titles (None: every title)."""
+        if title_ids is None:
+            return self.facets.counts(None, facets)
+        positions = codes_for(self.title_ids, np.array(title_ids, dtype=np.int64))
+        return self.facets.counts(positions[positions >= 0], facets)
+
+
+def load_facet_index(conn=None) -> FacetIndex:
+    """Load a new index and make it the active one.
+
+    Reads through `conn` when given (Postgres or snapshot SQLite connection),
+    otherwise through a primary pool connection, like load_catalog_engine.
+    """
+    global _index
+    with _load_lock:
+        if conn is not None:
+            index = _read_facet_index(conn)
+        else:
+            pooled_conn = db.get_db_connection()
+            try:
+                index = _read_facet_index(pooled_conn)
+            finally:
+                db.release_db_connection(pooled_conn)
+        _index = index
+    return index
+
+
+def reload_facet_index() -> None:
+    """Dataset-change hook: rebuild the index and swap it in atomically."""
+    load_facet_index()
+
+
+def unload_facet_index() -> None:
+    """Drop the active index."""
+    global _index
+    _index = None
+
+
+def ensure_facet_index() -> FacetIndex:
+    """Return the active index, loading it on first use.
+
+    Indexes loaded from Postgres are rebuilt whenever the dataset changes;
+    with DATA_BACKEND=snapshot the index is read from the snapshot file.
+    """
+    with _ensure_lock:
+        if _index is not None:
+            return _index
+        if config.DATA_BACKEND == "snapshot":
+            return load_facet_index(snapshot_data_provider.get_snapshot_connection())
+
+        index = load_facet_index()
+        register_dataset_change_listener(reload_facet_index)
+        start_dataset_watcher(config.DATASET_CHECK_INTERVAL_SECONDS)
+        return index
+
+
+def _read_facet_index(conn) -> FacetIndex:
+    """Read the facet columns through one connection and build an index."""
+    return FacetIndex(
+        genres=fetch_all_rows(conn, "SELECT id, name FROM genre_type_lkup"),
+        titles=fetch_int_array(
+            conn,
+            f"SELECT id, COALESCE(release_year, {NO_RELEASE_YEAR}) FROM title",
+            columns=2,
+        ),
+        title_genres=fetch_int_array(
+            conn, "SELECT title_id, genre_id FROM title_genre", columns=2
+        ),
+    )
@@ -0,0 +1,31 @@
+"""Routing of data provider calls to the configured read backend."""
+
+from __future__ import annotations
+
+from functools import wraps
+from typing import Callable
+
+from app.core import config
+from app.data_providers import catalog_engine, snapshot_data_provider
+
+
+def resolve_backend_function(function_name: str) -> Callable | None:
+    """Return the configured non-Postgres implementation of a provider function, if any."""
+    if config.DATA_BACKEND == "snapshot":
+        return getattr(snapshot_data_provider, function_name, None)
+    if config.DATA_BACKEND == "memory":
+        return getattr(catalog_engine.get_catalog_engine(), function_name, None)
+    return None
+
+
+def routed_to_read_backend(func: Callable) -> Callable:
+    """Serve a Postgres provider function from DATA_BACKEND when that backend implements it."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        backend_function = resolve_backend_function(func.__name__)
+        if backend_function is not None:
+            return backend_function(*args, **kwargs)
+        return func(*args, **kwargs)
+
+    return wrapper
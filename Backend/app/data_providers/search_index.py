@@ -0,0 +1,438 @@
+"""In-process inverted index for browse search.
+
+Built from the catalog engine: every token of a title's name, its contributors'
+names, its genre names and its release year maps to a sorted NumPy posting list
+of title positions. A query intersects the posting lists of its words,
+smallest first, and pages through the matches in (title, id) order using a
+precomputed rank array. Selected with SEARCH_BACKEND=memory.
+
+Per-genre and per-year compressed bitmaps (see facet_bitmaps) give browse facet
+counts for any match set in one pass.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from bisect import bisect_left
+
+import numpy as np
+
+from app.core import config
+from app.core.dataset_version import register_dataset_change_listener
+from app.core.exceptions import SearchIndexNotInitializedError
+from app.data_providers.catalog_engine import (
+    CatalogEngine,
+    ensure_catalog_engine,
+    get_catalog_engine,
+)
+from app.data_providers.facet_bitmaps import TitleFacets
+
+TOKEN_PATTERN = re.compile(r"\w+")
+# Words shorter than this only match whole tokens; longer words also match as a prefix.
+MIN_PREFIX_LENGTH = 3
+
+_index: SearchIndex | None = None
+_build_lock = threading.Lock()
+_ensure_lock = threading.Lock()
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into case-folded word tokens."""
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+class SearchIndex:
+    """Token -> sorted title-position posting lists over one catalog engine."""
+
+    def __init__(self, engine: CatalogEngine) -> None:
+        self.engine = engine
+        title_count = len(engine.title_ids)
+
+        vocabulary: dict[str, int] = {}
+
+        def token_ids(text: str) -> list[int]:
+            return [vocabulary.setdefault(token, len(vocabulary)) for token in tokenize(text)]
+
+        title_token_ids = [token_ids(name) for name in engine.title_names]
+        contributor_token_ids = [token_ids(name) for name in engine.contributor_names]
+        genre_token_ids = [token_ids(name) for name in engine.genre_names]
+        years = engine.title_release_years
+        year_titles = np.flatnonzero(years >= 0)
+        distinct_years, year_codes = np.unique(years[year_titles], return_inverse=True)
+        year_token_ids = np.array(
+            [token_ids(str(year))[0] for year in distinct_years],
+            dtype=np.int64,
+        )
+
+        genre_indptr, genre_titles = _transpose(
+            engine.title_genre_indptr,
+            engine.title_genre_indices,
+            len(engine.genre_names),
+        )
+        contributor_pair_tokens, contributor_pair_titles = _expand_over_edges(
+            contributor_token_ids,
+            engine.contributor_title_indptr,
+            engine.contributor_title_indices,
+        )
+        genre_pair_tokens, genre_pair_titles = _expand_over_edges(
+            genre_token_ids,
+            genre_indptr,
+            genre_titles,
+        )
+
+        pair_tokens = np.concatenate(
+            [
+                _flatten(title_token_ids),
+                contributor_pair_tokens,
+                genre_pair_tokens,
+                year_token_ids[year_codes],
+            ]
+        )
+        pair_titles = np.concatenate(
+            [
+                np.repeat(
+                    np.arange(title_count, dtype=np.int64),
+                    [len(tokens) for tokens in title_token_ids],
+                ),
+                contributor_pair_titles,
+                genre_pair_titles,
+                year_titles.astype(np.int64),
+            ]
+        )
+
+        # One sorted, de-duplicated key per (token, title) pair gives every posting list sorted.
+        keys = np.unique(pair_tokens * max(title_count, 1) + pair_titles)
+        key_tokens = keys // max(title_count, 1)
+        self.postings = (keys % max(title_count, 1)).astype(np.int32)
+        token_posting_indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(key_tokens, minlength=len(vocabulary)), out=token_posting_indptr[1:])
+
+        # Sorted vocabulary for exact and prefix lookups.
+        self.vocabulary = sorted(vocabulary)
+        vocabulary_order = np.array(
+            [vocabulary[token] for token in self.vocabulary], dtype=np.int64
+        )
+        self.term_starts = token_posting_indptr[vocabulary_order]
+        self.term_ends = token_posting_indptr[vocabulary_order + 1]
+
+        self.genre_postings = {
+            int(genre_id): genre_titles[genre_indptr[code]:genre_indptr[code + 1]]
+            for code, genre_id in enumerate(engine.genre_ids)
+        }
+        year_order = np.argsort(year_codes, kind="stable")
+        year_bounds = np.searchsorted(year_codes[year_order], np.arange(len(distinct_years) + 1))
+        self.year_postings = {
+            int(year): year_titles[
+                year_order[year_bounds[code]:year_bounds[code + 1]]
+            ].astype(np.int32)
+            for code, year in enumerate(distinct_years)
+        }
+
+        self.media_type_postings = {
+            name: np.flatnonzero(engine.title_media_types == code).astype(np.int32)
+            for code, name in enumerate(engine.media_type_names)
+        }
+        self.facets = TitleFacets(
+            list(zip(engine.genre_ids, engine.genre_names)),
+            engine.title_genre_indices,
+            np.repeat(np.arange(title_count, dtype=np.int64), np.diff(engine.title_genre_indptr)),
+            years,
+        )
+
+        # title_order lists positions in (title, id) order; rank is its inverse.
+        self.title_order = np.lexsort((engine.title_ids, engine.title_name_ranks)).astype(np.int32)
+        self.title_rank = np.empty(title_count, dtype=np.int32)
+        self.title_rank[self.title_order] = np.arange(title_count, dtype=np.int32)
+        # (order, rank) pairs for the other browse sorts, built on first use.
+        self._sort_orders: dict[str, tuple[np.ndarray, np.ndarray]] = {
+            "title_asc": (self.title_order, self.title_rank),
+        }
+
+    def word_postings(self, word: str) -> np.ndarray:
+        """Return sorted title positions matching every token of one search word."""
+        lists = [self._token_postings(token) for token in tokenize(word)]
+        if not lists:
+            return np.empty(0, dtype=np.int32)
+        return intersect_postings(lists)
+
+    def match(
+        self,
+        search_words: list[str],
+        release_year: int | None,
+        genre_id: int | None,
+        year_from: int | None = None,
+        year_to: int | None = None,
+        genre_ids: list[int] | None = None,
+        genre_mode: str = "any",
+        media_type: str | None = None,
+        contributor_id: int | None = None,
+        role: str | None = None,
+    ) -> np.ndarray | None:
+        """Return sorted matching title positions, or None when nothing filters the catalog."""
+        empty = np.empty(0, dtype=np.int32)
+        lists = [self.word_postings(word) for word in search_words]
+        if release_year is not None:
+            lists.append(self.year_postings.get(release_year, empty))
+        if genre_id is not None:
+            lists.append(self.genre_postings.get(genre_id, empty))
+        if year_from is not None or year_to is not None:
+            years = self.engine.title_release_years
+            in_range = years >= (year_from if year_from is not None else 0)
+            if year_to is not None:
+                in_range &= years <= year_to
+            lists.append(np.flatnonzero(in_range).astype(np.int32))
+        if genre_ids:
+            genre_lists = [self.genre_postings.get(value, empty) for value in set(genre_ids)]
+            if genre_mode == "all":
+                lists.append(intersect_postings(genre_lists))
+            else:
+                lists.append(np.unique(np.concatenate(genre_lists)))
+        if media_type is not None:
+            lists.append(self.media_type_postings.get(media_type, empty))
+        if contributor_id is not None:
+            lists.append(self._contributor_postings(contributor_id, role))
+        if not lists:
+            return None
+        return intersect_postings(lists)
+
+    def page(
+        self,
+        matches: np.ndarray | None,
+        offset: int,
+        page_size: int,
+        sort: str = "title_asc",
+    ) -> np.ndarray:
+        """Return the title positions of one page of matches in `sort` order."""
+        order, rank = self.sort_order(sort)
+        if matches is None:
+            return order[offset:offset + page_size]
+
+        end = offset + page_size
+        ranks = rank[matches]
+        if end < len(ranks):
+            ranks = ranks[np.argpartition(ranks, end - 1)[:end]]
+        return order[np.sort(ranks)[offset:end]]
+
+    def sort_order(self, sort: str) -> tuple[np.ndarray, np.ndarray]:
+        """Return (positions in sort order, rank of each position) for a browse sort.
+
+        Orders match the SQL providers, including the id tiebreak and missing years
+        last. "relevance" has no index-side score and follows title order.
+        """
+        if sort in self._sort_orders:
+            return self._sort_orders[sort]
+
+        engine = self.engine
+        ids = engine.title_ids
+        years = engine.title_release_years.astype(np.int64)
+        missing_last = np.iinfo(np.int64).max
+        if sort == "title_desc":
+            order = self.title_order[::-1].copy()
+        elif sort == "release_year_asc":
+            order = np.lexsort((ids, np.where(years < 0, missing_last, years)))
+        elif sort == "release_year_desc":
+            order = np.lexsort((-ids, np.where(years < 0, missing_last, -years)))
+        elif sort == "cast_size_desc":
+            order = np.lexsort((ids, -self._cast_counts()))
+        else:
+            order = self.title_order
+
+        order = order.astype(np.int32)
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[order] = np.arange(len(order), dtype=np.int32)
+        self._sort_orders[sort] = (order, rank)
+        return order, rank
+
+    def _cast_counts(self) -> np.ndarray:
+        """Return the number of distinct contributors credited on each title."""
+        engine = self.engine
+        title_count = len(engine.title_ids)
+        rows = np.repeat(
+            np.arange(title_count, dtype=np.int64),
+            np.diff(engine.title_contributor_indptr),
+        )
+        contributor_count = max(len(engine.contributor_ids), 1)
+        pairs = np.unique(rows * contributor_count + engine.title_contributor_indices)
+        return np.bincount(pairs // contributor_count, minlength=title_count)
+
+    def facet_counts(self, matches: np.ndarray | None, facets: list[str]) -> dict[str, list[dict]]:
+        """Return non-zero genre and/or year counts over the match set (None: whole catalog)."""
+        return self.facets.counts(matches, facets)
+
+    def _contributor_postings(self, contributor_id: int, role: str | None) -> np.ndarray:
+        """Return sorted positions of a contributor's titles, optionally for one role."""
+        engine = self.engine
+        index = engine.contributor_index(contributor_id)
+        if index is None:
+            return np.empty(0, dtype=np.int32)
+        start = engine.contributor_title_indptr[index]
+        end = engine.contributor_title_indptr[index + 1]
+        titles = engine.contributor_title_indices[start:end]
+        if role is not None:
+            if role not in engine.role_names:
+                return np.empty(0, dtype=np.int32)
+            role_code = engine.role_names.index(role)
+            titles = titles[engine.contributor_title_roles[start:end] == role_code]
+        return np.unique(titles).astype(np.int32)
+
+    def _token_postings(self, token: str) -> np.ndarray:
+        """Return postings for a token, unioned over its prefix expansions when allowed."""
+        start = bisect_left(self.vocabulary, token)
+        if len(token) < MIN_PREFIX_LENGTH:
+            if start < len(self.vocabulary) and self.vocabulary[start] == token:
+                return self.postings[self.term_starts[start]:self.term_ends[start]]
+            return np.empty(0, dtype=np.int32)
+
+        end = bisect_left(self.vocabulary, token + "\U0010ffff", lo=start)
+        if end - start == 1:
+            return self.postings[self.term_starts[start]:self.term_ends[start]]
+        if end == start:
+            return np.empty(0, dtype=np.int32)
+        # Every expansion counts; short common prefixes union through a title mask
+        # rather than sorting the concatenated postings.
+        matched = np.zeros(len(self.engine.title_ids), dtype=bool)
+        for term in range(start, end):
+            matched[self.postings[self.term_starts[term]:self.term_ends[term]]] = True
+        return np.flatnonzero(matched).astype(np.int32)
+
+
+def intersect_postings(lists: list[np.ndarray]) -> np.ndarray:
+    """Intersect sorted unique posting lists, smallest first, stopping once empty."""
+    lists = sorted(lists, key=len)
+    result = lists[0]
+    for postings in lists[1:]:
+        if len(result) == 0 or len(postings) == 0:
+            return result[:0]
+        # `result` is never longer than `postings`: binary-search its entries.
+        positions = np.minimum(np.searchsorted(postings, result), len(postings) - 1)
+        result = result[postings[positions] == result]
+    return result
+
+
+def build_search_index(engine: CatalogEngine | None = None) -> SearchIndex:
+    """Build an index over `engine` (default: the active one) and make it active."""
+    global _index
+    with _build_lock:
+        index = SearchIndex(engine if engine is not None else get_catalog_engine())
+        _index = index
+    return index
+
+
+def ensure_search_index() -> SearchIndex:
+    """Return the active index, building it (and the catalog engine) on first use."""
+    with _ensure_lock:
+        if _index is not None:
+            return _index
+        index = build_search_index(ensure_catalog_engine())
+        if config.DATA_BACKEND != "snapshot":
+            register_dataset_change_listener(reload_search_index)
+        return index
+
+
+def reload_search_index() -> None:
+    """Dataset-change hook: rebuild the index from the (already reloaded) catalog engine."""
+    build_search_index()
+
+
+def unload_search_index() -> None:
+    """Drop the active index."""
+    global _index
+    _index = None
+
+
+def get_search_index() -> SearchIndex:
+    """Return the active index or raise when none has been built."""
+    if _index is None:
+        raise SearchIndexNotInitializedError()
+    return _index
+
+
+def fetch_indexed_browse_titles(
+    search_words: list[str],
+    release_year: int | None,
+    genre_id: int | None,
+    offset: int,
+    page_size: int,
+    sort: str = "title_asc",
+    **filters,
+) -> list[tuple]:
+    """Fetch paginated titles from the inverted index; same contract as fetch_browse_titles.
+
+    `filters` are the structured filters of fetch_browse_titles (year_from, year_to,
+    genre_ids, genre_mode, media_type, contributor_id, role).
+    """
+    index = get_search_index()
+    matches = index.match(search_words, release_year, genre_id, **filters)
+    return [
+        index.engine.title_row(position)
+        for position in index.page(matches, offset, page_size, sort)
+    ]
+
+
+def fetch_indexed_browse_facets(
+    search_words: list[str],
+    release_year: int | None,
+    genre_id: int | None,
+    facets: list[str],
+    **filters,
+) -> dict[str, list[dict]]:
+    """Count matching titles per genre and/or release year using the facet bitmaps.
+
+    Matches follow the index's token rules, so these counts belong with
+    fetch_indexed_browse_titles pages (SEARCH_BACKEND=memory).
+    """
+    index = get_search_index()
+    return index.facet_counts(
+        index.match(search_words, release_year, genre_id, **filters),
+        facets,
+    )
+
+
+def _flatten(token_lists: list[list[int]]) -> np.ndarray:
+    """Concatenate per-entity token id lists into one int64 array."""
+    return np.fromiter(
+        (token for tokens in token_lists for token in tokens),
+        dtype=np.int64,
+    )
+
+
+def _expand_over_edges(
+    token_lists: list[list[int]],
+    indptr: np.ndarray,
+    titles: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Emit (token, title) pairs for every token of every source entity and each of its titles.
+
+    `indptr`/`titles` is a CSR adjacency from the source entities (contributors or
+    genres) to title positions.
+    """
+    token_counts = np.array([len(tokens) for tokens in token_lists], dtype=np.int64)
+    token_indptr = np.zeros(len(token_lists) + 1, dtype=np.int64)
+    np.cumsum(token_counts, out=token_indptr[1:])
+    flat_tokens = _flatten(token_lists)
+
+    edge_sources = np.repeat(np.arange(len(token_lists), dtype=np.int64), np.diff(indptr))
+    counts = token_counts[edge_sources]
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    pair_titles = np.repeat(titles.astype(np.int64), counts)
+    within_edge = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+    pair_tokens = flat_tokens[np.repeat(token_indptr[edge_sources], counts) + within_edge]
+    return pair_tokens, pair_titles
+
+
+def _transpose(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    column_count: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Transpose a CSR adjacency (rows -> columns) into (columns -> rows)."""
+    rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int64), np.diff(indptr))
+    columns = indices.astype(np.int64)
+    order = np.lexsort((rows, columns))
+    transposed_indptr = np.zeros(column_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(columns, minlength=column_count), out=transposed_indptr[1:])
+    return transposed_indptr, rows[order].astype(np.int32)
@@ -0,0 +1,428 @@
+"""Read-only SQLite snapshot backend for the data provider functions.
+
+The snapshot is produced by `app/scripts/export_snapshot.py` and mirrors the
+Postgres tables. It is opened immutable with mmap enabled, so every worker
+process shares the same page-cache pages instead of holding its own copy.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterator
+
+from app.core.exceptions import DataProviderError, SnapshotNotInitializedError
+
+snapshot_path: str | None = None
+_thread_local = threading.local()
+
+# Snapshot counterpart of browse_data_provider.BROWSE_SORT_ORDER_BY.
+SNAPSHOT_SORT_ORDER_BY = {
+    "title_asc": "t.title COLLATE NOCASE, t.id",
+    "title_desc": "t.title COLLATE NOCASE DESC, t.id DESC",
+    "release_year_asc": "t.release_year IS NULL, t.release_year, t.id",
+    "release_year_desc": "t.release_year IS NULL, t.release_year DESC, t.id DESC",
+    "cast_size_desc": "t.cast_count DESC, t.id",
+    "relevance": "t.title COLLATE NOCASE, t.id",
+}
+
+
+def open_snapshot(path: str) -> None:
+    """Point the backend at a snapshot file, validating it can be opened."""
+    global snapshot_path
+    if not path:
+        raise RuntimeError("SNAPSHOT_PATH is not configured.")
+    if not os.path.exists(path):
+        raise RuntimeError(f"Snapshot file not found: {path}")
+
+    snapshot_path = path
+    get_snapshot_connection().execute("SELECT 1 FROM title LIMIT 1").fetchall()
+
+
+def close_snapshot() -> None:
+    """Forget the snapshot; per-thread connections are closed on next use."""
+    global snapshot_path
+    snapshot_path = None
+    _close_thread_connection()
+
+
+def fetch_browse_genres() -> list[dict]:
+    """Fetch all genre ids and names for browse filters."""
+    rows = _query(
+        """
+        SELECT g.id, g.name
+        FROM genre_type_lkup g
+        ORDER BY g.name, g.id
+        """
+    )
+    return [{"id": row[0], "name": row[1]} for row in rows]
+
+
+def fetch_browse_titles(
+    search_words: list[str],
+    release_year: int | None,
+    genre_id: int | None,
+    offset: int,
+    page_size: int,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    genre_ids: list[int] | None = None,
+    genre_mode: str = "any",
+    media_type: str | None = None,
+    contributor_id: int | None = None,
+    role: str | None = None,
+    sort: str = "title_asc",
+) -> list[tuple]:
+    """Fetch paginated titles based on search words and filters.
+
+    SQLite has no trigram similarity, so "relevance" ranks titles by how many
+    search words their own title contains, then by title length.
+    """
+    query = """
+        SELECT t.id, t.imdb_reference_id, t.title, t.release_year, mt.name
+        FROM title t
+        JOIN media_type_lkup mt ON mt.id = t.media_type
+    """
+    where_clauses, params = _browse_where_clauses(
+        search_words,
+        release_year,
+        genre_id,
+        year_from=year_from,
+        year_to=year_to,
+        genre_ids=genre_ids,
+        genre_mode=genre_mode,
+        media_type=media_type,
+        contributor_id=contributor_id,
+        role=role,
+    )
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+
+    order_by = SNAPSHOT_SORT_ORDER_BY[sort]
+    if sort == "relevance":
+        title_hits = " + ".join("(instr(lower(t.title), ?) > 0)" for _ in search_words) or "0"
+        order_by = f"({title_hits}) DESC, length(t.title), " + order_by
+        params.extend(word.lower() for word in search_words)
+
+    query += f" ORDER BY {order_by} LIMIT ? OFFSET ?"
+    params.extend([page_size, offset])
+    return _query(query, params)
+
+
+def iter_browse_titles(
+    search_words: list[str],
+    release_year: int | None,
+    genre_id: int | None,
+    batch_size: int,
+    **filters,
+) -> Iterator[list[tuple]]:
+    """Yield every title matching the browse search and filters in id order, in batches.
+
+    Uses its own snapshot connection, since the generator may be advanced from
+    different threads while other requests use the thread-local ones.
+    """
+    where_clauses, params = _browse_where_clauses(search_words, release_year, genre_id, **filters)
+    query = """
+        SELECT t.id, t.imdb_reference_id, t.title, t.release_year, mt.name
+        FROM title t
+        JOIN media_type_lkup mt ON mt.id = t.media_type
+    """
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+    query += " ORDER BY t.id"
+
+    if snapshot_path is None:
+        raise SnapshotNotInitializedError()
+    conn = _open_connection(snapshot_path)
+    try:
+        cur = conn.execute(query, params)
+        while batch := cur.fetchmany(batch_size):
+            yield batch
+    except sqlite3.Error as exc:
+        raise DataProviderError() from exc
+    finally:
+        conn.close()
+
+
+def fetch_browse_match_ids(
+    search_words: list[str],
+    release_year: int | None,
+    genre_id: int | None,
+    **filters,
+) -> list[int] | None:
+    """Fetch the ids of all titles matching the browse search and filters.
+
+    Returns None when nothing narrows the catalog.
+    """
+    where_clauses, params = _browse_where_clauses(search_words, release_year, genre_id, **filters)
+    if not where_clauses:
+        return None
+    rows = _query(
+        """
+        SELECT t.id
+        FROM title t
+        JOIN media_type_lkup mt ON mt.id = t.media_type
+        WHERE """
+        + " AND ".join(where_clauses),
+        params,
+    )
+    return [row[0] for row in rows]
+
+
+def _browse_where_clauses(
+    search_words: list[str],
+    release_year: int | None,
+    genre_id: int | None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    genre_ids: list[int] | None = None,
+    genre_mode: str = "any",
+    media_type: str | None = None,
+    contributor_id: int | None = None,
+    role: str | None = None,
+) -> tuple[list[str], list[object]]:
+    """Build the WHERE predicates and their params for browse search and filters."""
+    where_clauses: list[str] = []
+    params: list[object] = []
+
+    if search_words:
+        where_clauses.append(
+            "t.id IN (SELECT rowid FROM title_search WHERE "
+            + " AND ".join("document LIKE ?" for _ in search_words)
+            + ")"
+        )
+        params.extend(f"%{word.casefold()}%" for word in search_words)
+
+    if release_year is not None:
+        where_clauses.append("t.release_year = ?")
+        params.append(release_year)
+
+    if genre_id is not None:
+        where_clauses.append(
+            "EXISTS (SELECT 1 FROM title_genre tg WHERE tg.title_id = t.id AND tg.genre_id = ?)"
+        )
+        params.append(genre_id)
+
+    if year_from is not None:
+        where_clauses.append("t.release_year >= ?")
+        params.append(year_from)
+
+    if year_to is not None:
+        where_clauses.append("t.release_year <= ?")
+        params.append(year_to)
+
+    if genre_ids:
+        distinct_genre_ids = sorted(set(genre_ids))
+        placeholders = ", ".join("?" for _ in distinct_genre_ids)
+        genre_clause = (
+            f"SELECT tg.title_id FROM title_genre tg WHERE tg.genre_id IN ({placeholders})"
+        )
+        if genre_mode == "all":
+            genre_clause += " GROUP BY tg.title_id HAVING COUNT(DISTINCT tg.genre_id) = ?"
+        where_clauses.append(f"t.id IN ({genre_clause})")
+        params.extend(distinct_genre_ids)
+        if genre_mode == "all":
+            params.append(len(distinct_genre_ids))
+
+    if media_type is not None:
+        where_clauses.append("mt.name = ?")
+        params.append(media_type)
+
+    if contributor_id is not None:
+        contributor_clause = (
+            "t.id IN (SELECT ctm.title_id FROM contributor_title_mapping ctm "
+            "JOIN contributor_type_lkup ctl ON ctl.id = ctm.type_id "
+            "WHERE ctm.contributor_id = ?"
+        )
+        params.append(contributor_id)
+        if role is not None:
+            contributor_clause += " AND ctl.name = ?"
+            params.append(role)
+        where_clauses.append(contributor_clause + ")")
+
+    return where_clauses, params
+
+
+def fetch_search_token_counts(tokens: list[str]) -> dict[str, int]:
+    """Fetch titles per search token; the empty token carries the total title count."""
+    placeholders = ", ".join("?" for _ in tokens)
+    rows = _query(
+        f"SELECT token, title_count FROM search_token_stats WHERE token IN ({placeholders})",
+        tokens,
+    )
+    return dict(rows)
+
+
+def fetch_title_by_id(title_id: int) -> tuple | None:
+    """Fetch title row by id."""
+    rows = _query(
+        """
+        SELECT t.id, t.imdb_reference_id, t.title, t.release_year, mt.name
+        FROM title t
+        JOIN media_type_lkup mt ON mt.id = t.media_type
+        WHERE t.id = ?
+        LIMIT 1
+        """,
+        (title_id,),
+    )
+    return rows[0] if rows else None
+
+
+def fetch_genres_by_title_id(title_id: int) -> list[str]:
+    """Fetch genre names for a title."""
+    rows = _query(
+        """
+        SELECT g.name
+        FROM title_genre tg
+        JOIN genre_type_lkup g ON g.id = tg.genre_id
+        WHERE tg.title_id = ?
+        ORDER BY g.name
+        """,
+        (title_id,),
+    )
+    return [row[0] for row in rows]
+
+
+def fetch_titles_by_contributor_id(contributor_id: int) -> list[tuple]:
+    """Fetch title-role rows for a contributor."""
+    return _query(
+        """
+        SELECT t.id, t.imdb_reference_id, t.title, t.release_year, mt.name, ctl.name
+        FROM contributor_title_mapping ctm
+        JOIN title t ON t.id = ctm.title_id
+        JOIN media_type_lkup mt ON mt.id = t.media_type
+        JOIN contributor_type_lkup ctl ON ctl.id = ctm.type_id
+        WHERE ctm.contributor_id = ?
+        ORDER BY t.title COLLATE NOCASE, ctl.name
+        """,
+        (contributor_id,),
+    )
+
+
+def fetch_related_titles(title_id: int, limit: int) -> list[tuple]:
+    """Fetch precomputed related title rows for a title, best match first."""
+    return _query(
+        """
+        SELECT t.id, t.imdb_reference_id, t.title, t.release_year, mt.name, ts.score
+        FROM title_similarity ts
+        JOIN title t ON t.id = ts.related_title_id
+        JOIN media_type_lkup mt ON mt.id = t.media_type
+        WHERE ts.title_id = ?
+        ORDER BY ts.rank
+        LIMIT ?
+        """,
+        (title_id, limit),
+    )
+
+
+def fetch_contributor_by_id(contributor_id: int) -> tuple | None:
+    """Fetch contributor row by id."""
+    rows = _query(
+        """
+        SELECT c.id, c.imdb_reference_id, c.name
+        FROM contributor c
+        WHERE c.id = ?
+        LIMIT 1
+        """,
+        (contributor_id,),
+    )
+    return rows[0] if rows else None
+
+
+def fetch_contributor_search(
+    query: str,
+    page_size: int,
+    similarity_threshold: float,
+    after: tuple[float, int, int] | None = None,
+) -> list[tuple]:
+    """Fetch contributors whose name contains `query` (case-insensitive), best match first.
+
+    SQLite has no trigram similarity, so names must contain the query and
+    `similarity_threshold` is ignored; the score is the share of the name the
+    query covers. Rows and `after` are as in the Postgres provider.
+    """
+    del similarity_threshold  # Accepted for signature parity with the Postgres provider.
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    sql = """
+        SELECT id, imdb_reference_id, name, title_count, score
+        FROM (
+            SELECT
+                c.id,
+                c.imdb_reference_id,
+                c.name,
+                c.title_count,
+                CAST(length(?) AS REAL) / length(c.name) AS score
+            FROM contributor c
+            WHERE c.name LIKE ? ESCAPE '\\'
+        ) AS matches
+    """
+    params: list = [query, f"%{escaped}%"]
+    if after is not None:
+        sql += "WHERE (-matches.score, -matches.title_count, matches.id) > (-?, -?, ?)"
+        params.extend(after)
+    sql += " ORDER BY matches.score DESC, matches.title_count DESC, matches.id LIMIT ?"
+    params.append(page_size)
+    return _query(sql, params)
+
+
+def fetch_contributors_by_title_id(title_id: int) -> list[tuple]:
+    """Fetch contributor-role rows for a title."""
+    return _query(
+        """
+        SELECT c.id, c.imdb_reference_id, c.name, ctl.name
+        FROM contributor_title_mapping ctm
+        JOIN contributor c ON c.id = ctm.contributor_id
+        JOIN contributor_type_lkup ctl ON ctl.id = ctm.type_id
+        WHERE ctm.title_id = ?
+        ORDER BY c.name COLLATE NOCASE, ctl.name
+        """,
+        (title_id,),
+    )
+
+
+def _query(sql: str, params: tuple | list = ()) -> list[tuple]:
+    """Run one read query on this thread's snapshot connection."""
+    conn = get_snapshot_connection()
+    try:
+        return conn.execute(sql, params).fetchall()
+    except sqlite3.Error as exc:
+        raise DataProviderError() from exc
+
+
+def get_snapshot_connection() -> sqlite3.Connection:
+    """Return this thread's snapshot connection, opening it on first use."""
+    if snapshot_path is None:
+        raise SnapshotNotInitializedError()
+
+    conn = getattr(_thread_local, "conn", None)
+    if conn is not None and _thread_local.path == snapshot_path:
+        return conn
+    _close_thread_connection()
+
+    conn = _open_connection(snapshot_path)
+    _thread_local.conn = conn
+    _thread_local.path = snapshot_path
+    return conn
+
+
+def _open_connection(path: str) -> sqlite3.Connection:
+    """Open a read-only, immutable, memory-mapped connection to a snapshot file."""
+    conn = sqlite3.connect(
+        f"{Path(path).resolve().as_uri()}?mode=ro&immutable=1",
+        uri=True,
+        check_same_thread=False,
+    )
+    conn.execute(f"PRAGMA mmap_size = {max(os.path.getsize(path), 1)}")
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def _close_thread_connection() -> None:
+    """Close this thread's snapshot connection, if any."""
+    conn = getattr(_thread_local, "conn", None)
+    if conn is not None:
+        conn.close()
+    _thread_local.conn = None
+    _thread_local.path = None
@@ -1,9 +1,34 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.core import config as _config
+from app.core.admission import get_admission_controller
+from app.core.compression import CompressionMiddleware, compression_metrics
+from app.core.dataset_version import (
+    register_dataset_change_listener,
+    start_dataset_watcher,
+    stop_dataset_watcher,
+)
 from app.core.db import close_db, init_db
 from app.core.handler import register_error_handlers
+from app.core.query_control import QueryCancellationMiddleware
+from app.core.readiness import (
+    mark_ready,
+    readiness_report,
+    start_background_bootstrap,
+    stop_background_bootstrap,
+)
 from app.core.router import register_routers
+from app.data_providers.catalog_engine import ensure_catalog_engine, unload_catalog_engine
+from app.data_providers.facet_index import unload_facet_index
+from app.data_providers.search_index import (
+    build_search_index,
+    ensure_search_index,
+    reload_search_index,
+    unload_search_index,
+)
+from app.data_providers.snapshot_data_provider import close_snapshot, open_snapshot
+from app.service_logic.search_planner import clear_search_planner_cache
 
 app = FastAPI(
     title="MovieExplorer API",
@@ -39,6 +64,13 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=_config.COMPRESSION_MINIMUM_SIZE,
+    cache_entries=_config.COMPRESSION_CACHE_ENTRIES,
+    thread_offload_size=_config.COMPRESSION_THREAD_OFFLOAD_SIZE,
+)
+app.add_middleware(QueryCancellationMiddleware)
 
 register_error_handlers(app)
 register_routers(app)
@@ -50,13 +82,69 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def ready() -> JSONResponse:
+    """Readiness endpoint: 200 once migrations, data and warm-up are done, else 503."""
+    report = readiness_report()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+
+@app.get("/metrics")
+def metrics() -> dict:
+    """Process-local counters: compression savings per encoding and admission control."""
+    return {
+        "compression": compression_metrics(),
+        "admission": get_admission_controller().snapshot(),
+    }
+
+
+def warm_up() -> None:
+    """Load the in-memory engines the configured backends serve from and watch for new datasets."""
+    if _catalog_engine_warm_up_enabled():
+        ensure_catalog_engine()
+    if _config.SEARCH_BACKEND == "memory":
+        build_search_index()
+        register_dataset_change_listener(reload_search_index)
+    # Search token statistics are refreshed with every load.
+    register_dataset_change_listener(clear_search_planner_cache)
+    start_dataset_watcher(_config.DATASET_CHECK_INTERVAL_SECONDS)
+
+
+def _catalog_engine_warm_up_enabled() -> bool:
+    """The memory backends serve from the catalog engine; otherwise only paths use it."""
+    return (
+        _config.CATALOG_ENGINE_WARM_UP
+        or _config.DATA_BACKEND == "memory"
+        or _config.SEARCH_BACKEND == "memory"
+    )
+
+
 @app.on_event("startup")
 def startup() -> None:
-    """Initialize DB resources when app starts."""
+    """Initialize DB resources (or the read-only snapshot) and start the background bootstrap."""
+    if _config.DATA_BACKEND == "snapshot":
+        open_snapshot(_config.SNAPSHOT_PATH)
+        # The snapshot never changes, so the engine (and index) are built once from it.
+        if _catalog_engine_warm_up_enabled():
+            ensure_catalog_engine()
+        if _config.SEARCH_BACKEND == "memory":
+            ensure_search_index()
+        mark_ready(f"serving snapshot {_config.SNAPSHOT_PATH}")
+        return
     init_db()
+    start_background_bootstrap(_config.STARTUP_MIGRATE_AND_SEED, warm_up)
 
 
 @app.on_event("shutdown")
 def shutdown() -> None:
     """Release DB resources when app stops."""
+    if _config.DATA_BACKEND == "snapshot":
+        unload_facet_index()
+        close_snapshot()
+        return
+    stop_background_bootstrap()
+    stop_dataset_watcher()
+    unload_facet_index()
+    unload_search_index()
+    unload_catalog_engine()
     close_db()
@@ -0,0 +1,48 @@
+"""add_source_fingerprints
+
+Revision ID: 3c1e8d5a7f20
+Revises: ebe4467a9b6d
+Create Date: 2026-10-19 13:02:47.116830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1e8d5a7f20'
+down_revision: Union[str, Sequence[str], None] = 'ebe4467a9b6d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Hash of the normalized source CSV row, compared by the delta loader.
+    op.add_column("title", sa.Column("source_fingerprint", sa.String(length=32), nullable=True))
+    op.add_column(
+        "contributor",
+        sa.Column("source_fingerprint", sa.String(length=32), nullable=True),
+    )
+    op.create_index(
+        "ix_title_imdb_reference_id",
+        "title",
+        ["imdb_reference_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_contributor_imdb_reference_id",
+        "contributor",
+        ["imdb_reference_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_contributor_imdb_reference_id", table_name="contributor")
+    op.drop_index("ix_title_imdb_reference_id", table_name="title")
+    op.drop_column("contributor", "source_fingerprint")
+    op.drop_column("title", "source_fingerprint")
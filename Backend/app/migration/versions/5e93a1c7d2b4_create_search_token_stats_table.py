@@ -0,0 +1,66 @@
+"""create_search_token_stats_table
+
+Revision ID: 5e93a1c7d2b4
+Revises: b84e0c2d5f19
+Create Date: 2026-10-19 18:42:07.318562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e93a1c7d2b4'
+down_revision: Union[str, Sequence[str], None] = 'b84e0c2d5f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Titles per search token (title, contributor, genre and year words); the
+    # empty token holds the total title count. Refreshed by the CSV loader.
+    op.create_table(
+        "search_token_stats",
+        sa.Column("token", sa.Text(), primary_key=True, nullable=False),
+        sa.Column("title_count", sa.Integer(), nullable=False),
+    )
+    op.execute(
+        r"""
+        INSERT INTO search_token_stats (token, title_count)
+        SELECT token, COUNT(DISTINCT title_id)
+        FROM (
+            SELECT t.id AS title_id, regexp_split_to_table(lower(t.title), '\W+') AS token
+            FROM title t
+            UNION ALL
+            SELECT ctm.title_id, names.token
+            FROM (
+                SELECT c.id, regexp_split_to_table(lower(c.name), '\W+') AS token
+                FROM contributor c
+            ) AS names
+            JOIN contributor_title_mapping ctm ON ctm.contributor_id = names.id
+            UNION ALL
+            SELECT tg.title_id, names.token
+            FROM (
+                SELECT g.id, regexp_split_to_table(lower(g.name), '\W+') AS token
+                FROM genre_type_lkup g
+            ) AS names
+            JOIN title_genre tg ON tg.genre_id = names.id
+            UNION ALL
+            SELECT t.id, CAST(t.release_year AS TEXT)
+            FROM title t
+            WHERE t.release_year IS NOT NULL
+        ) AS tokens
+        WHERE token <> ''
+        GROUP BY token
+        UNION ALL
+        SELECT '', COUNT(*) FROM title
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("search_token_stats")
@@ -0,0 +1,40 @@
+"""create_ingest_checkpoint_table
+
+Revision ID: 7d2f4b9e1a63
+Revises: 3c1e8d5a7f20
+Create Date: 2026-10-19 14:21:05.392741
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2f4b9e1a63'
+down_revision: Union[str, Sequence[str], None] = '3c1e8d5a7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "ingest_checkpoint",
+        sa.Column("source", sa.String(length=32), primary_key=True, nullable=False),
+        sa.Column("file_offset", sa.BigInteger(), nullable=False),
+        sa.Column("last_key", sa.String(length=32), nullable=True),
+        sa.Column("rows_processed", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("ingest_checkpoint")
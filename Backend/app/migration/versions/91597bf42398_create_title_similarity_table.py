@@ -0,0 +1,37 @@
+"""create_title_similarity_table
+
+Revision ID: 91597bf42398
+Revises: f29fb7dfe6ee
+Create Date: 2026-10-19 09:12:31.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '91597bf42398'
+down_revision: Union[str, Sequence[str], None] = 'f29fb7dfe6ee'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "title_similarity",
+        sa.Column("title_id", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.SmallInteger(), nullable=False),
+        sa.Column("related_title_id", sa.Integer(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("title_id", "rank"),
+        sa.ForeignKeyConstraint(["title_id"], ["title.id"]),
+        sa.ForeignKeyConstraint(["related_title_id"], ["title.id"]),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("title_similarity")
@@ -0,0 +1,47 @@
+"""create_dataset_version_table
+
+Revision ID: b84e0c2d5f19
+Revises: 7d2f4b9e1a63
+Create Date: 2026-10-19 15:03:48.650214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b84e0c2d5f19'
+down_revision: Union[str, Sequence[str], None] = '7d2f4b9e1a63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Single row, bumped by the loader whenever it commits catalog changes.
+    op.create_table(
+        "dataset_version",
+        sa.Column("id", sa.SmallInteger(), primary_key=True, nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.CheckConstraint("id = 1", name="ck_dataset_version_single_row"),
+    )
+
+    dataset_version = sa.table(
+        "dataset_version",
+        sa.column("id", sa.SmallInteger()),
+        sa.column("version", sa.BigInteger()),
+    )
+    op.bulk_insert(dataset_version, [{"id": 1, "version": 1}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("dataset_version")
@@ -0,0 +1,101 @@
+"""add_contributor_title_count
+
+Revision ID: c6f1a8e3b927
+Revises: 5e93a1c7d2b4
+Create Date: 2026-10-19 21:07:52.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f1a8e3b927'
+down_revision: Union[str, Sequence[str], None] = '5e93a1c7d2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Recomputes contributor.title_count (distinct credited titles) for the contributors
+# touched by one statement on contributor_title_mapping, using its transition tables.
+REFRESH_TITLE_COUNT_FUNCTION = """
+CREATE FUNCTION refresh_contributor_title_count() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE contributor c
+        SET title_count = (
+            SELECT COUNT(DISTINCT ctm.title_id)
+            FROM contributor_title_mapping ctm
+            WHERE ctm.contributor_id = c.id
+        )
+        WHERE c.id IN (SELECT DISTINCT contributor_id FROM changed_new);
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE contributor c
+        SET title_count = (
+            SELECT COUNT(DISTINCT ctm.title_id)
+            FROM contributor_title_mapping ctm
+            WHERE ctm.contributor_id = c.id
+        )
+        WHERE c.id IN (SELECT DISTINCT contributor_id FROM changed_old);
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+TITLE_COUNT_TRIGGERS = {
+    "trg_contributor_title_mapping_title_count_insert": (
+        "INSERT",
+        "REFERENCING NEW TABLE AS changed_new",
+    ),
+    "trg_contributor_title_mapping_title_count_update": (
+        "UPDATE",
+        "REFERENCING OLD TABLE AS changed_old NEW TABLE AS changed_new",
+    ),
+    "trg_contributor_title_mapping_title_count_delete": (
+        "DELETE",
+        "REFERENCING OLD TABLE AS changed_old",
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "contributor",
+        sa.Column("title_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE contributor c
+        SET title_count = counts.title_count
+        FROM (
+            SELECT contributor_id, COUNT(DISTINCT title_id) AS title_count
+            FROM contributor_title_mapping
+            GROUP BY contributor_id
+        ) counts
+        WHERE counts.contributor_id = c.id
+        """
+    )
+    op.execute(REFRESH_TITLE_COUNT_FUNCTION)
+    for trigger_name, (event, referencing) in TITLE_COUNT_TRIGGERS.items():
+        op.execute(
+            f"""
+            CREATE TRIGGER {trigger_name}
+            AFTER {event} ON contributor_title_mapping
+            {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION refresh_contributor_title_count()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger_name in reversed(TITLE_COUNT_TRIGGERS):
+        op.execute(f"DROP TRIGGER {trigger_name} ON contributor_title_mapping")
+    op.execute("DROP FUNCTION refresh_contributor_title_count()")
+    op.drop_column("contributor", "title_count")
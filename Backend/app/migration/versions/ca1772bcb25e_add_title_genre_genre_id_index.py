@@ -0,0 +1,33 @@
+"""add_title_genre_genre_id_index
+
+Revision ID: ca1772bcb25e
+Revises: 91597bf42398
+Create Date: 2026-10-19 10:02:47.631904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ca1772bcb25e'
+down_revision: Union[str, Sequence[str], None] = '91597bf42398'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Genre-first index for the browse genre semi-join (genre_id = ANY(...) -> title ids).
+    op.create_index(
+        "ix_title_genre_genre_id_title_id",
+        "title_genre",
+        ["genre_id", "title_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_title_genre_genre_id_title_id", table_name="title_genre")
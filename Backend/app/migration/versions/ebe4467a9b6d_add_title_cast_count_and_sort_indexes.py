@@ -0,0 +1,121 @@
+"""add_title_cast_count_and_sort_indexes
+
+Revision ID: ebe4467a9b6d
+Revises: ca1772bcb25e
+Create Date: 2026-10-19 11:24:09.517342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ebe4467a9b6d'
+down_revision: Union[str, Sequence[str], None] = 'ca1772bcb25e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Recomputes title.cast_count (distinct credited contributors) for the titles touched
+# by one statement on contributor_title_mapping, using its transition tables.
+REFRESH_CAST_COUNT_FUNCTION = """
+CREATE FUNCTION refresh_title_cast_count() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE title t
+        SET cast_count = (
+            SELECT COUNT(DISTINCT ctm.contributor_id)
+            FROM contributor_title_mapping ctm
+            WHERE ctm.title_id = t.id
+        )
+        WHERE t.id IN (SELECT DISTINCT title_id FROM changed_new);
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE title t
+        SET cast_count = (
+            SELECT COUNT(DISTINCT ctm.contributor_id)
+            FROM contributor_title_mapping ctm
+            WHERE ctm.title_id = t.id
+        )
+        WHERE t.id IN (SELECT DISTINCT title_id FROM changed_old);
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+CAST_COUNT_TRIGGERS = {
+    "trg_contributor_title_mapping_cast_count_insert": (
+        "INSERT",
+        "REFERENCING NEW TABLE AS changed_new",
+    ),
+    "trg_contributor_title_mapping_cast_count_update": (
+        "UPDATE",
+        "REFERENCING OLD TABLE AS changed_old NEW TABLE AS changed_new",
+    ),
+    "trg_contributor_title_mapping_cast_count_delete": (
+        "DELETE",
+        "REFERENCING OLD TABLE AS changed_old",
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "title",
+        sa.Column("cast_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE title t
+        SET cast_count = counts.cast_count
+        FROM (
+            SELECT title_id, COUNT(DISTINCT contributor_id) AS cast_count
+            FROM contributor_title_mapping
+            GROUP BY title_id
+        ) counts
+        WHERE counts.title_id = t.id
+        """
+    )
+    op.execute(REFRESH_CAST_COUNT_FUNCTION)
+    for trigger_name, (event, referencing) in CAST_COUNT_TRIGGERS.items():
+        op.execute(
+            f"""
+            CREATE TRIGGER {trigger_name}
+            AFTER {event} ON contributor_title_mapping
+            {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION refresh_title_cast_count()
+            """
+        )
+
+    # One index per browse sort order so ORDER BY ... LIMIT can stop early.
+    op.create_index("ix_title_title_id", "title", ["title", "id"], unique=False)
+    op.create_index("ix_title_release_year_id", "title", ["release_year", "id"], unique=False)
+    op.create_index(
+        "ix_title_release_year_desc_id_desc",
+        "title",
+        [sa.text("release_year DESC NULLS LAST"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_title_cast_count_desc_id",
+        "title",
+        [sa.text("cast_count DESC"), "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_title_cast_count_desc_id", table_name="title")
+    op.drop_index("ix_title_release_year_desc_id_desc", table_name="title")
+    op.drop_index("ix_title_release_year_id", table_name="title")
+    op.drop_index("ix_title_title_id", table_name="title")
+    for trigger_name in reversed(CAST_COUNT_TRIGGERS):
+        op.execute(f"DROP TRIGGER {trigger_name} ON contributor_title_mapping")
+    op.execute("DROP FUNCTION refresh_title_cast_count()")
+    op.drop_column("title", "cast_count")
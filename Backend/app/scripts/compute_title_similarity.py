@@ -0,0 +1,272 @@
+"""Precompute top-K related titles from shared contributors and genres.
+
+Offline batch job: the catalog is loaded into the in-memory catalog engine and
+similarities are computed block by block with vectorized sparse products over
+the title x contributor and title x genre incidence, then written to the
+`title_similarity` table in one transaction.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import psycopg2
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+# pylint: disable=wrong-import-position
+from app.data_providers.catalog_engine import CatalogEngine, load_catalog_engine
+
+DEFAULT_TOP_K = 20
+# Weight of genre Jaccard similarity relative to shared-contributor cosine similarity.
+GENRE_WEIGHT = 0.25
+# Contributors linked to more titles than this are too generic to signal similarity.
+MAX_CONTRIBUTOR_DEGREE = 1000
+# Titles per block; bounds the size of the intermediate pair arrays.
+BLOCK_SIZE = 20_000
+# Same-genre neighbours (by release year) considered for every title.
+GENRE_NEIGHBOUR_WINDOW = 10
+MISSING_YEAR_GAP = 10_000
+
+
+class SimilarityModel:
+    """Sparse incidence structures derived from a catalog engine."""
+
+    def __init__(self, engine: CatalogEngine) -> None:
+        self.engine = engine
+        title_count = len(engine.title_ids)
+        contributor_count = len(engine.contributor_ids)
+        self.title_count = title_count
+
+        # Title x contributor incidence, with multiple roles collapsed into one edge.
+        rows = np.repeat(
+            np.arange(title_count, dtype=np.int64),
+            np.diff(engine.title_contributor_indptr),
+        )
+        keys = np.unique(rows * max(contributor_count, 1) + engine.title_contributor_indices)
+        rows, columns = keys // max(contributor_count, 1), keys % max(contributor_count, 1)
+        self.title_indptr = _indptr(rows, title_count)
+        self.title_contributors = columns
+        order = np.argsort(columns, kind="stable")
+        self.contributor_indptr = _indptr(columns, contributor_count)
+        self.contributor_titles = rows[order]
+        self.title_degrees = np.diff(self.title_indptr).astype(np.float64)
+        self.hub_contributors = np.diff(self.contributor_indptr) > MAX_CONTRIBUTOR_DEGREE
+
+        # Title x genre incidence as packed bitmasks, one uint64 word per 64 genres.
+        word_count = max(1, (len(engine.genre_names) + 63) // 64)
+        self.genre_masks = np.zeros((title_count, word_count), dtype=np.uint64)
+        genre_rows = np.repeat(
+            np.arange(title_count, dtype=np.int64),
+            np.diff(engine.title_genre_indptr),
+        )
+        genre_codes = engine.title_genre_indices.astype(np.int64)
+        np.bitwise_or.at(
+            self.genre_masks,
+            (genre_rows, genre_codes // 64),
+            np.left_shift(np.uint64(1), (genre_codes % 64).astype(np.uint64)),
+        )
+
+        # Titles grouped by identical genre set, ordered by release year inside a group.
+        years = engine.title_release_years.astype(np.int64)
+        self.years = years
+        _, self.genre_groups = np.unique(self.genre_masks, axis=0, return_inverse=True)
+        self.genre_groups = self.genre_groups.reshape(-1)
+        self.has_genres = self.genre_masks.any(axis=1)
+        self.group_order = np.lexsort((engine.title_ids, years, self.genre_groups))
+        self.group_positions = np.empty(title_count, dtype=np.int64)
+        self.group_positions[self.group_order] = np.arange(title_count, dtype=np.int64)
+
+    def top_k(self, start: int, end: int, top_k: int) -> tuple[np.ndarray, ...]:
+        """Return (title, related title, score, rank) arrays for titles start..end-1."""
+        sources = np.arange(start, end, dtype=np.int64)
+
+        # Shared contributors: (block x contributors) @ (contributors x titles).
+        contributors, pair_sources = _expand(
+            sources, sources, self.title_indptr, self.title_contributors
+        )
+        keep = ~self.hub_contributors[contributors]
+        related, pair_sources = _expand(
+            contributors[keep],
+            pair_sources[keep],
+            self.contributor_indptr,
+            self.contributor_titles,
+        )
+        keep = related != pair_sources
+        keys, shared = np.unique(
+            pair_sources[keep] * self.title_count + related[keep],
+            return_counts=True,
+        )
+
+        # Same-genre neighbours close in release year, for titles with few co-contributors.
+        window_keys = [keys]
+        positions = self.group_positions[sources]
+        for offset in range(-GENRE_NEIGHBOUR_WINDOW, GENRE_NEIGHBOUR_WINDOW + 1):
+            if offset == 0:
+                continue
+            neighbour_positions = positions + offset
+            valid = (neighbour_positions >= 0) & (neighbour_positions < self.title_count)
+            neighbours = self.group_order[neighbour_positions[valid]]
+            valid_sources = sources[valid]
+            same_group = (
+                self.genre_groups[neighbours] == self.genre_groups[valid_sources]
+            ) & self.has_genres[valid_sources]
+            window_keys.append(valid_sources[same_group] * self.title_count + neighbours[same_group])
+
+        candidate_keys = np.unique(np.concatenate(window_keys))
+        shared_counts = np.zeros(len(candidate_keys), dtype=np.float64)
+        shared_counts[np.searchsorted(candidate_keys, keys)] = shared
+        titles = candidate_keys // self.title_count
+        related = candidate_keys % self.title_count
+
+        cosine = np.divide(
+            shared_counts,
+            np.sqrt(self.title_degrees[titles] * self.title_degrees[related]),
+            out=np.zeros_like(shared_counts),
+            where=shared_counts > 0,
+        )
+        masks_a, masks_b = self.genre_masks[titles], self.genre_masks[related]
+        intersection = np.bitwise_count(masks_a & masks_b).sum(axis=1)
+        union = np.bitwise_count(masks_a | masks_b).sum(axis=1)
+        jaccard = np.divide(
+            intersection,
+            union,
+            out=np.zeros(len(union), dtype=np.float64),
+            where=union > 0,
+        )
+        scores = cosine + GENRE_WEIGHT * jaccard
+
+        year_a, year_b = self.years[titles], self.years[related]
+        year_gaps = np.where((year_a >= 0) & (year_b >= 0), np.abs(year_a - year_b), MISSING_YEAR_GAP)
+
+        order = np.lexsort((self.engine.title_ids[related], year_gaps, -scores, titles))
+        titles, related, scores = titles[order], related[order], scores[order]
+        group_starts = np.searchsorted(titles, titles, side="left")
+        ranks = np.arange(len(titles)) - group_starts
+        keep = (ranks < top_k) & (scores > 0)
+        return (
+            self.engine.title_ids[titles[keep]],
+            self.engine.title_ids[related[keep]],
+            scores[keep],
+            ranks[keep] + 1,
+        )
+
+    def iter_blocks(self, top_k: int) -> Iterator[tuple[np.ndarray, ...]]:
+        """Yield top-K results block by block."""
+        for start in range(0, self.title_count, BLOCK_SIZE):
+            yield self.top_k(start, min(start + BLOCK_SIZE, self.title_count), top_k)
+
+
+def write_similarities(conn, blocks: Iterator[tuple[np.ndarray, ...]]) -> int:
+    """Replace title_similarity with the computed rows; return the number of rows written."""
+    written = 0
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            CREATE TEMP TABLE title_similarity_load
+            (LIKE title_similarity INCLUDING DEFAULTS)
+            ON COMMIT DROP
+            """
+        )
+        for titles, related, scores, ranks in blocks:
+            buffer = io.StringIO()
+            for title_id, rank, related_id, score in zip(
+                titles.tolist(), ranks.tolist(), related.tolist(), scores.tolist()
+            ):
+                buffer.write(f"{title_id}\t{rank}\t{related_id}\t{score:.6f}\n")
+            buffer.seek(0)
+            cur.copy_expert(
+                "COPY title_similarity_load (title_id, rank, related_title_id, score) FROM STDIN",
+                buffer,
+            )
+            written += len(titles)
+
+        # DELETE (not TRUNCATE) keeps the old rows readable until this transaction commits.
+        cur.execute("DELETE FROM title_similarity")
+        cur.execute("INSERT INTO title_similarity SELECT * FROM title_similarity_load")
+    return written
+
+
+def has_existing_similarity_data(cur) -> bool:
+    """Return True when title_similarity already contains rows."""
+    cur.execute("SELECT EXISTS (SELECT 1 FROM title_similarity LIMIT 1)")
+    return cur.fetchone()[0]
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments for standalone execution."""
+    parser = argparse.ArgumentParser(
+        description="Compute top-K related titles into the title_similarity table.",
+    )
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv("DATABASE_URL", ""),
+        help="Postgres connection URL. Defaults to env var DATABASE_URL.",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=DEFAULT_TOP_K,
+        help="Related titles stored per title.",
+    )
+    parser.add_argument(
+        "--skip-if-present",
+        action="store_true",
+        help="Do nothing when title_similarity already has rows.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Compute and store related titles."""
+    args = parse_args()
+    database_url = args.database_url.strip()
+    if not database_url:
+        raise RuntimeError(
+            "Database URL not provided. Set DATABASE_URL or pass --database-url.",
+        )
+
+    with psycopg2.connect(database_url) as conn:
+        with conn.cursor() as cur:
+            if args.skip_if_present and has_existing_similarity_data(cur):
+                print("Title similarity data already exists. Skipping computation.")
+                return
+
+        engine = load_catalog_engine(conn)
+        model = SimilarityModel(engine)
+        written = write_similarities(conn, model.iter_blocks(args.top_k))
+
+    print(f"Stored related titles: {written} rows for {len(engine.title_ids)} titles")
+
+
+def _expand(
+    nodes: np.ndarray,
+    carried: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return CSR neighbours of `nodes`, each paired with its node's `carried` value."""
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    total = int(counts.sum())
+    offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+    return indices[np.repeat(starts, counts) + offsets].astype(np.int64), np.repeat(carried, counts)
+
+
+def _indptr(row_indices: np.ndarray, row_count: int) -> np.ndarray:
+    """Build a CSR index pointer array from row indices."""
+    indptr = np.zeros(row_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_indices, minlength=row_count), out=indptr[1:])
+    return indptr
+
+
+if __name__ == "__main__":
+    main()
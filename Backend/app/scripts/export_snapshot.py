@@ -0,0 +1,232 @@
+"""Export the catalog from Postgres into a single read-only SQLite snapshot file."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterable
+
+import psycopg2
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_SNAPSHOT_PATH = SCRIPT_DIR / "catalog_snapshot.sqlite3"
+EXPORT_BATCH_SIZE = 10_000
+
+# Tables copied verbatim, with the columns in the order they are exported.
+SNAPSHOT_TABLES: dict[str, tuple[str, ...]] = {
+    "media_type_lkup": ("id", "name"),
+    "contributor_type_lkup": ("id", "name"),
+    "genre_type_lkup": ("id", "name"),
+    "title": ("id", "imdb_reference_id", "title", "media_type", "release_year"),
+    "contributor": ("id", "imdb_reference_id", "name"),
+    "contributor_title_mapping": ("id", "contributor_id", "type_id", "title_id"),
+    "title_genre": ("id", "title_id", "genre_id"),
+    "title_similarity": ("title_id", "rank", "related_title_id", "score"),
+    "search_token_stats": ("token", "title_count"),
+}
+
+SNAPSHOT_SCHEMA = """
+CREATE TABLE media_type_lkup (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE contributor_type_lkup (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE genre_type_lkup (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE title (
+    id INTEGER PRIMARY KEY,
+    imdb_reference_id TEXT,
+    title TEXT NOT NULL,
+    media_type INTEGER NOT NULL,
+    release_year INTEGER,
+    cast_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE contributor (
+    id INTEGER PRIMARY KEY,
+    imdb_reference_id TEXT,
+    name TEXT NOT NULL,
+    title_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE contributor_title_mapping (
+    id INTEGER PRIMARY KEY,
+    contributor_id INTEGER NOT NULL,
+    type_id INTEGER NOT NULL,
+    title_id INTEGER NOT NULL
+);
+CREATE TABLE title_genre (
+    id INTEGER PRIMARY KEY,
+    title_id INTEGER NOT NULL,
+    genre_id INTEGER NOT NULL
+);
+CREATE TABLE title_similarity (
+    title_id INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    related_title_id INTEGER NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (title_id, rank)
+) WITHOUT ROWID;
+CREATE TABLE search_token_stats (
+    token TEXT PRIMARY KEY,
+    title_count INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+SNAPSHOT_INDEXES = """
+CREATE INDEX ix_title_title ON title (title COLLATE NOCASE, id);
+CREATE INDEX ix_title_release_year ON title (release_year);
+CREATE INDEX ix_title_release_year_id ON title (release_year, id);
+CREATE INDEX ix_title_cast_count_desc_id ON title (cast_count DESC, id);
+CREATE INDEX ix_contributor_title_mapping_title_id ON contributor_title_mapping (title_id);
+CREATE INDEX ix_contributor_title_mapping_contributor_id
+    ON contributor_title_mapping (contributor_id);
+CREATE INDEX ix_title_genre_title_id_genre_id ON title_genre (title_id, genre_id);
+CREATE INDEX ix_title_genre_genre_id_title_id ON title_genre (genre_id, title_id);
+"""
+
+
+def create_search_table(conn: sqlite3.Connection) -> None:
+    """Create the title search table, using an FTS5 trigram index when available."""
+    try:
+        conn.execute(
+            "CREATE VIRTUAL TABLE title_search USING fts5(document, tokenize='trigram')"
+        )
+    except sqlite3.OperationalError:
+        # SQLite builds without FTS5 still get a working (unindexed) LIKE scan.
+        conn.execute("CREATE TABLE title_search (rowid INTEGER PRIMARY KEY, document TEXT)")
+
+
+def build_search_documents(conn: sqlite3.Connection) -> None:
+    """Fill title_search with one case-folded document per title.
+
+    A document holds the title, release year, contributor names and genre names
+    separated by newlines, so a search word (never containing whitespace) can
+    only match inside a single field, as with the Postgres ILIKE search.
+    """
+    conn.create_function("casefold", 1, lambda value: value.casefold() if value else "")
+    conn.execute(
+        """
+        INSERT INTO title_search (rowid, document)
+        SELECT
+            t.id,
+            casefold(
+                t.title
+                || char(10) || COALESCE(CAST(t.release_year AS TEXT), '')
+                || char(10) || COALESCE((
+                    SELECT group_concat(c.name, char(10))
+                    FROM contributor_title_mapping ctm
+                    JOIN contributor c ON c.id = ctm.contributor_id
+                    WHERE ctm.title_id = t.id
+                ), '')
+                || char(10) || COALESCE((
+                    SELECT group_concat(g.name, char(10))
+                    FROM title_genre tg
+                    JOIN genre_type_lkup g ON g.id = tg.genre_id
+                    WHERE tg.title_id = t.id
+                ), '')
+            )
+        FROM title t
+        """
+    )
+
+
+def write_snapshot(path: Path, table_rows: dict[str, Iterable[tuple]]) -> None:
+    """Write catalog rows into a new snapshot file, atomically replacing `path`."""
+    temp_path = path.with_name(f"{path.name}.tmp")
+    if temp_path.exists():
+        temp_path.unlink()
+
+    conn = sqlite3.connect(temp_path)
+    try:
+        conn.executescript(SNAPSHOT_SCHEMA)
+        for table_name, columns in SNAPSHOT_TABLES.items():
+            placeholders = ", ".join("?" for _ in columns)
+            conn.executemany(
+                f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})",
+                table_rows.get(table_name, ()),
+            )
+        conn.executescript(SNAPSHOT_INDEXES)
+        conn.execute(
+            """
+            UPDATE title
+            SET cast_count = (
+                SELECT COUNT(DISTINCT ctm.contributor_id)
+                FROM contributor_title_mapping ctm
+                WHERE ctm.title_id = title.id
+            )
+            """
+        )
+        conn.execute(
+            """
+            UPDATE contributor
+            SET title_count = (
+                SELECT COUNT(DISTINCT ctm.title_id)
+                FROM contributor_title_mapping ctm
+                WHERE ctm.contributor_id = contributor.id
+            )
+            """
+        )
+        create_search_table(conn)
+        build_search_documents(conn)
+        conn.commit()
+        conn.execute("ANALYZE")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    os.replace(temp_path, path)
+
+
+def iter_postgres_rows(pg_conn, table_name: str, columns: tuple[str, ...]) -> Iterable[tuple]:
+    """Stream all rows of one table through a server-side cursor."""
+    with pg_conn.cursor(name=f"snapshot_{table_name}") as cur:
+        cur.itersize = EXPORT_BATCH_SIZE
+        cur.execute(
+            f"SELECT {', '.join(columns)} FROM {table_name} ORDER BY {columns[0]}"
+        )
+        yield from cur
+
+
+def export_snapshot(database_url: str, path: Path) -> None:
+    """Export every snapshot table from Postgres into `path`."""
+    with psycopg2.connect(database_url) as pg_conn:
+        write_snapshot(
+            path,
+            {
+                table_name: iter_postgres_rows(pg_conn, table_name, columns)
+                for table_name, columns in SNAPSHOT_TABLES.items()
+            },
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments for standalone execution."""
+    parser = argparse.ArgumentParser(
+        description="Export the Postgres catalog into a read-only SQLite snapshot.",
+    )
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv("DATABASE_URL", ""),
+        help="Postgres connection URL. Defaults to env var DATABASE_URL.",
+    )
+    parser.add_argument(
+        "--output",
+        default=os.getenv("SNAPSHOT_PATH", "") or str(DEFAULT_SNAPSHOT_PATH),
+        help="Snapshot file to write. Defaults to env var SNAPSHOT_PATH.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Export the catalog snapshot."""
+    args = parse_args()
+    database_url = args.database_url.strip()
+    if not database_url:
+        raise RuntimeError(
+            "Database URL not provided. Set DATABASE_URL or pass --database-url.",
+        )
+
+    output = Path(args.output).expanduser().resolve()
+    export_snapshot(database_url, output)
+    print(f"Snapshot written: {output} ({output.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
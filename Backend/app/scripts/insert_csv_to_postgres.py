@@ -4,15 +4,78 @@ from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
+import io
+import json
 import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 
 import psycopg2
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 MOVIES_CSV = SCRIPT_DIR / "movies_sample.csv"
 PEOPLE_CSV = SCRIPT_DIR / "people_sample.csv"
+LOAD_MODES = ("seed", "delta")
+# Catalog tables in foreign-key order; copied and swapped together by --swap.
+CATALOG_TABLES = (
+    "media_type_lkup",
+    "genre_type_lkup",
+    "contributor_type_lkup",
+    "title",
+    "contributor",
+    "title_genre",
+    "contributor_title_mapping",
+    "title_similarity",
+    "search_token_stats",
+)
+SHADOW_SCHEMA = "catalog_shadow"
+RETIRED_SCHEMA = "catalog_retired"
+SWAP_LOCK_TIMEOUT = "5s"
+# Indexes the loaders' own lookups need; kept when --rebuild-indexes drops the rest.
+BULK_LOAD_KEPT_INDEXES = frozenset(
+    {
+        "ix_title_imdb_reference_id",
+        "ix_contributor_imdb_reference_id",
+        "ix_contributor_title_mapping_contributor_id",
+        "ix_title_genre_title_id_genre_id",
+    }
+)
+# Its only user triggers keep title.cast_count and contributor.title_count; each
+# statement-level run scans the mapping, so --rebuild-indexes disables them for the
+# load (the title_id index is dropped) and recomputes the counts once afterwards.
+COUNT_TRIGGER_TABLE = "contributor_title_mapping"
+DEFAULT_MAINTENANCE_WORK_MEM = "1GB"
+INDEX_BUILD_PARALLEL_WORKERS = 4
+# Seed mode commits and checkpoints after this many CSV rows.
+DEFAULT_BATCH_SIZE = 5_000
+COPY_BATCH_SIZE = 50_000
+TITLE_STAGE_COLUMNS = ("imdb_reference_id", "title", "release_year", "genres", "fingerprint")
+CONTRIBUTOR_STAGE_COLUMNS = ("imdb_reference_id", "name", "roles", "known_titles", "fingerprint")
+STAGE_COLUMNS = {"title": TITLE_STAGE_COLUMNS, "contributor": CONTRIBUTOR_STAGE_COLUMNS}
+STAGE_COLUMN_DEFINITIONS = {
+    "title": """
+        imdb_reference_id TEXT NOT NULL,
+        title TEXT NOT NULL,
+        release_year INTEGER,
+        genres TEXT,
+        fingerprint TEXT NOT NULL
+    """,
+    "contributor": """
+        imdb_reference_id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        roles TEXT,
+        known_titles TEXT,
+        fingerprint TEXT NOT NULL
+    """,
+}
+STAGE_ID_COLUMNS = {"title": "title_id", "contributor": "contributor_id"}
+# Chunk tables carry the source byte offset so the merge keeps the last duplicate.
+CHUNK_COLUMNS = {kind: (*columns, "source_offset") for kind, columns in STAGE_COLUMNS.items()}
 
 
 def normalize(value: str | None) -> str | None:
@@ -44,6 +107,22 @@ def parse_list(value: str | None) -> list[str]:
     return [item.strip() for item in normalized.split(",") if item.strip()]
 
 
+def row_fingerprint(*fields: object) -> str:
+    """Return an MD5 hex digest of already-normalized field values."""
+    encoded = json.dumps(fields, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.md5(encoded.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def title_fingerprint(title_name: str, release_year: int | None, genres: list[str]) -> str:
+    """Return the fingerprint stored on title rows loaded from the movies CSV."""
+    return row_fingerprint(title_name, release_year, sorted(set(genres)))
+
+
+def contributor_fingerprint(name: str, roles: list[str], known_titles: list[str]) -> str:
+    """Return the fingerprint stored on contributor rows loaded from the people CSV."""
+    return row_fingerprint(name, sorted(set(roles)), sorted(set(known_titles)))
+
+
 def ensure_lookup(cur, table_name: str, name: str) -> int:
     """Return lookup id by name, creating the row if needed."""
     cur.execute(
@@ -61,7 +140,12 @@ def ensure_lookup(cur, table_name: str, name: str) -> int:
     return cur.fetchone()[0]
 
 
-def ensure_contributor(cur, name: str, imdb_reference_id: str | None) -> int:
+def ensure_contributor(
+    cur,
+    name: str,
+    imdb_reference_id: str | None,
+    source_fingerprint: str | None = None,
+) -> int:
     """Return contributor id by IMDb reference id/name, creating if missing."""
     if imdb_reference_id:
         cur.execute(
@@ -82,11 +166,11 @@ def ensure_contributor(cur, name: str, imdb_reference_id: str | None) -> int:
 
     cur.execute(
         """
-        INSERT INTO contributor (imdb_reference_id, name)
-        VALUES (%s, %s)
+        INSERT INTO contributor (imdb_reference_id, name, source_fingerprint)
+        VALUES (%s, %s, %s)
         RETURNING id
         """,
-        (imdb_reference_id, name),
+        (imdb_reference_id, name, source_fingerprint),
     )
     return cur.fetchone()[0]
 
@@ -97,6 +181,7 @@ def ensure_title(
     title_name: str,
     media_type_id: int,
     release_year: int | None,
+    source_fingerprint: str | None = None,
 ) -> int:
     """Return title id by IMDb reference id or fields, creating if missing."""
     if imdb_reference_id:
@@ -128,11 +213,11 @@ def ensure_title(
 
     cur.execute(
         """
-        INSERT INTO title (imdb_reference_id, title, media_type, release_year)
-        VALUES (%s, %s, %s, %s)
+        INSERT INTO title (imdb_reference_id, title, media_type, release_year, source_fingerprint)
+        VALUES (%s, %s, %s, %s, %s)
         RETURNING id
         """,
-        (imdb_reference_id, title_name, media_type_id, release_year),
+        (imdb_reference_id, title_name, media_type_id, release_year, source_fingerprint),
     )
     return cur.fetchone()[0]
 
@@ -215,6 +300,1016 @@ def print_progress(processed: int, total: int, last_reported_percent: int) -> in
     return last_reported_percent
 
 
+def title_record(row: dict[str, str]) -> tuple | None:
+    """Return a normalized movie row for staging, or None when it has no tconst/title.
+
+    Records are (tconst, title, release_year, genres, fingerprint) with genres
+    comma-joined (or None).
+    """
+    tconst = normalize(row.get("tconst"))
+    title_name = normalize(row.get("primaryTitle"))
+    if not tconst or not title_name:
+        return None
+    release_year = parse_year(row.get("startYear"))
+    genres = parse_list(row.get("genres"))
+    return (
+        tconst,
+        title_name,
+        release_year,
+        ",".join(genres) or None,
+        title_fingerprint(title_name, release_year, genres),
+    )
+
+
+def contributor_record(row: dict[str, str]) -> tuple | None:
+    """Return a normalized people row for staging, or None when it has no nconst/name.
+
+    Records are (nconst, name, roles, known_titles, fingerprint) with lists
+    comma-joined (or None).
+    """
+    nconst = normalize(row.get("nconst"))
+    person_name = normalize(row.get("primaryName"))
+    if not nconst or not person_name:
+        return None
+    roles = parse_list(row.get("primaryProfession"))
+    known_titles = parse_list(row.get("knownForTitles"))
+    return (
+        nconst,
+        person_name,
+        ",".join(roles) or None,
+        ",".join(known_titles) or None,
+        contributor_fingerprint(person_name, roles, known_titles),
+    )
+
+
+RECORD_BUILDERS = {"title": title_record, "contributor": contributor_record}
+
+
+def read_records(path: Path, kind: str) -> dict[str, tuple]:
+    """Return staged records of one kind keyed by IMDb id; later duplicates win.
+
+    Rows without an IMDb id cannot be diffed and are skipped.
+    """
+    build_record = RECORD_BUILDERS[kind]
+    records: dict[str, tuple] = {}
+    for row in read_csv_rows(path):
+        record = build_record(row)
+        if record is not None:
+            records[record[0]] = record
+    return records
+
+
+def read_title_records(path: Path) -> dict[str, tuple]:
+    """Return normalized movie rows keyed by tconst."""
+    return read_records(path, "title")
+
+
+def read_contributor_records(path: Path) -> dict[str, tuple]:
+    """Return normalized people rows keyed by nconst."""
+    return read_records(path, "contributor")
+
+
+def read_csv_header(path: Path) -> tuple[list[str], int]:
+    """Return the CSV column names and the byte offset of the first data row."""
+    with path.open("rb") as file:
+        header = file.readline()
+    return next(csv.reader([header.decode("utf-8")])), len(header)
+
+
+def split_byte_ranges(path: Path, parts: int) -> list[tuple[int, int]]:
+    """Split the data rows of a CSV file into `parts` contiguous byte ranges.
+
+    Range bounds are raw byte offsets; `iter_chunk_rows` aligns them to lines.
+    """
+    _, data_start = read_csv_header(path)
+    size = path.stat().st_size
+    step = max(1, -(-(size - data_start) // max(1, parts)))
+    return [
+        (start, min(start + step, size))
+        for start in range(data_start, size, step)
+    ]
+
+
+def iter_chunk_rows(path: Path, start: int, end: int) -> Iterable[tuple[int, dict[str, str]]]:
+    """Yield (byte offset, row) for every line that starts inside [start, end).
+
+    Assumes one record per line (no quoted newlines), which holds for IMDb exports.
+    """
+    fieldnames, data_start = read_csv_header(path)
+    with path.open("rb") as file:
+        if start > data_start:
+            # Skip the line straddling `start`; the previous range owns it.
+            file.seek(start - 1)
+            file.readline()
+        else:
+            file.seek(data_start)
+        while True:
+            offset = file.tell()
+            if offset >= end:
+                break
+            line = file.readline()
+            if not line:
+                break
+            values = next(csv.reader([line.decode("utf-8")]), None)
+            if values:
+                yield offset, dict(zip(fieldnames, values))
+
+
+def iter_csv_records(path: Path, start: int) -> Iterable[tuple[int, dict[str, str]]]:
+    """Yield (byte offset, row) for every CSV record from `start`, a record boundary, on.
+
+    Quoted fields may span lines. Offsets are only taken between records, so each
+    one is a valid place to resume reading.
+    """
+    fieldnames, data_start = read_csv_header(path)
+    with path.open("rb") as file:
+        file.seek(max(start, data_start))
+        position = file.tell()
+
+        def lines() -> Iterator[str]:
+            nonlocal position
+            for line in file:
+                position += len(line)
+                yield line.decode("utf-8")
+
+        # csv.reader pulls lines only until a record is complete, so `position`
+        # is the end of the record it just returned.
+        record_start = position
+        for values in csv.reader(lines()):
+            if values:
+                yield record_start, dict(zip(fieldnames, values))
+            record_start = position
+
+
+def load_chunk(task: tuple[str, str, str, int, int, str]) -> int:
+    """Parse one byte range and COPY its records into its own chunk table.
+
+    Runs in a worker process with its own connection; returns rows staged.
+    """
+    database_url, kind, path, start, end, table_name = task
+    build_record = RECORD_BUILDERS[kind]
+    records = (
+        (*record, offset)
+        for offset, row in iter_chunk_rows(Path(path), start, end)
+        if (record := build_record(row)) is not None
+    )
+    with psycopg2.connect(database_url) as conn:
+        with conn.cursor() as cur:
+            written = copy_rows(cur, table_name, CHUNK_COLUMNS[kind], records)
+    conn.close()
+    return written
+
+
+def copy_value(value: object) -> str:
+    """Encode one value for COPY ... FROM STDIN text format."""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_rows(cur, table_name: str, columns: tuple[str, ...], rows: Iterable[tuple]) -> int:
+    """COPY rows into a table in batches; return the number of rows written."""
+    written = 0
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(copy_value(value) for value in row))
+        buffer.write("\n")
+        written += 1
+        if written % COPY_BATCH_SIZE == 0:
+            _flush_copy_buffer(cur, table_name, columns, buffer)
+            buffer = io.StringIO()
+    _flush_copy_buffer(cur, table_name, columns, buffer)
+    return written
+
+
+def _flush_copy_buffer(cur, table_name: str, columns: tuple[str, ...], buffer: io.StringIO) -> None:
+    """Send one buffered COPY batch."""
+    if not buffer.tell():
+        return
+    buffer.seek(0)
+    cur.copy_expert(f"COPY {table_name} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+def create_stage_tables(cur) -> None:
+    """Create the transaction-scoped staging tables used by the delta loader."""
+    for kind, columns in STAGE_COLUMN_DEFINITIONS.items():
+        cur.execute(
+            f"""
+            CREATE TEMP TABLE ingest_{kind}_stage (
+                {columns},
+                {STAGE_ID_COLUMNS[kind]} INTEGER,
+                change TEXT NOT NULL DEFAULT 'insert',
+                PRIMARY KEY (imdb_reference_id)
+            ) ON COMMIT DROP
+            """
+        )
+
+
+def create_chunk_tables(cur, kind: str, count: int) -> list[str]:
+    """Create one unlogged chunk table per parallel worker; return their names.
+
+    Names carry the coordinating connection's backend pid, which no other live
+    session shares, so overlapping loads never drop each other's chunks.
+    """
+    cur.execute("SELECT pg_backend_pid()")
+    run_id = cur.fetchone()[0]
+    # Schema-qualified: workers connect with the default search_path.
+    table_names = [f"public.ingest_{kind}_chunk_{run_id}_{index}" for index in range(count)]
+    for table_name in table_names:
+        cur.execute(f"DROP TABLE IF EXISTS {table_name}")
+        cur.execute(
+            f"""
+            CREATE UNLOGGED TABLE {table_name} (
+                {STAGE_COLUMN_DEFINITIONS[kind]},
+                source_offset BIGINT NOT NULL
+            )
+            """
+        )
+    return table_names
+
+
+def drop_chunk_tables(conn, table_names: Iterable[str]) -> None:
+    """Drop worker chunk tables and commit."""
+    with conn.cursor() as cur:
+        for table_name in table_names:
+            cur.execute(f"DROP TABLE IF EXISTS {table_name}")
+    conn.commit()
+
+
+def merge_chunk_tables(cur, kind: str, table_names: list[str]) -> int:
+    """Merge worker chunk tables into the staging table, keeping the last duplicate."""
+    if not table_names:
+        return 0
+    columns = ", ".join(STAGE_COLUMNS[kind])
+    chunks = " UNION ALL ".join(f"SELECT * FROM {table_name}" for table_name in table_names)
+    cur.execute(
+        f"""
+        INSERT INTO ingest_{kind}_stage ({columns})
+        SELECT DISTINCT ON (imdb_reference_id) {columns}
+        FROM ({chunks}) AS chunk
+        ORDER BY imdb_reference_id, source_offset DESC
+        """
+    )
+    return cur.rowcount
+
+
+def insert_missing_lookups(cur, table_name: str, stage_table: str, list_column: str) -> int:
+    """Insert lookup names referenced by staged rows but missing (case-insensitively)."""
+    cur.execute(
+        f"""
+        INSERT INTO {table_name} (name)
+        SELECT DISTINCT ON (lower(item.name)) item.name
+        FROM {stage_table} s
+        CROSS JOIN LATERAL unnest(string_to_array(s.{list_column}, ',')) AS item(name)
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {table_name} l WHERE lower(l.name) = lower(item.name)
+        )
+        ORDER BY lower(item.name), item.name
+        """
+    )
+    return cur.rowcount
+
+
+def classify_stage_rows(cur, stage_table: str, target_table: str, id_column: str) -> None:
+    """Mark staged rows as insert, update or unchanged by comparing fingerprints."""
+    cur.execute(
+        f"""
+        UPDATE {stage_table} s
+        SET {id_column} = t.id,
+            change = CASE
+                WHEN t.source_fingerprint IS DISTINCT FROM s.fingerprint THEN 'update'
+                ELSE 'unchanged'
+            END
+        FROM {target_table} t
+        WHERE t.imdb_reference_id = s.imdb_reference_id
+        """
+    )
+
+
+def count_stage_changes(cur, stage_table: str) -> dict[str, int]:
+    """Return staged row counts per change kind."""
+    cur.execute(f"SELECT change, COUNT(*) FROM {stage_table} GROUP BY change")
+    return dict(cur.fetchall())
+
+
+def apply_title_delta(cur, media_type_id: int) -> dict[str, int]:
+    """Apply staged movie rows to title and title_genre; return diff counts."""
+    classify_stage_rows(cur, "ingest_title_stage", "title", "title_id")
+
+    # Titles that came from IMDb but are no longer in the source file.
+    cur.execute(
+        """
+        CREATE TEMP TABLE ingest_deleted_title ON COMMIT DROP AS
+        SELECT t.id
+        FROM title t
+        WHERE t.imdb_reference_id IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM ingest_title_stage s
+              WHERE s.imdb_reference_id = t.imdb_reference_id
+          )
+        """
+    )
+    deleted = cur.rowcount
+    cur.execute(
+        """
+        DELETE FROM title_similarity
+        WHERE title_id IN (SELECT id FROM ingest_deleted_title)
+           OR related_title_id IN (SELECT id FROM ingest_deleted_title)
+        """
+    )
+    for table_name in ("contributor_title_mapping", "title_genre"):
+        cur.execute(
+            f"DELETE FROM {table_name} WHERE title_id IN (SELECT id FROM ingest_deleted_title)"
+        )
+    cur.execute("DELETE FROM title WHERE id IN (SELECT id FROM ingest_deleted_title)")
+
+    cur.execute(
+        """
+        UPDATE title t
+        SET title = s.title,
+            release_year = s.release_year,
+            source_fingerprint = s.fingerprint
+        FROM ingest_title_stage s
+        WHERE s.change = 'update' AND t.id = s.title_id
+        """
+    )
+    cur.execute(
+        """
+        DELETE FROM title_genre
+        WHERE title_id IN (SELECT title_id FROM ingest_title_stage WHERE change = 'update')
+        """
+    )
+    cur.execute(
+        """
+        WITH inserted AS (
+            INSERT INTO title (imdb_reference_id, title, media_type, release_year, source_fingerprint)
+            SELECT imdb_reference_id, title, %s, release_year, fingerprint
+            FROM ingest_title_stage
+            WHERE change = 'insert'
+            RETURNING id, imdb_reference_id
+        )
+        UPDATE ingest_title_stage s
+        SET title_id = inserted.id
+        FROM inserted
+        WHERE s.imdb_reference_id = inserted.imdb_reference_id
+        """,
+        (media_type_id,),
+    )
+
+    genre_lookups = insert_missing_lookups(cur, "genre_type_lkup", "ingest_title_stage", "genres")
+    cur.execute(
+        """
+        INSERT INTO title_genre (title_id, genre_id)
+        SELECT DISTINCT s.title_id, lookup.id
+        FROM ingest_title_stage s
+        CROSS JOIN LATERAL unnest(string_to_array(s.genres, ',')) AS genre(name)
+        CROSS JOIN LATERAL (
+            SELECT l.id FROM genre_type_lkup l
+            WHERE lower(l.name) = lower(genre.name)
+            ORDER BY l.id
+            LIMIT 1
+        ) AS lookup
+        WHERE s.change IN ('insert', 'update')
+        """
+    )
+    genre_links = cur.rowcount
+
+    counts = count_stage_changes(cur, "ingest_title_stage")
+    return {
+        "inserted": counts.get("insert", 0),
+        "updated": counts.get("update", 0),
+        "deleted": deleted,
+        "unchanged": counts.get("unchanged", 0),
+        "new_genres": genre_lookups,
+        "genre_links": genre_links,
+    }
+
+
+def apply_contributor_delta(cur) -> dict[str, int]:
+    """Apply staged people rows to contributor and contributor_title_mapping.
+
+    Must run after `apply_title_delta` so new titles can be linked to.
+    """
+    classify_stage_rows(cur, "ingest_contributor_stage", "contributor", "contributor_id")
+
+    cur.execute(
+        """
+        CREATE TEMP TABLE ingest_deleted_contributor ON COMMIT DROP AS
+        SELECT c.id
+        FROM contributor c
+        WHERE c.imdb_reference_id IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM ingest_contributor_stage s
+              WHERE s.imdb_reference_id = c.imdb_reference_id
+          )
+        """
+    )
+    deleted = cur.rowcount
+    cur.execute(
+        """
+        DELETE FROM contributor_title_mapping
+        WHERE contributor_id IN (SELECT id FROM ingest_deleted_contributor)
+        """
+    )
+    cur.execute("DELETE FROM contributor WHERE id IN (SELECT id FROM ingest_deleted_contributor)")
+
+    # Unchanged people whose known-for titles were only inserted in this run.
+    cur.execute(
+        """
+        UPDATE ingest_contributor_stage s
+        SET change = 'relink'
+        WHERE s.change = 'unchanged'
+          AND EXISTS (
+              SELECT 1
+              FROM unnest(string_to_array(s.known_titles, ',')) AS known(tconst)
+              JOIN ingest_title_stage ts
+                ON ts.imdb_reference_id = known.tconst AND ts.change = 'insert'
+          )
+        """
+    )
+    cur.execute(
+        """
+        UPDATE contributor c
+        SET name = s.name,
+            source_fingerprint = s.fingerprint
+        FROM ingest_contributor_stage s
+        WHERE s.change = 'update' AND c.id = s.contributor_id
+        """
+    )
+    cur.execute(
+        """
+        DELETE FROM contributor_title_mapping
+        WHERE contributor_id IN (
+            SELECT contributor_id FROM ingest_contributor_stage
+            WHERE change IN ('update', 'relink')
+        )
+        """
+    )
+    cur.execute(
+        """
+        WITH inserted AS (
+            INSERT INTO contributor (imdb_reference_id, name, source_fingerprint)
+            SELECT imdb_reference_id, name, fingerprint
+            FROM ingest_contributor_stage
+            WHERE change = 'insert'
+            RETURNING id, imdb_reference_id
+        )
+        UPDATE ingest_contributor_stage s
+        SET contributor_id = inserted.id
+        FROM inserted
+        WHERE s.imdb_reference_id = inserted.imdb_reference_id
+        """
+    )
+
+    role_lookups = insert_missing_lookups(
+        cur,
+        "contributor_type_lkup",
+        "ingest_contributor_stage",
+        "roles",
+    )
+    cur.execute(
+        """
+        INSERT INTO contributor_title_mapping (contributor_id, type_id, title_id)
+        SELECT DISTINCT s.contributor_id, lookup.id, t.id
+        FROM ingest_contributor_stage s
+        CROSS JOIN LATERAL unnest(string_to_array(s.roles, ',')) AS role(name)
+        CROSS JOIN LATERAL (
+            SELECT l.id FROM contributor_type_lkup l
+            WHERE lower(l.name) = lower(role.name)
+            ORDER BY l.id
+            LIMIT 1
+        ) AS lookup
+        CROSS JOIN LATERAL unnest(string_to_array(s.known_titles, ',')) AS known(tconst)
+        JOIN title t ON t.imdb_reference_id = known.tconst
+        WHERE s.change IN ('insert', 'update', 'relink')
+        """
+    )
+    title_links = cur.rowcount
+
+    counts = count_stage_changes(cur, "ingest_contributor_stage")
+    return {
+        "inserted": counts.get("insert", 0),
+        "updated": counts.get("update", 0),
+        "deleted": deleted,
+        "unchanged": counts.get("unchanged", 0),
+        "relinked": counts.get("relink", 0),
+        "new_roles": role_lookups,
+        "title_links": title_links,
+    }
+
+
+def apply_staged_delta(cur) -> dict[str, dict[str, int]]:
+    """Apply both filled staging tables to the catalog; return diff counts."""
+    cur.execute("ANALYZE ingest_title_stage")
+    cur.execute("ANALYZE ingest_contributor_stage")
+    media_type_id = ensure_lookup(cur, "media_type_lkup", "movie")
+    return {
+        "titles": apply_title_delta(cur, media_type_id),
+        "contributors": apply_contributor_delta(cur),
+    }
+
+
+def run_delta_load(conn, movies_csv: Path, people_csv: Path) -> dict[str, dict[str, int]]:
+    """Diff both CSV files against stored fingerprints and apply the changes.
+
+    Everything runs in the connection's current transaction, so readers see the
+    old catalog until the caller commits.
+    """
+    title_records = read_title_records(movies_csv)
+    contributor_records = read_contributor_records(people_csv)
+
+    with conn.cursor() as cur:
+        create_stage_tables(cur)
+        copy_rows(cur, "ingest_title_stage", TITLE_STAGE_COLUMNS, title_records.values())
+        copy_rows(
+            cur,
+            "ingest_contributor_stage",
+            CONTRIBUTOR_STAGE_COLUMNS,
+            contributor_records.values(),
+        )
+        return apply_staged_delta(cur)
+
+
+def run_parallel_load(
+    conn,
+    database_url: str,
+    movies_csv: Path,
+    people_csv: Path,
+    workers: int,
+) -> dict[str, dict[str, int]]:
+    """Parse byte-range chunks of both CSV files in a process pool, then merge once.
+
+    Each worker COPYs its chunk into its own unlogged table over its own
+    connection; the merge and delta apply run here and are left uncommitted,
+    like `run_delta_load`.
+    """
+    chunk_tables: dict[str, list[str]] = {}
+    tasks = []
+    with conn.cursor() as cur:
+        for kind, path in (("title", movies_csv), ("contributor", people_csv)):
+            byte_ranges = split_byte_ranges(path, workers)
+            chunk_tables[kind] = create_chunk_tables(cur, kind, len(byte_ranges))
+            tasks.extend(
+                (database_url, kind, str(path), start, end, table_name)
+                for (start, end), table_name in zip(byte_ranges, chunk_tables[kind])
+            )
+    conn.commit()
+    all_chunk_tables = [name for names in chunk_tables.values() for name in names]
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            staged_rows = sum(pool.map(load_chunk, tasks))
+        print(f"Staged {staged_rows} rows from {len(tasks)} chunks with {workers} workers")
+
+        with conn.cursor() as cur:
+            create_stage_tables(cur)
+            for kind, table_names in chunk_tables.items():
+                merge_chunk_tables(cur, kind, table_names)
+            report = apply_staged_delta(cur)
+            for table_name in all_chunk_tables:
+                cur.execute(f"DROP TABLE {table_name}")
+    except Exception:
+        conn.rollback()
+        drop_chunk_tables(conn, all_chunk_tables)
+        raise
+    return report
+
+
+def run_staged_load(
+    conn,
+    database_url: str,
+    movies_csv: Path,
+    people_csv: Path,
+    workers: int,
+) -> dict[str, dict[str, int]]:
+    """Stage and apply both CSV files, in parallel when `workers` > 1; leaves it uncommitted."""
+    if workers > 1:
+        return run_parallel_load(conn, database_url, movies_csv, people_csv, workers)
+    return run_delta_load(conn, movies_csv, people_csv)
+
+
+def refresh_search_token_stats(cur) -> None:
+    """Recount titles per search token for the browse search planner.
+
+    Tokens are the lower-cased words of titles, contributor names and genre
+    names, plus release years; the empty token holds the total title count.
+    """
+    cur.execute("DELETE FROM search_token_stats")
+    cur.execute(
+        r"""
+        INSERT INTO search_token_stats (token, title_count)
+        SELECT token, COUNT(DISTINCT title_id)
+        FROM (
+            SELECT t.id AS title_id, regexp_split_to_table(lower(t.title), '\W+') AS token
+            FROM title t
+            UNION ALL
+            SELECT ctm.title_id, names.token
+            FROM (
+                SELECT c.id, regexp_split_to_table(lower(c.name), '\W+') AS token
+                FROM contributor c
+            ) AS names
+            JOIN contributor_title_mapping ctm ON ctm.contributor_id = names.id
+            UNION ALL
+            SELECT tg.title_id, names.token
+            FROM (
+                SELECT g.id, regexp_split_to_table(lower(g.name), '\W+') AS token
+                FROM genre_type_lkup g
+            ) AS names
+            JOIN title_genre tg ON tg.genre_id = names.id
+            UNION ALL
+            SELECT t.id, CAST(t.release_year AS TEXT)
+            FROM title t
+            WHERE t.release_year IS NOT NULL
+        ) AS tokens
+        WHERE token <> ''
+        GROUP BY token
+        UNION ALL
+        SELECT '', COUNT(*) FROM title
+        """
+    )
+
+
+def bump_dataset_version(cur) -> None:
+    """Advance dataset_version so API processes reload their in-memory catalog."""
+    cur.execute("UPDATE dataset_version SET version = version + 1, updated_at = now()")
+
+
+def fetch_table_definitions(cur, tables: Iterable[str]) -> dict[str, list[str]]:
+    """Return the constraints, indexes and triggers of public tables as DDL.
+
+    Keys are "keys" (primary/unique/exclusion constraints), "foreign_keys",
+    "indexes" (not backing a constraint) and "triggers"; every statement
+    targets the table through a `{schema}` placeholder.
+    """
+    definitions: dict[str, list[str]] = {
+        "keys": [],
+        "foreign_keys": [],
+        "indexes": [],
+        "triggers": [],
+    }
+    for table in tables:
+        relation = f"public.{table}"
+        cur.execute(
+            """
+            SELECT conname, contype, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'x', 'f')
+            ORDER BY conname
+            """,
+            (relation,),
+        )
+        for name, kind, definition in cur.fetchall():
+            # Unqualified references resolve against the target schema first.
+            definition = definition.replace("REFERENCES public.", "REFERENCES ")
+            statement = f'ALTER TABLE {{schema}}.{table} ADD CONSTRAINT "{name}" {definition}'
+            definitions["foreign_keys" if kind == "f" else "keys"].append(statement)
+
+        definitions["indexes"].extend(
+            _retarget_definition(definition, table)
+            for _, definition in fetch_secondary_indexes(cur, table)
+        )
+
+        cur.execute(
+            """
+            SELECT pg_get_triggerdef(oid)
+            FROM pg_trigger
+            WHERE tgrelid = %s::regclass AND NOT tgisinternal
+            ORDER BY tgname
+            """,
+            (relation,),
+        )
+        definitions["triggers"].extend(
+            _retarget_definition(definition, table) for (definition,) in cur.fetchall()
+        )
+    return definitions
+
+
+def _retarget_definition(definition: str, table: str) -> str:
+    """Replace the table an index/trigger definition is ON with a `{schema}` placeholder."""
+    return re.sub(
+        rf" ON (ONLY )?(public\.)?{table} ",
+        lambda match: f" ON {match.group(1) or ''}{{schema}}.{table} ",
+        definition,
+        count=1,
+    )
+
+
+def fetch_secondary_indexes(cur, table: str) -> list[tuple[str, str]]:
+    """Return (name, definition) of indexes on a public table that back no constraint."""
+    cur.execute(
+        """
+        SELECT index_class.relname, pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        JOIN pg_class index_class ON index_class.oid = i.indexrelid
+        WHERE i.indrelid = %s::regclass
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_constraint c
+              WHERE c.conindid = i.indexrelid AND c.contype IN ('p', 'u', 'x')
+          )
+        ORDER BY index_class.relname
+        """,
+        (f"public.{table}",),
+    )
+    return cur.fetchall()
+
+
+@contextmanager
+def timed_phase(timings: dict[str, float], phase: str) -> Iterator[None]:
+    """Record the wall-clock duration of a block under `phase`."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = time.perf_counter() - started
+
+
+def drop_secondary_indexes(conn) -> list[tuple[str, str]]:
+    """Drop droppable secondary indexes on the catalog tables; return their definitions.
+
+    The definitions are printed first so they can be restored by hand if the
+    process is killed before `create_indexes` runs.
+    """
+    dropped: list[tuple[str, str]] = []
+    with conn.cursor() as cur:
+        for table in CATALOG_TABLES:
+            for name, definition in fetch_secondary_indexes(cur, table):
+                if name in BULK_LOAD_KEPT_INDEXES:
+                    continue
+                print(f"Dropping index: {definition}")
+                cur.execute(f'DROP INDEX public."{name}"')
+                dropped.append((name, definition))
+    conn.commit()
+    return dropped
+
+
+def disable_count_triggers(conn) -> None:
+    """Disable the count triggers for a bulk load; see enable_count_triggers.
+
+    The statement is printed first so the triggers can be re-enabled by hand if
+    the process is killed before the load finishes.
+    """
+    statement = f"ALTER TABLE public.{COUNT_TRIGGER_TABLE} DISABLE TRIGGER USER"
+    print(f"Disabling triggers: {statement}")
+    with conn.cursor() as cur:
+        cur.execute(statement)
+    conn.commit()
+
+
+def enable_count_triggers(conn) -> None:
+    """Re-enable the count triggers and recompute every count in the same transaction."""
+    with conn.cursor() as cur:
+        cur.execute(f"ALTER TABLE public.{COUNT_TRIGGER_TABLE} ENABLE TRIGGER USER")
+        refresh_all_cast_counts(cur)
+        refresh_all_contributor_title_counts(cur)
+    conn.commit()
+
+
+def tune_index_builds(cur, maintenance_work_mem: str) -> None:
+    """Give index builds in this transaction more memory and parallel workers."""
+    cur.execute("SET LOCAL maintenance_work_mem = %s", (maintenance_work_mem,))
+    cur.execute(
+        "SET LOCAL max_parallel_maintenance_workers = %s",
+        (INDEX_BUILD_PARALLEL_WORKERS,),
+    )
+
+
+def create_indexes(conn, indexes: list[tuple[str, str]], maintenance_work_mem: str) -> None:
+    """Recreate dropped indexes, committing and timing each one."""
+    for name, definition in indexes:
+        started = time.perf_counter()
+        with conn.cursor() as cur:
+            tune_index_builds(cur, maintenance_work_mem)
+            cur.execute(definition)
+        conn.commit()
+        print(f"Created index {name} in {time.perf_counter() - started:.2f}s")
+
+
+def analyze_catalog_tables(conn) -> None:
+    """Refresh planner statistics of every catalog table."""
+    with conn.cursor() as cur:
+        for table in CATALOG_TABLES:
+            cur.execute(f"ANALYZE public.{table}")
+    conn.commit()
+
+
+def create_shadow_tables(cur) -> None:
+    """Create an index-free copy of every catalog table in the shadow schema.
+
+    Serial columns get their own sequences, owned by the shadow tables, so
+    the sequences move with them on swap.
+    """
+    cur.execute(f"DROP SCHEMA IF EXISTS {SHADOW_SCHEMA} CASCADE")
+    cur.execute(f"CREATE SCHEMA {SHADOW_SCHEMA}")
+    for table in CATALOG_TABLES:
+        shadow_table = f"{SHADOW_SCHEMA}.{table}"
+        cur.execute(
+            f"""
+            CREATE TABLE {shadow_table}
+            (LIKE public.{table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+            """
+        )
+        cur.execute(f"INSERT INTO {shadow_table} SELECT * FROM public.{table}")
+        cur.execute(
+            """
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = %s
+              AND column_default LIKE 'nextval(%%'
+            """,
+            (table,),
+        )
+        for (column,) in cur.fetchall():
+            sequence = f"{SHADOW_SCHEMA}.{table}_{column}_seq"
+            cur.execute(f"CREATE SEQUENCE {sequence} AS integer OWNED BY {shadow_table}.{column}")
+            cur.execute(
+                f"ALTER TABLE {shadow_table} ALTER COLUMN {column} "
+                f"SET DEFAULT nextval('{sequence}')"
+            )
+            cur.execute(
+                f"SELECT setval('{sequence}', COALESCE(max({column}), 1), max({column}) IS NOT NULL) "
+                f"FROM {shadow_table}"
+            )
+
+
+def refresh_all_cast_counts(cur) -> None:
+    """Recompute title.cast_count for every title; used where the triggers are absent or off."""
+    cur.execute(
+        """
+        UPDATE title t
+        SET cast_count = COALESCE(counts.cast_count, 0)
+        FROM title existing
+        LEFT JOIN (
+            SELECT title_id, COUNT(DISTINCT contributor_id) AS cast_count
+            FROM contributor_title_mapping
+            GROUP BY title_id
+        ) AS counts ON counts.title_id = existing.id
+        WHERE t.id = existing.id
+          AND t.cast_count IS DISTINCT FROM COALESCE(counts.cast_count, 0)
+        """
+    )
+
+
+def refresh_all_contributor_title_counts(cur) -> None:
+    """Recompute every contributor.title_count; used where the triggers are absent or off."""
+    cur.execute(
+        """
+        UPDATE contributor c
+        SET title_count = COALESCE(counts.title_count, 0)
+        FROM contributor existing
+        LEFT JOIN (
+            SELECT contributor_id, COUNT(DISTINCT title_id) AS title_count
+            FROM contributor_title_mapping
+            GROUP BY contributor_id
+        ) AS counts ON counts.contributor_id = existing.id
+        WHERE c.id = existing.id
+          AND c.title_count IS DISTINCT FROM COALESCE(counts.title_count, 0)
+        """
+    )
+
+
+def swap_shadow_tables(conn) -> None:
+    """Move live catalog tables out and shadow tables in, in one short transaction."""
+    with conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {RETIRED_SCHEMA} CASCADE")
+        cur.execute(f"CREATE SCHEMA {RETIRED_SCHEMA}")
+        # Give up rather than queue (and block readers) behind a long-running query.
+        cur.execute("SET LOCAL lock_timeout = %s", (SWAP_LOCK_TIMEOUT,))
+        for table in CATALOG_TABLES:
+            cur.execute(f"ALTER TABLE public.{table} SET SCHEMA {RETIRED_SCHEMA}")
+            cur.execute(f"ALTER TABLE {SHADOW_SCHEMA}.{table} SET SCHEMA public")
+        bump_dataset_version(cur)
+    conn.commit()
+
+
+def run_swap_load(
+    conn,
+    database_url: str,
+    movies_csv: Path,
+    people_csv: Path,
+    workers: int,
+    maintenance_work_mem: str = DEFAULT_MAINTENANCE_WORK_MEM,
+) -> dict[str, dict[str, int]]:
+    """Apply the CSV delta to a shadow copy of the catalog, then swap it in.
+
+    The copy is indexed and analyzed before the swap, so the live tables are
+    only locked for the renames. Ids of unchanged rows are preserved.
+    """
+    with conn.cursor() as cur:
+        # Captured with the default search_path so references stay unqualified.
+        definitions = fetch_table_definitions(cur, CATALOG_TABLES)
+        create_shadow_tables(cur)
+        cur.execute(f"SET search_path TO {SHADOW_SCHEMA}, public")
+    conn.commit()
+
+    try:
+        report = run_staged_load(conn, database_url, movies_csv, people_csv, workers)
+        with conn.cursor() as cur:
+            refresh_all_cast_counts(cur)
+            refresh_all_contributor_title_counts(cur)
+            refresh_search_token_stats(cur)
+            tune_index_builds(cur, maintenance_work_mem)
+            for kind in ("keys", "foreign_keys", "indexes", "triggers"):
+                for statement in definitions[kind]:
+                    cur.execute(statement.replace("{schema}", SHADOW_SCHEMA))
+            for table in CATALOG_TABLES:
+                cur.execute(f"ANALYZE {SHADOW_SCHEMA}.{table}")
+        conn.commit()
+        swap_shadow_tables(conn)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("RESET search_path")
+            cur.execute(f"DROP SCHEMA IF EXISTS {RETIRED_SCHEMA} CASCADE")
+            cur.execute(f"DROP SCHEMA IF EXISTS {SHADOW_SCHEMA} CASCADE")
+        conn.commit()
+    return report
+
+
+def print_delta_report(report: dict[str, dict[str, int]]) -> None:
+    """Print the diff counts of a delta load."""
+    for entity, counts in report.items():
+        summary = ", ".join(f"{name}={value}" for name, value in counts.items())
+        print(f"Delta {entity}: {summary}")
+
+
+def load_checkpoints(cur) -> dict[str, tuple[int, str | None, int]]:
+    """Return saved seed checkpoints as source -> (file offset, last key, rows processed)."""
+    cur.execute("SELECT source, file_offset, last_key, rows_processed FROM ingest_checkpoint")
+    return {source: (offset, last_key, rows) for source, offset, last_key, rows in cur.fetchall()}
+
+
+def save_checkpoint(
+    cur,
+    source: str,
+    file_offset: int,
+    last_key: str | None,
+    rows_processed: int,
+) -> None:
+    """Upsert the checkpoint of one source file; committed with the batch it follows."""
+    cur.execute(
+        """
+        INSERT INTO ingest_checkpoint (source, file_offset, last_key, rows_processed, updated_at)
+        VALUES (%s, %s, %s, %s, now())
+        ON CONFLICT (source) DO UPDATE
+        SET file_offset = EXCLUDED.file_offset,
+            last_key = EXCLUDED.last_key,
+            rows_processed = EXCLUDED.rows_processed,
+            updated_at = EXCLUDED.updated_at
+        """,
+        (source, file_offset, last_key, rows_processed),
+    )
+
+
+def clear_checkpoints(cur) -> None:
+    """Remove all seed checkpoints."""
+    cur.execute("DELETE FROM ingest_checkpoint")
+
+
+def iter_checkpointed_rows(
+    conn,
+    source: str,
+    path: Path,
+    key_field: str,
+    batch_size: int,
+    checkpoint: tuple[int, str | None, int] | None,
+) -> Iterable[dict[str, str]]:
+    """Yield CSV rows from `checkpoint` on, committing every `batch_size` rows.
+
+    The checkpoint written with each commit points at the next unprocessed row,
+    so a restarted load replays at most the batch that was in flight.
+    """
+    _, data_start = read_csv_header(path)
+    file_offset, last_key, processed = checkpoint or (data_start, None, 0)
+    file_size = path.stat().st_size
+    batch_rows = 0
+    with conn.cursor() as cur:
+        for offset, row in iter_csv_records(path, file_offset):
+            if batch_rows >= batch_size:
+                save_checkpoint(cur, source, offset, last_key, processed)
+                conn.commit()
+                batch_rows = 0
+            yield row
+            processed += 1
+            batch_rows += 1
+            last_key = normalize(row.get(key_field)) or last_key
+        save_checkpoint(cur, source, file_size, last_key, processed)
+    conn.commit()
+
+
+def fetch_title_ids_by_tconst(cur) -> dict[str, int]:
+    """Return title ids keyed by IMDb reference id."""
+    cur.execute("SELECT imdb_reference_id, id FROM title WHERE imdb_reference_id IS NOT NULL")
+    return dict(cur.fetchall())
+
+
 def parse_args() -> argparse.Namespace:
     """Parse command-line arguments for standalone execution."""
     parser = argparse.ArgumentParser(
@@ -235,7 +1330,62 @@ def parse_args() -> argparse.Namespace:
         default=str(PEOPLE_CSV),
         help="Path to people_sample.csv",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--mode",
+        choices=LOAD_MODES,
+        default="seed",
+        help=(
+            "seed: insert only into empty tables (default). "
+            "delta: diff rows by fingerprint and apply inserts, updates and deletes."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Parse and stage the CSV files in this many processes, then merge them "
+            "set-based. Rows without IMDb ids are skipped in this mode."
+        ),
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Seed mode: commit and save a checkpoint after this many CSV rows.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Seed mode: continue an interrupted load from its last checkpoint.",
+    )
+    parser.add_argument(
+        "--swap",
+        action="store_true",
+        help=(
+            "Delta mode: apply the changes to a shadow copy of the catalog, index and "
+            "analyze it, then swap it in place of the live tables."
+        ),
+    )
+    parser.add_argument(
+        "--rebuild-indexes",
+        action="store_true",
+        help=(
+            "Drop secondary indexes (e.g. the trigram GIN indexes) before loading, "
+            "recreate them afterwards, run ANALYZE and report timings per phase."
+        ),
+    )
+    parser.add_argument(
+        "--maintenance-work-mem",
+        default=DEFAULT_MAINTENANCE_WORK_MEM,
+        help="maintenance_work_mem used while (re)building indexes.",
+    )
+    args = parser.parse_args()
+    if args.swap and args.mode != "delta":
+        parser.error("--swap requires --mode delta")
+    if args.swap and args.rebuild_indexes:
+        parser.error("--swap already builds indexes after loading; drop --rebuild-indexes")
+    return args
 
 
 def has_existing_title_or_contributor_data(cur) -> bool:
@@ -247,23 +1397,14 @@ def has_existing_title_or_contributor_data(cur) -> bool:
     return title_has_rows or contributor_has_rows
 
 
-def main() -> None:
-    """Load movies and people samples into normalized tables."""
-    args = parse_args()
-    database_url = args.database_url.strip()
-    movies_csv = Path(args.movies_csv).expanduser().resolve()
-    people_csv = Path(args.people_csv).expanduser().resolve()
-
-    if not database_url:
-        raise RuntimeError(
-            "Database URL not provided. Set DATABASE_URL or pass --database-url.",
-        )
-
-    if not movies_csv.exists() or not people_csv.exists():
-        raise FileNotFoundError(
-            f"CSV files not found. movies={movies_csv} people={people_csv}",
-        )
-
+def run_seed_load(
+    database_url: str,
+    movies_csv: Path,
+    people_csv: Path,
+    batch_size: int,
+    resume: bool,
+) -> None:
+    """Insert both CSV files row by row into empty tables, with checkpointed batches."""
     inserted_titles = 0
     inserted_contributors = 0
     contributor_title_links = 0
@@ -276,17 +1417,32 @@ def main() -> None:
 
     with psycopg2.connect(database_url) as conn:
         with conn.cursor() as cur:
-            if has_existing_title_or_contributor_data(cur):
+            checkpoints = load_checkpoints(cur)
+            if resume and checkpoints:
+                processed_rows = sum(rows for _, _, rows in checkpoints.values())
+                print(f"Resuming seed after {processed_rows} rows.")
+            elif has_existing_title_or_contributor_data(cur):
                 print(
                     "Data already exists in title or contributor table. "
                     "Skipping CSV insert.",
                 )
+                if checkpoints:
+                    print("An interrupted load left a checkpoint; rerun with --resume.")
                 return
+            else:
+                checkpoints = {}
+                clear_checkpoints(cur)
 
             movie_media_type_id = ensure_lookup(cur, "media_type_lkup", "movie")
-            title_ids_by_tconst: dict[str, int] = {}
 
-            for row in read_csv_rows(movies_csv):
+            for row in iter_checkpointed_rows(
+                conn,
+                "movies",
+                movies_csv,
+                "tconst",
+                batch_size,
+                checkpoints.get("movies"),
+            ):
                 processed_rows += 1
                 last_reported_percent = print_progress(
                     processed_rows,
@@ -300,6 +1456,7 @@ def main() -> None:
                     continue
 
                 release_year = parse_year(row.get("startYear"))
+                genres = parse_list(row.get("genres"))
                 title_id_before = None
                 if tconst:
                     cur.execute(
@@ -326,13 +1483,11 @@ def main() -> None:
                     title_name=title_name,
                     media_type_id=movie_media_type_id,
                     release_year=release_year,
+                    source_fingerprint=title_fingerprint(title_name, release_year, genres),
                 )
                 if title_id_before is None:
                     inserted_titles += 1
-                if tconst:
-                    title_ids_by_tconst[tconst] = title_id
 
-                genres = parse_list(row.get("genres"))
                 for genre_name in genres:
                     genre_id = ensure_lookup(cur, "genre_type_lkup", genre_name)
 
@@ -351,7 +1506,17 @@ def main() -> None:
                         )
                         title_genre_links += 1
 
-            for row in read_csv_rows(people_csv):
+            # Rebuilt from the table so resumed runs see titles committed earlier.
+            title_ids_by_tconst = fetch_title_ids_by_tconst(cur)
+
+            for row in iter_checkpointed_rows(
+                conn,
+                "people",
+                people_csv,
+                "nconst",
+                batch_size,
+                checkpoints.get("people"),
+            ):
                 processed_rows += 1
                 last_reported_percent = print_progress(
                     processed_rows,
@@ -375,16 +1540,25 @@ def main() -> None:
                         (person_name,),
                     )
                 existing = cur.fetchone()
+                roles = parse_list(row.get("primaryProfession"))
+                known_titles = parse_list(row.get("knownForTitles"))
                 contributor_id = (
                     existing[0]
                     if existing
-                    else ensure_contributor(cur, name=person_name, imdb_reference_id=nconst)
+                    else ensure_contributor(
+                        cur,
+                        name=person_name,
+                        imdb_reference_id=nconst,
+                        source_fingerprint=contributor_fingerprint(
+                            person_name,
+                            roles,
+                            known_titles,
+                        ),
+                    )
                 )
                 if not existing:
                     inserted_contributors += 1
 
-                roles = parse_list(row.get("primaryProfession"))
-                known_titles = parse_list(row.get("knownForTitles"))
                 for role_name in roles:
                     role_id = ensure_lookup(cur, "contributor_type_lkup", role_name)
                     for known_title in known_titles:
@@ -400,6 +1574,10 @@ def main() -> None:
                         if inserted:
                             contributor_title_links += 1
 
+            clear_checkpoints(cur)
+            refresh_search_token_stats(cur)
+            bump_dataset_version(cur)
+
     if total_rows > 0 and last_reported_percent < 100:
         print(f"Seeding progress: 100% ({total_rows}/{total_rows})")
 
@@ -409,5 +1587,96 @@ def main() -> None:
     print(f"Inserted contributor->title->type links: {contributor_title_links}")
 
 
+def load_catalog(args: argparse.Namespace, database_url: str, movies_csv: Path, people_csv: Path) -> None:
+    """Run the load selected by the command-line arguments."""
+    if args.swap:
+        with psycopg2.connect(database_url) as conn:
+            report = run_swap_load(
+                conn,
+                database_url,
+                movies_csv,
+                people_csv,
+                args.workers,
+                args.maintenance_work_mem,
+            )
+        conn.close()
+        print_delta_report(report)
+        return
+
+    if args.mode == "delta" or args.workers > 1:
+        with psycopg2.connect(database_url) as conn:
+            with conn.cursor() as cur:
+                if args.mode == "seed" and has_existing_title_or_contributor_data(cur):
+                    print(
+                        "Data already exists in title or contributor table. "
+                        "Skipping CSV insert.",
+                    )
+                    return
+            report = run_staged_load(
+                conn,
+                database_url,
+                movies_csv,
+                people_csv,
+                args.workers,
+            )
+            with conn.cursor() as cur:
+                refresh_search_token_stats(cur)
+                bump_dataset_version(cur)
+        conn.close()
+        print_delta_report(report)
+        return
+
+    run_seed_load(database_url, movies_csv, people_csv, args.batch_size, args.resume)
+
+
+def main() -> None:
+    """Load movies and people samples into normalized tables.
+
+    Seed mode commits every `--batch-size` rows with a checkpoint, so an
+    interrupted load can continue with `--resume`. With `--rebuild-indexes`,
+    secondary indexes are dropped and the count triggers disabled for the load;
+    afterwards the counts are recomputed once and the indexes rebuilt.
+    """
+    args = parse_args()
+    database_url = args.database_url.strip()
+    movies_csv = Path(args.movies_csv).expanduser().resolve()
+    people_csv = Path(args.people_csv).expanduser().resolve()
+
+    if not database_url:
+        raise RuntimeError(
+            "Database URL not provided. Set DATABASE_URL or pass --database-url.",
+        )
+
+    if not movies_csv.exists() or not people_csv.exists():
+        raise FileNotFoundError(
+            f"CSV files not found. movies={movies_csv} people={people_csv}",
+        )
+
+    if not args.rebuild_indexes:
+        load_catalog(args, database_url, movies_csv, people_csv)
+        return
+
+    timings: dict[str, float] = {}
+    with psycopg2.connect(database_url) as conn:
+        with timed_phase(timings, "drop indexes"):
+            dropped_indexes = drop_secondary_indexes(conn)
+        disable_count_triggers(conn)
+    conn.close()
+    try:
+        with timed_phase(timings, "load"):
+            load_catalog(args, database_url, movies_csv, people_csv)
+    finally:
+        with psycopg2.connect(database_url) as conn:
+            with timed_phase(timings, "refresh counts"):
+                enable_count_triggers(conn)
+            with timed_phase(timings, "create indexes"):
+                create_indexes(conn, dropped_indexes, args.maintenance_work_mem)
+            with timed_phase(timings, "analyze"):
+                analyze_catalog_tables(conn)
+        conn.close()
+        for phase, seconds in timings.items():
+            print(f"Phase {phase}: {seconds:.2f}s")
+
+
 if __name__ == "__main__":
     main()
@@ -1,12 +1,7 @@
 #!/usr/bin/env sh
 set -eu
 
-echo "Running Alembic migrations..."
-uv run alembic upgrade head
-
-# the insert_csv_to_postgres check if the title or contributor table is empty if so inserts data from csv
-echo "Seeding CSV data..."
-uv run python -u app/scripts/insert_csv_to_postgres.py --database-url "$DATABASE_URL"
-
+# Migrations, CSV seeding and the related-titles job run in a background thread
+# of the API process (see app/core/readiness.py); GET /ready reports progress.
 echo "Starting API server..."
 exec uv run uvicorn app.main:app --host 0.0.0.0 --port 8000
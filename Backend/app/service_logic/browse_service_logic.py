@@ -2,8 +2,26 @@
 
 from __future__ import annotations
 
+import csv
+import io
+import itertools
+import json
+from typing import Callable, Iterable, Iterator
+
+from app.core import config
 from app.core.exceptions import InvalidInputError
-from app.data_providers.browse_data_provider import fetch_browse_genres, fetch_browse_titles
+from app.data_providers.browse_data_provider import (
+    fetch_browse_facets,
+    fetch_browse_genres,
+    fetch_browse_titles,
+    fetch_fuzzy_browse_titles,
+    iter_browse_titles,
+)
+from app.data_providers.search_index import (
+    fetch_indexed_browse_facets,
+    fetch_indexed_browse_titles,
+)
+from app.service_logic.search_planner import plan_search
 
 
 def browse_titles(
@@ -12,17 +30,81 @@ def browse_titles(
     genre: int | None,
     offset: int,
     page_size: int,
+    facets: list[str] | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    genres: list[int] | None = None,
+    genre_mode: str = "any",
+    media_type: str | None = None,
+    contributor_id: int | None = None,
+    role: str | None = None,
+    sort: str = "title_asc",
+    match: str = "auto",
+    similarity_threshold: float | None = None,
 ) -> dict:
-    """Return paginated titles matching browse criteria."""
-    search_words = _tokenize_search_text(search_text)
-
-    title_rows = fetch_browse_titles(
-        search_words=search_words,
-        release_year=release_year,
-        genre_id=genre,
-        offset=offset,
-        page_size=page_size,
+    """Return paginated titles matching browse criteria, with optional facet counts.
+
+    With search words, `match` picks exact word matching, typo-tolerant fuzzy
+    matching, or (`auto`) exact with a fuzzy retry when the first page has fewer
+    than SEARCH_FUZZY_MIN_EXACT_HITS results. The mode used is returned as
+    `match_mode` so later pages can request it explicitly. Fuzzy pages are
+    ordered by similarity whatever `sort` is, and their facet counts are taken
+    over the fuzzy matches.
+    """
+    plan = plan_search(_tokenize_search_text(search_text), release_year, genre, genres, genre_mode)
+    search_words = plan.words
+    if sort == "relevance" and not search_words:
+        # Relevance is only defined against search text.
+        sort = "title_asc"
+    filters = {
+        "year_from": year_from,
+        "year_to": year_to,
+        "genre_ids": plan.genre_ids,
+        "genre_mode": plan.genre_mode,
+        "media_type": media_type,
+        "contributor_id": contributor_id,
+        "role": role,
+    }
+    # Pages and facet counts come from the same backend so they match titles alike.
+    if config.SEARCH_BACKEND == "memory":
+        fetch_titles, fetch_facets = fetch_indexed_browse_titles, fetch_indexed_browse_facets
+    else:
+        fetch_titles, fetch_facets = fetch_browse_titles, fetch_browse_facets
+
+    use_fuzzy = bool(search_words) and _fuzzy_search_available() and match != "exact"
+    threshold = (
+        similarity_threshold
+        if similarity_threshold is not None
+        else config.SEARCH_FUZZY_SIMILARITY_THRESHOLD
     )
+    match_mode = "exact"
+    title_rows: list[tuple] = []
+    if not use_fuzzy or match != "fuzzy":
+        title_rows = fetch_titles(
+            search_words=search_words,
+            release_year=plan.release_year,
+            genre_id=plan.genre_id,
+            offset=offset,
+            page_size=page_size,
+            sort=sort,
+            **filters,
+        )
+    if use_fuzzy and (
+        match == "fuzzy"
+        or (offset == 0 and len(title_rows) < config.SEARCH_FUZZY_MIN_EXACT_HITS)
+    ):
+        fuzzy_rows = fetch_fuzzy_browse_titles(
+            search_words=search_words,
+            release_year=plan.release_year,
+            genre_id=plan.genre_id,
+            offset=offset,
+            page_size=page_size,
+            similarity_threshold=threshold,
+            **filters,
+        )
+        # In auto mode the exact page is kept unless the fuzzy retry finds more.
+        if match == "fuzzy" or len(fuzzy_rows) > len(title_rows):
+            title_rows, match_mode = fuzzy_rows, "fuzzy"
 
     items = [
         {
@@ -35,11 +117,71 @@ def browse_titles(
         for row in title_rows
     ]
 
-    return {
+    response = {
         "offset": offset,
         "page_size": page_size,
         "results": items,
     }
+    if search_words:
+        response["match_mode"] = match_mode
+    if facets:
+        if match_mode == "fuzzy":
+            # Count the fuzzy matches the page came from (Postgres only, like the page).
+            filters["similarity_threshold"] = threshold
+            fetch_facets = fetch_browse_facets
+        response["facets"] = fetch_facets(
+            search_words=search_words,
+            release_year=plan.release_year,
+            genre_id=plan.genre_id,
+            facets=facets,
+            **filters,
+        )
+    return response
+
+
+def export_titles(
+    search_text: str | None,
+    release_year: int | None,
+    genre: int | None,
+    export_format: str,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    genres: list[int] | None = None,
+    genre_mode: str = "any",
+    media_type: str | None = None,
+    contributor_id: int | None = None,
+    role: str | None = None,
+) -> Iterator[str]:
+    """Return text chunks (one per fetched batch) of all titles matching browse criteria.
+
+    The first batch is fetched before returning, so query errors surface before a
+    response starts streaming. Closing the returned iterator releases the cursor.
+    """
+    plan = plan_search(_tokenize_search_text(search_text), release_year, genre, genres, genre_mode)
+    batches = iter_browse_titles(
+        search_words=plan.words,
+        release_year=plan.release_year,
+        genre_id=plan.genre_id,
+        batch_size=config.EXPORT_BATCH_SIZE,
+        year_from=year_from,
+        year_to=year_to,
+        genre_ids=plan.genre_ids,
+        genre_mode=plan.genre_mode,
+        media_type=media_type,
+        contributor_id=contributor_id,
+        role=role,
+    )
+    try:
+        first_batch = next(batches, [])
+    except BaseException:
+        batches.close()
+        raise
+
+    return _serialize_title_batches(
+        itertools.chain([first_batch], batches),
+        export_format,
+        close=batches.close,
+    )
 
 
 def browse_genres() -> list[dict]:
@@ -47,15 +189,48 @@ def browse_genres() -> list[dict]:
     return fetch_browse_genres()
 
 
+def _fuzzy_search_available() -> bool:
+    """Fuzzy matching needs pg_trgm, which the SQLite snapshot backend lacks."""
+    return config.DATA_BACKEND != "snapshot"
+
+
 def _tokenize_search_text(search_text: str | None) -> list[str]:
     """Split search text into words and validate token safety."""
     if search_text is None:
         return []
 
-    tokens = [token.strip() for token in search_text.split() if token.strip()][:3]
+    tokens = [token.strip() for token in search_text.split() if token.strip()]
     for token in tokens:
         if len(token) > 100:
             raise InvalidInputError("search_text")
         if "\x00" in token:
             raise InvalidInputError("search_text")
     return tokens
+
+
+def _serialize_title_batches(
+    batches: Iterable[list[tuple]],
+    export_format: str,
+    close: Callable[[], None],
+) -> Iterator[str]:
+    """Render title row batches as NDJSON lines or CSV (with a header row)."""
+    columns = ("id", "imdb_reference_id", "title", "release_year", "media_type")
+    try:
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            for batch in batches:
+                writer.writerows(batch)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        else:
+            for batch in batches:
+                if batch:
+                    yield "".join(
+                        json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n"
+                        for row in batch
+                    )
+    finally:
+        close()
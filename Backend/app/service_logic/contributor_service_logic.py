@@ -2,22 +2,49 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
 from collections import defaultdict
 
-from app.core.exceptions import ContributorNotFound
-from app.data_providers.contributor_data_provider import fetch_contributor_by_id
+from app.core import config
+from app.core.exceptions import ContributorNotFound, ContributorPathNotFound, InvalidInputError
+from app.data_providers.contributor_data_provider import (
+    fetch_contributor_by_id,
+    fetch_contributor_path,
+    fetch_contributor_search,
+)
 from app.data_providers.title_data_provider import fetch_titles_by_contributor_id
 
 
-def get_contributor_details(contributor_id: int) -> dict:
-    """Return contributor details with associated titles and roles."""
+CONTRIBUTOR_HEADER_FIELDS = ("imdb_reference_id", "name")
+CONTRIBUTOR_SECTIONS = ("titles",)
+
+
+def get_contributor_details(contributor_id: int, fields: set[str] | None = None) -> dict:
+    """Return contributor details with associated titles and roles.
+
+    `fields` limits the response to those top-level fields (None for all); the
+    filmography query only runs when `titles` is requested.
+    """
     contributor_row = fetch_contributor_by_id(contributor_id)
 
     if not contributor_row:
         raise ContributorNotFound(contributor_id)
 
-    title_rows = fetch_titles_by_contributor_id(contributor_id)
+    details = {
+        "id": contributor_row[0],
+        "imdb_reference_id": contributor_row[1],
+        "name": contributor_row[2],
+    }
+    if fields is None or "titles" in fields:
+        details["titles"] = _group_title_roles(fetch_titles_by_contributor_id(contributor_id))
+    if fields is None:
+        return details
+    return {name: value for name, value in details.items() if name in fields}
+
 
+def _group_title_roles(title_rows: list[tuple]) -> list[dict]:
+    """Collapse (title, role) rows into one entry per title with its roles."""
     titles_map: dict[int, dict] = defaultdict(
         lambda: {
             "id": 0,
@@ -39,9 +66,87 @@ def get_contributor_details(contributor_id: int) -> dict:
         if role_name not in title["roles"]:
             title["roles"].append(role_name)
 
+    return list(titles_map.values())
+
+
+def search_contributors(query: str, page_size: int, cursor: str | None = None) -> dict:
+    """Return contributors whose name resembles `query`, best match first.
+
+    Pages are keyset-paginated: pass the returned `next_cursor` to continue;
+    it is None on the last page.
+    """
+    rows = fetch_contributor_search(
+        query,
+        page_size=page_size + 1,
+        similarity_threshold=config.SEARCH_FUZZY_SIMILARITY_THRESHOLD,
+        after=_decode_search_cursor(cursor) if cursor is not None else None,
+    )
+    page = rows[:page_size]
+    next_cursor = None
+    if len(rows) > page_size:
+        last_id, _, _, last_title_count, last_score = page[-1]
+        next_cursor = _encode_search_cursor(last_score, last_title_count, last_id)
+
     return {
-        "id": contributor_row[0],
-        "imdb_reference_id": contributor_row[1],
-        "name": contributor_row[2],
-        "titles": list(titles_map.values()),
+        "q": query,
+        "page_size": page_size,
+        "results": [
+            {
+                "id": contributor_id,
+                "imdb_reference_id": imdb_ref_id,
+                "name": name,
+                "title_count": title_count,
+                "score": score,
+            }
+            for contributor_id, imdb_ref_id, name, title_count, score in page
+        ],
+        "next_cursor": next_cursor,
+    }
+
+
+def _encode_search_cursor(score: float, title_count: int, contributor_id: int) -> str:
+    """Encode the sort key of a page's last row as an opaque URL-safe cursor."""
+    key = f"{score!r}:{title_count}:{contributor_id}".encode()
+    return base64.urlsafe_b64encode(key).decode().rstrip("=")
+
+
+def _decode_search_cursor(cursor: str) -> tuple[float, int, int]:
+    """Decode a cursor from `_encode_search_cursor` into (score, title_count, id)."""
+    try:
+        key = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        score, title_count, contributor_id = key.split(":")
+        return float(score), int(title_count), int(contributor_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidInputError("cursor") from exc
+
+
+def get_contributor_path(
+    contributor_id: int,
+    other_contributor_id: int,
+    max_degrees: int | None,
+) -> dict:
+    """Return the shortest chain of titles and contributors linking two contributors."""
+    for requested_id in (contributor_id, other_contributor_id):
+        if not fetch_contributor_by_id(requested_id):
+            raise ContributorNotFound(requested_id)
+
+    path_rows = fetch_contributor_path(
+        contributor_id,
+        other_contributor_id,
+        max_degrees=max_degrees or config.CONTRIBUTOR_PATH_MAX_DEGREES,
+        max_visited=config.CONTRIBUTOR_PATH_MAX_VISITED,
+        time_budget_seconds=config.CONTRIBUTOR_PATH_TIME_BUDGET_MS / 1000,
+    )
+    if not path_rows:
+        raise ContributorPathNotFound(contributor_id, other_contributor_id)
+
+    path = [
+        {"type": node_type, "id": node_id, "imdb_reference_id": imdb_ref_id, "name": name}
+        for node_type, node_id, imdb_ref_id, name in path_rows
+    ]
+    return {
+        "contributor_id": contributor_id,
+        "other_contributor_id": other_contributor_id,
+        "degrees": sum(1 for step in path if step["type"] == "title"),
+        "path": path,
     }
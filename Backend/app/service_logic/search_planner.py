@@ -0,0 +1,123 @@
+"""Selectivity-aware planning of browse search words.
+
+Every search word must match, so the rarest word bounds the result. Using the
+per-token title counts in `search_token_stats` (refreshed by the CSV loader),
+words are ordered rarest first and stopword-like words that match a large
+share of the catalog are dropped, so query cost follows the rarest word rather
+than the number of words.
+
+Words that name a genre or a release year stay search words: each word matches
+a title, contributor, genre or year, so "2001 a space odyssey" still finds the
+1968 film. The providers serve the genre and year alternatives through indexes
+(see browse_data_provider.YEAR_WORD_PATTERN).
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+
+from app.core import config
+from app.data_providers.browse_data_provider import fetch_search_token_counts
+
+TOKEN_PATTERN = re.compile(r"\w+")
+# search_token_stats row holding the total title count.
+TOTAL_TOKEN = ""
+# Words shorter than this that are not a whole token match as substrings of many
+# tokens, so they are treated as unselective; longer ones as rare.
+MIN_SELECTIVE_WORD_LENGTH = 3
+
+_token_counts: dict[str, int | None] = {}
+_token_counts_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class SearchPlan:
+    """Planned search words plus the request's genre/year filters."""
+
+    words: list[str]
+    release_year: int | None
+    genre_id: int | None
+    genre_ids: list[int] | None
+    genre_mode: str
+
+
+def plan_search(
+    search_words: list[str],
+    release_year: int | None,
+    genre_id: int | None,
+    genre_ids: list[int] | None,
+    genre_mode: str,
+) -> SearchPlan:
+    """Plan the search words; the explicit filters pass through unchanged.
+
+    Year and genre-name words are not turned into filters, which would drop
+    titles that merely contain them (e.g. "2001 a space odyssey").
+    """
+    return SearchPlan(
+        words=plan_search_words(search_words),
+        release_year=release_year,
+        genre_id=genre_id,
+        genre_ids=genre_ids,
+        genre_mode=genre_mode,
+    )
+
+
+def plan_search_words(search_words: list[str]) -> list[str]:
+    """Return the words to search for, de-duplicated and ordered most selective first.
+
+    Words matching more than SEARCH_STOPWORD_FRACTION of all titles are dropped,
+    unless every word does, in which case the most selective one is kept.
+    Without statistics the de-duplicated words keep their original order.
+    """
+    words = list(dict.fromkeys(word.casefold() for word in search_words))
+    if len(words) <= 1:
+        return words
+
+    counts = _lookup_token_counts(
+        [TOTAL_TOKEN, *{token for word in words for token in TOKEN_PATTERN.findall(word)}]
+    )
+    total = counts.get(TOTAL_TOKEN)
+    if not total:
+        return words
+
+    estimates = {word: _estimate_title_count(word, counts, total) for word in words}
+    ordered = sorted(words, key=lambda word: estimates[word])
+    cutoff = total * config.SEARCH_STOPWORD_FRACTION
+    selective = [word for word in ordered if estimates[word] <= cutoff]
+    return selective or ordered[:1]
+
+
+def clear_search_planner_cache() -> None:
+    """Forget cached token counts (dataset-change hook)."""
+    with _token_counts_lock:
+        _token_counts.clear()
+
+
+def _estimate_title_count(word: str, counts: dict[str, int | None], total: int) -> int:
+    """Estimate how many titles a word matches: at most its rarest token's count."""
+    estimates = []
+    for token in TOKEN_PATTERN.findall(word):
+        count = counts.get(token)
+        if count is None:
+            count = total if len(token) < MIN_SELECTIVE_WORD_LENGTH else 0
+        estimates.append(count)
+    return min(estimates, default=total)
+
+
+def _lookup_token_counts(tokens: list[str]) -> dict[str, int | None]:
+    """Return title counts for tokens (None when unknown), caching lookups per process."""
+    with _token_counts_lock:
+        counts = {token: _token_counts[token] for token in tokens if token in _token_counts}
+    missing = [token for token in tokens if token not in counts]
+    if not missing:
+        return counts
+
+    fetched = fetch_search_token_counts(missing)
+    with _token_counts_lock:
+        if len(_token_counts) + len(missing) > config.SEARCH_TOKEN_STATS_CACHE_SIZE:
+            _token_counts.clear()
+        for token in missing:
+            counts[token] = _token_counts[token] = fetched.get(token)
+    return counts
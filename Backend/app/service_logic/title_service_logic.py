@@ -6,23 +6,52 @@ from collections import defaultdict
 
 from app.core.exceptions import TitleNotFound
 from app.data_providers.contributor_data_provider import fetch_contributors_by_title_id
-from app.data_providers.title_data_provider import fetch_genres_by_title_id, fetch_title_by_id
+from app.data_providers.title_data_provider import (
+    fetch_genres_by_title_id,
+    fetch_related_titles,
+    fetch_title_by_id,
+)
 
 
-def get_title_details(title_id: int) -> dict:
-    """Return title details with contributors and their roles."""
+TITLE_HEADER_FIELDS = ("imdb_reference_id", "title", "release_year", "media_type")
+TITLE_SECTIONS = ("genres", "contributors")
+
+
+def get_title_details(title_id: int, fields: set[str] | None = None) -> dict:
+    """Return title details with contributors and their roles.
+
+    `fields` limits the response to those top-level fields (None for all); the
+    genre and contributor queries only run when their section is requested.
+    """
     title_row = fetch_title_by_id(title_id)
 
     if not title_row:
         raise TitleNotFound(title_id)
 
-    genre_names = fetch_genres_by_title_id(title_id)
-    contributor_rows = fetch_contributors_by_title_id(title_id)
+    details = {
+        "id": title_row[0],
+        "imdb_reference_id": title_row[1],
+        "title": title_row[2],
+        "release_year": title_row[3],
+        "media_type": title_row[4],
+    }
+    if fields is None or "genres" in fields:
+        details["genres"] = fetch_genres_by_title_id(title_id)
+    if fields is None or "contributors" in fields:
+        details["contributors"] = _group_contributor_roles(
+            fetch_contributors_by_title_id(title_id)
+        )
+    if fields is None:
+        return details
+    return {name: value for name, value in details.items() if name in fields}
 
+
+def _group_contributor_roles(contributor_rows: list[tuple]) -> list[dict]:
+    """Collapse (contributor, role) rows into one entry per contributor with its roles."""
     contributors_map: dict[int, dict] = defaultdict(
         lambda: {"id": 0, "imdb_reference_id": None, "name": "", "roles": []}
     )
-    
+
     for contributor_id, contributor_imdb_ref_id, contributor_name, role_name in contributor_rows:
         contributor = contributors_map[contributor_id]
         contributor["id"] = contributor_id
@@ -31,12 +60,27 @@ def get_title_details(title_id: int) -> dict:
         if role_name not in contributor["roles"]:
             contributor["roles"].append(role_name)
 
+    return list(contributors_map.values())
+
+
+def get_related_titles(title_id: int, limit: int) -> dict:
+    """Return precomputed related titles for a title, most similar first."""
+    if not fetch_title_by_id(title_id):
+        raise TitleNotFound(title_id)
+
+    related_rows = fetch_related_titles(title_id, limit)
+
     return {
-        "id": title_row[0],
-        "imdb_reference_id": title_row[1],
-        "title": title_row[2],
-        "release_year": title_row[3],
-        "media_type": title_row[4],
-        "genres": genre_names,
-        "contributors": list(contributors_map.values()),
+        "title_id": title_id,
+        "results": [
+            {
+                "id": related_id,
+                "imdb_reference_id": imdb_ref_id,
+                "title": title,
+                "release_year": release_year,
+                "media_type": media_type,
+                "score": score,
+            }
+            for related_id, imdb_ref_id, title, release_year, media_type, score in related_rows
+        ],
     }
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime, UTC
 
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
@@ -39,6 +40,17 @@ def test_browse_titles_with_valid_defaults(monkeypatch) -> None:
         "genre": None,
         "offset": 0,
         "page_size": 10,
+        "facets": None,
+        "year_from": None,
+        "year_to": None,
+        "genres": None,
+        "genre_mode": "any",
+        "media_type": None,
+        "contributor_id": None,
+        "role": None,
+        "sort": "title_asc",
+        "match": "auto",
+        "similarity_threshold": None,
     }
 
 
@@ -59,6 +71,26 @@ def test_browse_titles_normalizes_blank_search_text(monkeypatch) -> None:
     assert captured["search_text"] is None
 
 
+@pytest.mark.parametrize(
+    ("params", "field_name"),
+    [
+        ({"match": "sloppy"}, "match"),
+        ({"similarity_threshold": "0"}, "similarity_threshold"),
+        ({"similarity_threshold": "1.5"}, "similarity_threshold"),
+        ({"similarity_threshold": "high"}, "similarity_threshold"),
+        ({"match": "fuzzy", "sort": "title_asc"}, "sort"),
+    ],
+)
+def test_browse_titles_rejects_invalid_match_options(params, field_name) -> None:
+    """Unknown match modes, out-of-range thresholds and fuzzy non-relevance sorts are invalid."""
+    client = _build_client()
+
+    response = client.get("/browse", params=params)
+
+    assert response.status_code == 400
+    assert response.json()["message"] == f"Invalid input: {field_name} is invalid"
+
+
 def test_browse_titles_rejects_negative_offset() -> None:
     """Negative offset should return invalid input error."""
     client = _build_client()
@@ -158,3 +190,164 @@ def test_browse_genres_returns_service_payload(monkeypatch) -> None:
 
     assert response.status_code == 200
     assert response.json() == expected
+
+
+def test_browse_titles_parses_facets_and_returns_them(monkeypatch) -> None:
+    """Facet names should be parsed, de-duplicated and returned with the page."""
+    captured: dict = {}
+    facets = {"genre": [{"id": 1, "name": "Action", "count": 3}]}
+
+    def fake_browse_titles_service(**kwargs):
+        captured.update(kwargs)
+        return {"offset": 0, "page_size": 10, "results": [], "facets": facets}
+
+    monkeypatch.setattr(browse_controller, "browse_titles_service", fake_browse_titles_service)
+    client = _build_client()
+
+    response = client.get("/browse", params={"facets": "genre, genre"})
+
+    assert response.status_code == 200
+    assert captured["facets"] == ["genre"]
+    assert response.json()["facets"] == facets
+
+
+def test_browse_titles_rejects_unknown_facet() -> None:
+    """Unknown facet names should return invalid input error."""
+    client = _build_client()
+
+    response = client.get("/browse", params={"facets": "genre,rating"})
+
+    assert response.status_code == 400
+    assert response.json()["message"] == "Invalid input: facets is invalid"
+
+
+def test_browse_titles_parses_structured_filters(monkeypatch) -> None:
+    """Range, multi-genre, media type and contributor filters should be parsed."""
+    captured: dict = {}
+
+    def fake_browse_titles_service(**kwargs):
+        captured.update(kwargs)
+        return {"offset": 0, "page_size": 10, "results": []}
+
+    monkeypatch.setattr(browse_controller, "browse_titles_service", fake_browse_titles_service)
+    client = _build_client()
+
+    response = client.get(
+        "/browse",
+        params={
+            "year_from": "1990",
+            "year_to": "1999",
+            "genres": "3,1,3",
+            "genre_mode": "ALL",
+            "media_type": " Movie ",
+            "contributor_id": "7",
+            "role": "director",
+        },
+    )
+
+    assert response.status_code == 200
+    assert {key: captured[key] for key in ("year_from", "year_to", "genres", "genre_mode")} == {
+        "year_from": 1990,
+        "year_to": 1999,
+        "genres": [3, 1],
+        "genre_mode": "all",
+    }
+    assert (captured["media_type"], captured["contributor_id"], captured["role"]) == (
+        "movie",
+        7,
+        "director",
+    )
+
+
+@pytest.mark.parametrize(
+    ("params", "field"),
+    [
+        ({"year_from": "2000", "year_to": "1990"}, "year_to"),
+        ({"genres": "1,x"}, "genres"),
+        ({"genres": "0"}, "genres"),
+        ({"genre_mode": "some"}, "genre_mode"),
+        ({"contributor_id": "-7"}, "contributor_id"),
+        ({"role": "director"}, "role"),
+    ],
+)
+def test_browse_titles_rejects_invalid_structured_filters(params: dict, field: str) -> None:
+    """Invalid structured filters should return invalid input error for that field."""
+    client = _build_client()
+
+    response = client.get("/browse", params=params)
+
+    assert response.status_code == 400
+    assert response.json()["message"] == f"Invalid input: {field} is invalid"
+
+
+def test_browse_titles_rejects_unknown_sort() -> None:
+    """Unknown sort names should return invalid input error."""
+    client = _build_client()
+
+    response = client.get("/browse", params={"sort": "rating_desc"})
+
+    assert response.status_code == 400
+    assert response.json()["message"] == "Invalid input: sort is invalid"
+
+
+def test_export_titles_streams_service_chunks_and_closes_them(monkeypatch) -> None:
+    """Export should stream service chunks with the format's media type."""
+    captured: dict = {}
+    closed: list[bool] = []
+
+    def chunks():
+        try:
+            yield "id,title\r\n"
+            yield "10,The Matrix\r\n"
+        finally:
+            closed.append(True)
+
+    def fake_export_titles_service(**kwargs):
+        captured.update(kwargs)
+        return chunks()
+
+    monkeypatch.setattr(browse_controller, "export_titles_service", fake_export_titles_service)
+    client = _build_client()
+
+    response = client.get("/browse/export", params={"format": "csv", "genres": "1,2"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text == "id,title\r\n10,The Matrix\r\n"
+    assert captured["export_format"] == "csv"
+    assert captured["genres"] == [1, 2]
+    assert closed == [True]
+
+
+def test_export_titles_rejects_unknown_format() -> None:
+    """Unknown export formats should return invalid input error."""
+    client = _build_client()
+
+    response = client.get("/browse/export", params={"format": "xml"})
+
+    assert response.status_code == 400
+    assert response.json()["message"] == "Invalid input: format is invalid"
+
+
+def test_search_contributors_validates_and_passes_query(monkeypatch) -> None:
+    """Contributor search should trim the query, default paging and require `q`."""
+    captured: dict = {}
+
+    def fake_search_contributors_service(query, page_size, cursor):
+        captured.update({"query": query, "page_size": page_size, "cursor": cursor})
+        return {"q": query, "page_size": page_size, "results": [], "next_cursor": None}
+
+    monkeypatch.setattr(
+        browse_controller, "search_contributors_service", fake_search_contributors_service
+    )
+    client = _build_client()
+
+    response = client.get("/browse/contributors", params={"q": "  keanu "})
+    missing = client.get("/browse/contributors", params={"q": "  "})
+    too_large = client.get("/browse/contributors", params={"q": "keanu", "page_size": "51"})
+
+    assert response.status_code == 200
+    assert captured == {"query": "keanu", "page_size": 10, "cursor": None}
+    assert missing.status_code == 400
+    assert missing.json()["message"] == "Invalid input: q is invalid"
+    assert too_large.status_code == 400
@@ -26,7 +26,7 @@ def test_get_contributor_details_returns_service_payload(monkeypatch) -> None:
         "titles": [],
     }
 
-    def fake_get_contributor_details_service(contributor_id: int):
+    def fake_get_contributor_details_service(contributor_id: int, fields=None):
         assert contributor_id == 7
         return expected
 
@@ -60,7 +60,7 @@ def test_get_contributor_details_rejects_invalid_contributor_id() -> None:
 def test_get_contributor_details_handles_contributor_not_found(monkeypatch) -> None:
     """Service not-found exception should map to 404 response."""
 
-    def fake_get_contributor_details_service(contributor_id: int):
+    def fake_get_contributor_details_service(contributor_id: int, fields=None):
         raise ContributorNotFound(contributor_id)
 
     monkeypatch.setattr(
@@ -78,3 +78,38 @@ def test_get_contributor_details_handles_contributor_not_found(monkeypatch) -> N
         "error_code": 1002,
         "status_code": 404,
     }
+
+
+def test_get_contributor_path_passes_parsed_max_degrees(monkeypatch) -> None:
+    """Path route should parse max_degrees and pass both ids to the service."""
+    captured: dict = {}
+
+    def fake_get_contributor_path_service(contributor_id, other_contributor_id, max_degrees):
+        captured.update(
+            contributor_id=contributor_id,
+            other_contributor_id=other_contributor_id,
+            max_degrees=max_degrees,
+        )
+        return {"contributor_id": 9, "other_contributor_id": 8, "degrees": 0, "path": []}
+
+    monkeypatch.setattr(
+        contributor_controller,
+        "get_contributor_path_service",
+        fake_get_contributor_path_service,
+    )
+    client = _build_client()
+
+    response = client.get("/contributor/9/path/8", params={"max_degrees": "3"})
+
+    assert response.status_code == 200
+    assert captured == {"contributor_id": 9, "other_contributor_id": 8, "max_degrees": 3}
+
+
+def test_get_contributor_path_rejects_invalid_max_degrees() -> None:
+    """Out-of-range max_degrees should return invalid input error."""
+    client = _build_client()
+
+    response = client.get("/contributor/9/path/8", params={"max_degrees": "100"})
+
+    assert response.status_code == 400
+    assert response.json()["message"] == "Invalid input: max_degrees is invalid"
@@ -29,7 +29,7 @@ def test_get_title_details_returns_service_payload(monkeypatch) -> None:
         "contributors": [],
     }
 
-    def fake_get_title_details_service(title_id: int):
+    def fake_get_title_details_service(title_id: int, fields=None):
         assert title_id == 10
         return expected
 
@@ -46,6 +46,37 @@ def test_get_title_details_returns_service_payload(monkeypatch) -> None:
     assert response.json() == expected
 
 
+def test_get_title_details_passes_sparse_fields_and_omits_missing_sections(monkeypatch) -> None:
+    """`fields`/`include` should reach the service and omitted fields stay absent."""
+    captured: list = []
+
+    def fake_get_title_details_service(title_id: int, fields=None):
+        captured.append(fields)
+        return {"id": title_id, "title": "The Matrix", "imdb_reference_id": None}
+
+    monkeypatch.setattr(
+        title_controller,
+        "get_title_details_service",
+        fake_get_title_details_service,
+    )
+    client = _build_client()
+
+    response = client.get("/title/10", params={"fields": "title,imdb_reference_id"})
+    client.get("/title/10", params={"include": "none"})
+    client.get("/title/10", params={"include": "genres"})
+    invalid = client.get("/title/10", params={"include": "reviews"})
+
+    assert response.status_code == 200
+    assert response.json() == {"id": 10, "title": "The Matrix", "imdb_reference_id": None}
+    assert captured == [
+        {"id", "title", "imdb_reference_id"},
+        {"id", "imdb_reference_id", "title", "release_year", "media_type"},
+        {"id", "imdb_reference_id", "title", "release_year", "media_type", "genres"},
+    ]
+    assert invalid.status_code == 400
+    assert invalid.json()["message"] == "Invalid input: include is invalid"
+
+
 def test_get_title_details_rejects_invalid_title_id() -> None:
     """Non-positive title id should return invalid input error."""
     client = _build_client()
@@ -63,7 +94,7 @@ def test_get_title_details_rejects_invalid_title_id() -> None:
 def test_get_title_details_handles_title_not_found(monkeypatch) -> None:
     """Service not-found exception should map to 404 response."""
 
-    def fake_get_title_details_service(title_id: int):
+    def fake_get_title_details_service(title_id: int, fields=None):
         raise TitleNotFound(title_id)
 
     monkeypatch.setattr(
@@ -81,3 +112,36 @@ def test_get_title_details_handles_title_not_found(monkeypatch) -> None:
         "error_code": 1001,
         "status_code": 404,
     }
+
+
+def test_get_related_titles_uses_default_limit(monkeypatch) -> None:
+    """Missing limit should fall back to the configured default."""
+    captured = {}
+
+    def fake_get_related_titles_service(title_id: int, limit: int):
+        captured.update(title_id=title_id, limit=limit)
+        return {"title_id": title_id, "results": []}
+
+    monkeypatch.setattr(
+        title_controller,
+        "get_related_titles_service",
+        fake_get_related_titles_service,
+    )
+    client = _build_client()
+
+    response = client.get("/title/10/related")
+
+    assert response.status_code == 200
+    assert response.json() == {"title_id": 10, "results": []}
+    assert captured == {"title_id": 10, "limit": title_controller.config.RELATED_TITLES_DEFAULT_LIMIT}
+
+
+def test_get_related_titles_rejects_invalid_limit() -> None:
+    """Non-numeric or out-of-range limit should return invalid input error."""
+    client = _build_client()
+
+    for limit in ("abc", "0", "1000"):
+        response = client.get(f"/title/10/related?limit={limit}")
+
+        assert response.status_code == 400
+        assert response.json()["message"] == "Invalid input: limit is invalid"
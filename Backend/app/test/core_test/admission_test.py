@@ -0,0 +1,121 @@
+"""Core tests for admission control."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.controllers import title_controller
+from app.core import admission
+from app.core.exceptions import ServiceOverloadedError
+from app.core.handler import register_error_handlers
+
+
+def _wait_for_queue(controller: admission.AdmissionController, length: int) -> None:
+    deadline = time.monotonic() + 2
+    while controller.snapshot()["queued"] < length:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def _acquire_in_thread(controller, priority, results, name) -> threading.Thread:
+    def run() -> None:
+        try:
+            controller.acquire(priority)
+            results.append(name)
+        except ServiceOverloadedError:
+            results.append(f"{name}:rejected")
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_acquire_admits_up_to_capacity_then_rejects_without_queue() -> None:
+    """Requests beyond capacity with no queue room should be shed with Retry-After."""
+    controller = admission.AdmissionController(capacity=2, max_queue=0, max_wait_seconds=1)
+    controller.acquire(admission.PRIORITY_SEARCH)
+    controller.acquire(admission.PRIORITY_SEARCH)
+
+    with pytest.raises(ServiceOverloadedError) as exc_info:
+        controller.acquire(admission.PRIORITY_SEARCH)
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "1"}
+    assert controller.snapshot()["by_priority"]["search"] == {
+        "admitted": 2,
+        "queued": 0,
+        "rejected": 1,
+    }
+
+
+def test_waiting_requests_are_admitted_in_priority_order() -> None:
+    """A freed slot should go to the detail lookup before an earlier queued search."""
+    controller = admission.AdmissionController(capacity=1, max_queue=5, max_wait_seconds=2)
+    controller.acquire(admission.PRIORITY_SEARCH)
+    results: list[str] = []
+
+    search = _acquire_in_thread(controller, admission.PRIORITY_SEARCH, results, "search")
+    _wait_for_queue(controller, 1)
+    detail = _acquire_in_thread(controller, admission.PRIORITY_DETAIL, results, "detail")
+    _wait_for_queue(controller, 2)
+
+    controller.release()
+    detail.join(1)
+    assert results == ["detail"]
+    controller.release()
+    search.join(1)
+    assert results == ["detail", "search"]
+
+
+def test_full_queue_sheds_lowest_priority_waiter() -> None:
+    """A detail lookup arriving at a full queue should displace a queued export."""
+    controller = admission.AdmissionController(capacity=1, max_queue=1, max_wait_seconds=2)
+    controller.acquire(admission.PRIORITY_SEARCH)
+    results: list[str] = []
+
+    export = _acquire_in_thread(controller, admission.PRIORITY_EXPORT, results, "export")
+    _wait_for_queue(controller, 1)
+    detail = _acquire_in_thread(controller, admission.PRIORITY_DETAIL, results, "detail")
+    export.join(1)
+    assert results == ["export:rejected"]
+
+    controller.release()
+    detail.join(1)
+    assert results == ["export:rejected", "detail"]
+
+
+def test_wait_expiry_rejects_queued_request() -> None:
+    """A queued request should be shed once its wait budget runs out."""
+    controller = admission.AdmissionController(capacity=1, max_queue=1, max_wait_seconds=0.05)
+    controller.acquire(admission.PRIORITY_DETAIL)
+
+    with pytest.raises(ServiceOverloadedError):
+        controller.acquire(admission.PRIORITY_DETAIL)
+
+    assert controller.snapshot()["queued"] == 0
+
+
+def test_overloaded_request_returns_503_with_retry_after(monkeypatch) -> None:
+    """Shed requests should map to 503 with the Retry-After header."""
+    captured: list[int] = []
+
+    def fake_get_title_details(_title_id: int, fields=None) -> dict:
+        captured.append(admission._request_priority.get())
+        raise ServiceOverloadedError(3)
+
+    monkeypatch.setattr(title_controller, "get_title_details_service", fake_get_title_details)
+
+    app = FastAPI()
+    register_error_handlers(app)
+    app.include_router(title_controller.router)
+    response = TestClient(app).get("/title/1")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+    assert response.json()["error_code"] == 506
+    assert captured == [admission.PRIORITY_DETAIL]
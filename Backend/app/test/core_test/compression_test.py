@@ -0,0 +1,130 @@
+"""Core tests for negotiated response compression."""
+
+from __future__ import annotations
+
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+
+LARGE_PAYLOAD = {"results": [{"id": index, "title": "The Matrix"} for index in range(200)]}
+
+
+def _build_client(thread_offload_size: int = 65536) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(
+        compression.CompressionMiddleware,
+        minimum_size=500,
+        cache_entries=8,
+        thread_offload_size=thread_offload_size,
+    )
+
+    @app.get("/large")
+    def large() -> dict:
+        return LARGE_PAYLOAD
+
+    @app.get("/small")
+    def small() -> dict:
+        return {"status": "ok"}
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(iter([b"x" * 1000, b"y" * 1000]), media_type="text/plain")
+
+    @app.get("/binary")
+    def binary() -> PlainTextResponse:
+        return PlainTextResponse("z" * 1000, media_type="application/octet-stream")
+
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    compression.reset_compression_metrics()
+    yield
+    compression.reset_compression_metrics()
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("identity", None),
+        ("*", compression.ENCODING_PREFERENCE[0]),
+        ("deflate, gzip;q=0.5", "gzip"),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding: str, expected: str | None) -> None:
+    """Picks the highest-weighted supported encoding and honours q=0."""
+    assert compression.negotiate_encoding(accept_encoding) == expected
+
+
+def test_large_json_is_gzipped_and_cached() -> None:
+    """Large JSON bodies are compressed once and served from the cache afterwards."""
+    client = _build_client()
+
+    first = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["vary"]
+    assert first.json() == LARGE_PAYLOAD
+    assert second.json() == LARGE_PAYLOAD
+    counters = compression.compression_metrics()["gzip"]
+    assert counters["responses"] == 2
+    assert counters["cache_hits"] == 1
+    assert counters["bytes_saved"] == counters["bytes_in"] - counters["bytes_out"] > 0
+
+
+def test_small_streaming_and_binary_responses_are_not_compressed() -> None:
+    """Bodies under the threshold, streams and non-text types pass through."""
+    client = _build_client()
+
+    for path in ("/small", "/stream", "/binary"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers, path
+
+    assert client.get("/stream", headers={"Accept-Encoding": "gzip"}).content == (
+        b"x" * 1000 + b"y" * 1000
+    )
+    assert compression.compression_metrics() == {}
+
+
+def test_gzip_body_decodes_to_raw_json() -> None:
+    """The compressed bytes on the wire are valid gzip of the raw body."""
+    client = _build_client()
+    raw = client.get("/large").content
+
+    with client.stream("GET", "/large", headers={"Accept-Encoding": "gzip"}) as response:
+        wire = b"".join(response.iter_raw())
+
+    assert gzip.decompress(wire) == raw
+
+
+@pytest.mark.parametrize(("offload_size", "expected_offloads"), [(500, 1), (10**9, 0)])
+def test_bodies_over_offload_size_are_compressed_in_a_worker_thread(
+    monkeypatch, offload_size: int, expected_offloads: int
+) -> None:
+    """Bodies at or above the offload size are compressed off the event loop."""
+    offloaded = []
+    run_sync = compression.anyio.to_thread.run_sync
+
+    async def tracking_run_sync(func, *args, **kwargs):
+        if getattr(func, "__name__", "") == "_compress":
+            offloaded.append(args)
+        return await run_sync(func, *args, **kwargs)
+
+    monkeypatch.setattr(compression.anyio.to_thread, "run_sync", tracking_run_sync)
+    client = _build_client(thread_offload_size=offload_size)
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == LARGE_PAYLOAD
+    assert len(offloaded) == expected_offloads
@@ -0,0 +1,143 @@
+"""Core tests for database connection routing."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core import admission, config, db
+
+
+class FakeConnection:
+    """Minimal stand-in for a psycopg2 connection."""
+
+    closed = 0
+
+
+class FakePool:
+    """Minimal stand-in for a psycopg2 connection pool."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.returned: list[FakeConnection] = []
+
+    def getconn(self) -> FakeConnection:
+        conn = FakeConnection()
+        conn.pool_name = self.name
+        return conn
+
+    def putconn(self, conn, close: bool = False) -> None:
+        self.returned.append(conn)
+
+
+def _healthy_replica(name: str) -> db.ReplicaPool:
+    replica = db.ReplicaPool(dsn=name)
+    replica.pool = FakePool(name)
+    replica.healthy = True
+    replica.last_checked_at = float("inf")
+    return replica
+
+
+@pytest.fixture(autouse=True)
+def _reset_pools(monkeypatch):
+    monkeypatch.setattr(db, "connection_pool", FakePool("primary"))
+    monkeypatch.setattr(db, "replica_pools", [])
+    monkeypatch.setattr(db, "_round_robin_position", 0)
+    monkeypatch.setattr(
+        admission,
+        "_controller",
+        admission.AdmissionController(capacity=10, max_queue=0, max_wait_seconds=0),
+    )
+    db._replica_checkouts.clear()
+    db._admitted_checkouts.clear()
+    yield
+    db._replica_checkouts.clear()
+    db._admitted_checkouts.clear()
+
+
+def test_get_read_connection_uses_primary_without_replicas() -> None:
+    """Reads should go to the primary when no replica is configured."""
+    conn = db.get_read_connection()
+
+    assert conn.pool_name == "primary"
+    db.release_db_connection(conn)
+    assert db.connection_pool.returned == [conn]
+
+
+def test_get_read_connection_round_robins_replicas(monkeypatch) -> None:
+    """Round robin routing should alternate between healthy replicas."""
+    monkeypatch.setattr(config, "REPLICA_ROUTING", "round_robin")
+    monkeypatch.setattr(db, "replica_pools", [_healthy_replica("r1"), _healthy_replica("r2")])
+
+    names = []
+    for _ in range(4):
+        conn = db.get_read_connection()
+        names.append(conn.pool_name)
+        db.release_db_connection(conn)
+
+    assert names == ["r1", "r2", "r1", "r2"]
+
+
+def test_get_read_connection_prefers_least_outstanding_replica(monkeypatch) -> None:
+    """Least-outstanding routing should pick the replica with fewer checkouts."""
+    monkeypatch.setattr(config, "REPLICA_ROUTING", "least_outstanding")
+    first, second = _healthy_replica("r1"), _healthy_replica("r2")
+    monkeypatch.setattr(db, "replica_pools", [first, second])
+
+    held = db.get_read_connection()
+    conn = db.get_read_connection()
+
+    assert (held.pool_name, conn.pool_name) == ("r1", "r2")
+    db.release_db_connection(held)
+    db.release_db_connection(conn)
+    assert first.outstanding == 0
+    assert second.outstanding == 0
+    assert first.pool.returned == [held]
+
+
+def test_get_read_connection_falls_back_to_primary_when_replicas_unhealthy(monkeypatch) -> None:
+    """Unhealthy or lagging replicas should be skipped in favour of the primary."""
+    lagging = _healthy_replica("r1")
+    lagging.healthy = False
+    monkeypatch.setattr(db, "replica_pools", [lagging])
+
+    conn = db.get_read_connection()
+
+    assert conn.pool_name == "primary"
+
+
+def test_exhausted_replica_is_skipped_without_being_marked_unhealthy(monkeypatch) -> None:
+    """A busy replica pool should route elsewhere this time and stay in rotation."""
+
+    class ExhaustedPool(FakePool):
+        def getconn(self) -> FakeConnection:
+            raise db.pool.PoolError("connection pool exhausted")
+
+    busy, other = _healthy_replica("r1"), _healthy_replica("r2")
+    busy.pool = ExhaustedPool("r1")
+    monkeypatch.setattr(config, "REPLICA_ROUTING", "round_robin")
+    monkeypatch.setattr(db, "replica_pools", [busy])
+
+    conn = db.get_read_connection()
+    assert conn.pool_name == "primary"
+    db.release_db_connection(conn)
+
+    monkeypatch.setattr(db, "replica_pools", [busy, other])
+    conn = db.get_read_connection()
+    assert conn.pool_name == "r2"
+    db.release_db_connection(conn)
+
+    busy.check_health()
+    assert busy.healthy
+    assert busy.outstanding == 0
+
+
+def test_read_checkout_holds_admission_slot_until_release() -> None:
+    """A read connection should take one admission slot and free it on release."""
+    controller = admission.get_admission_controller()
+
+    conn = db.get_read_connection()
+    assert controller.in_use == 1
+
+    db.release_db_connection(conn)
+    db.release_db_connection(conn)
+    assert controller.in_use == 0
@@ -0,0 +1,185 @@
+"""Core tests for statement timeouts and query cancellation."""
+
+from __future__ import annotations
+
+import threading
+
+import anyio
+import pytest
+from psycopg2.errors import QueryCanceled
+
+from app.core import admission, db, query_control
+from app.core.exceptions import QueryTimeoutError
+from app.data_providers import title_data_provider
+
+
+class FakeCursor:
+    """Cursor recording executed statements on its connection."""
+
+    def __init__(self, conn) -> None:
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        return None
+
+    def execute(self, query: str, params=None) -> None:
+        self.conn.executed.append((query, params))
+        if self.conn.fail_with is not None:
+            raise self.conn.fail_with
+
+
+class FakeConnection:
+    """Minimal stand-in for a psycopg2 connection."""
+
+    closed = 0
+
+    def __init__(self, fail_with: Exception | None = None) -> None:
+        self.executed: list[tuple] = []
+        self.cancelled = 0
+        self.fail_with = fail_with
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self)
+
+    def cancel(self) -> None:
+        self.cancelled += 1
+
+
+class FakePool:
+    """Pool handing out one prepared connection."""
+
+    def __init__(self, conn: FakeConnection) -> None:
+        self.conn = conn
+
+    def getconn(self) -> FakeConnection:
+        return self.conn
+
+    def putconn(self, conn, close: bool = False) -> None:
+        return None
+
+
+@pytest.fixture(autouse=True)
+def _reset_db(monkeypatch):
+    monkeypatch.setattr(db, "replica_pools", [])
+    monkeypatch.setattr(
+        admission,
+        "_controller",
+        admission.AdmissionController(capacity=10, max_queue=0, max_wait_seconds=0),
+    )
+    db._admitted_checkouts.clear()
+    yield
+    db._admitted_checkouts.clear()
+
+
+def test_read_connection_sets_request_statement_timeout(monkeypatch) -> None:
+    """A checkout inside a request with a timeout should SET LOCAL statement_timeout."""
+    conn = FakeConnection()
+    monkeypatch.setattr(db, "connection_pool", FakePool(conn))
+    token = query_control._statement_timeout_ms.set(1500)
+    try:
+        checked_out = db.get_read_connection()
+    finally:
+        query_control._statement_timeout_ms.reset(token)
+
+    assert conn.executed == [("SET LOCAL statement_timeout = %s", (1500,))]
+    db.release_db_connection(checked_out)
+
+
+def test_read_connection_without_timeout_runs_no_statement(monkeypatch) -> None:
+    """Background checkouts (no request timeout) should leave the server default."""
+    conn = FakeConnection()
+    monkeypatch.setattr(db, "connection_pool", FakePool(conn))
+
+    db.release_db_connection(db.get_read_connection())
+
+    assert conn.executed == []
+
+
+def test_cancelled_query_maps_to_query_timeout_error(monkeypatch) -> None:
+    """A statement cancelled by timeout or disconnect should raise QueryTimeoutError."""
+    monkeypatch.setattr(db, "connection_pool", FakePool(FakeConnection(QueryCanceled())))
+
+    with pytest.raises(QueryTimeoutError) as exc_info:
+        title_data_provider.fetch_title_by_id.__wrapped__(1)
+
+    assert exc_info.value.status_code == 504
+    assert exc_info.value.error_code == 507
+
+
+def test_request_queries_cancel_registered_and_late_connections() -> None:
+    """Disconnect should cancel in-use connections and any checked out afterwards."""
+    queries = query_control.RequestQueries()
+    running, returned, late = FakeConnection(), FakeConnection(), FakeConnection()
+    queries.register(running)
+    queries.register(returned)
+    queries.unregister(returned)
+
+    queries.cancel_all()
+    queries.register(late)
+
+    assert (running.cancelled, returned.cancelled, late.cancelled) == (1, 0, 1)
+
+
+def test_unregister_waits_for_cancel_in_progress() -> None:
+    """A connection cannot be returned to the pool while a cancel is being sent to it."""
+    queries = query_control.RequestQueries()
+    cancel_started, release_cancel = threading.Event(), threading.Event()
+    conn = FakeConnection()
+
+    def slow_cancel() -> None:
+        cancel_started.set()
+        release_cancel.wait(timeout=5)
+        conn.cancelled += 1
+
+    conn.cancel = slow_cancel
+    queries.register(conn)
+    canceller = threading.Thread(target=queries.cancel_all)
+    canceller.start()
+    cancel_started.wait(timeout=5)
+    unregistering = threading.Thread(target=queries.unregister, args=(conn,))
+    unregistering.start()
+
+    unregistering.join(timeout=0.1)
+    assert unregistering.is_alive()
+    release_cancel.set()
+    unregistering.join(timeout=5)
+    canceller.join(timeout=5)
+
+    assert not unregistering.is_alive()
+    assert conn.cancelled == 1
+
+
+def test_middleware_cancels_tracked_query_on_client_disconnect() -> None:
+    """The middleware should cancel a blocked query when the client goes away."""
+    conn = FakeConnection()
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+    disconnect = anyio.Event()
+    sent: list[dict] = []
+
+    async def endpoint(_scope, receive, send) -> None:
+        query_control.track_connection(conn)
+        assert (await receive())["type"] == "http.request"
+        disconnect.set()
+        with anyio.fail_after(2):
+            while not conn.cancelled:
+                await anyio.sleep(0.01)
+        await send({"type": "http.response.start", "status": 504, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive() -> dict:
+        if messages:
+            return messages.pop(0)
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    middleware = query_control.QueryCancellationMiddleware(endpoint)
+    anyio.run(middleware, {"type": "http", "method": "GET", "path": "/browse"}, receive, send)
+
+    assert conn.cancelled == 1
+    assert [message["type"] for message in sent] == ["http.response.start", "http.response.body"]
@@ -0,0 +1,155 @@
+"""Core tests for the background bootstrap and readiness report."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core import readiness
+
+# The autouse fixture replaces _run_locked; keep the real one for the lock test.
+_RUN_LOCKED = readiness._run_locked
+
+
+class _FakeCursor:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+    def execute(self, sql: str, params=None) -> None:
+        self.statements.append(sql)
+
+
+class _FakeLockConnection:
+    def __init__(self) -> None:
+        self.cur = _FakeCursor()
+        self.autocommit = False
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+    def cursor(self) -> _FakeCursor:
+        return self.cur
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def _unlocked_steps(monkeypatch):
+    def run_locked(steps) -> None:
+        for name, step in steps:
+            readiness._run_step(name, step)
+
+    monkeypatch.setattr(readiness, "_run_locked", run_locked)
+    monkeypatch.setattr(readiness, "DATASET_POLL_SECONDS", 0.01)
+    yield
+    thread = readiness._bootstrap_thread
+    readiness.stop_background_bootstrap()
+    if thread is not None:
+        thread.join(timeout=5)
+
+
+def _run_bootstrap(migrate_and_seed: bool, warm_up) -> dict:
+    readiness.start_background_bootstrap(migrate_and_seed, warm_up)
+    readiness._bootstrap_thread.join(timeout=5)
+    return readiness.readiness_report()
+
+
+def test_bootstrap_runs_steps_in_order_and_becomes_ready(monkeypatch) -> None:
+    """Migrations, seed and related titles run before the dataset check and warm-up."""
+    calls: list[str] = []
+    versions = iter([None, None, 3])
+    monkeypatch.setattr(readiness, "run_migrations", lambda: calls.append("migrations"))
+    monkeypatch.setattr(readiness, "run_seed", lambda: calls.append("seed"))
+    monkeypatch.setattr(readiness, "run_related_titles", lambda: calls.append("related"))
+    monkeypatch.setattr(readiness, "read_loaded_dataset_version", lambda: next(versions))
+
+    report = _run_bootstrap(True, lambda: calls.append("warm_up"))
+
+    assert calls == ["migrations", "seed", "related", "warm_up"]
+    assert report["ready"] is True
+    assert report["steps"]["dataset_version"]["detail"] == "version 3"
+    assert list(report["steps"]) == list(readiness.BOOTSTRAP_STEPS)
+
+
+def test_failed_step_keeps_process_not_ready(monkeypatch) -> None:
+    """A failing step is reported and later steps do not run."""
+    calls: list[str] = []
+
+    def fail_seed() -> None:
+        raise RuntimeError("seed exited with status 1")
+
+    monkeypatch.setattr(readiness, "run_migrations", lambda: None)
+    monkeypatch.setattr(readiness, "run_seed", fail_seed)
+    monkeypatch.setattr(readiness, "run_related_titles", lambda: calls.append("related"))
+
+    report = _run_bootstrap(True, lambda: calls.append("warm_up"))
+
+    assert report["ready"] is False
+    assert report["steps"]["seed"] == {
+        "status": "failed",
+        "detail": "seed exited with status 1",
+        "progress": None,
+    }
+    assert report["steps"]["warm_up"]["status"] == "pending"
+    assert calls == []
+
+
+def test_skipped_migrations_still_wait_for_dataset(monkeypatch) -> None:
+    """Without migrate-and-seed only the dataset check and warm-up gate readiness."""
+    monkeypatch.setattr(readiness, "read_loaded_dataset_version", lambda: 1)
+
+    report = _run_bootstrap(False, lambda: None)
+
+    assert report["ready"] is True
+    assert {name: step["status"] for name, step in report["steps"].items()} == {
+        "migrations": "skipped",
+        "seed": "skipped",
+        "related_titles": "skipped",
+        "dataset_version": "done",
+        "warm_up": "done",
+    }
+
+
+def test_script_output_updates_progress(monkeypatch) -> None:
+    """Percentages printed by a script become the step's progress."""
+    readiness._reset_steps(["seed"])
+
+    readiness.run_script(
+        "seed",
+        ["-c", "print('Seeding progress:  45% (9/20)'); print('Inserted titles: 9')"],
+    )
+
+    assert readiness.readiness_report()["steps"]["seed"] == {
+        "status": "pending",
+        "detail": "Inserted titles: 9",
+        "progress": 45,
+    }
+
+
+def test_lock_connection_is_closed_when_a_locked_step_fails(monkeypatch) -> None:
+    """The advisory lock is released and its connection closed even if a step raises."""
+    lock_conn = _FakeLockConnection()
+    monkeypatch.setattr(readiness.psycopg2, "connect", lambda dsn: lock_conn)
+    readiness._reset_steps(["migrations"])
+
+    def fail_migrations() -> None:
+        raise RuntimeError("alembic exited with status 1")
+
+    with pytest.raises(RuntimeError):
+        _RUN_LOCKED([("migrations", fail_migrations)])
+
+    assert lock_conn.closed is True
+    assert lock_conn.cur.statements == [
+        "SELECT pg_advisory_lock(%s)",
+        "SELECT pg_advisory_unlock(%s)",
+    ]
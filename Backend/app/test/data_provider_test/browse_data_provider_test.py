@@ -0,0 +1,143 @@
+"""Data provider tests for the Postgres browse query compiler."""
+
+from __future__ import annotations
+
+import numpy as np
+
+import app.data_providers.browse_data_provider as browse_data_provider
+import app.data_providers.facet_index as facet_index
+
+
+def _compile(search_words: list[str], sort: str = "title_asc", **filters) -> tuple[str, list]:
+    predicates = browse_data_provider._browse_predicates(
+        search_words,
+        filters.pop("release_year", None),
+        filters.pop("genre_id", None),
+        **filters,
+    )
+    query = browse_data_provider.compile_browse_query(
+        browse_data_provider.BrowseQueryShape(
+            predicates=tuple(key for key, _ in predicates),
+            order_by=browse_data_provider.BROWSE_SORT_ORDER_BY[sort],
+            paged=True,
+        )
+    )
+    return query, [param for _, params in predicates for param in params]
+
+
+def test_plain_listing_scans_title_without_joins_or_distinct() -> None:
+    """Listing a page without predicates should only touch title and its media type."""
+    query, params = _compile([])
+
+    assert "DISTINCT" not in query
+    assert "WHERE" not in query
+    assert "contributor" not in query and "title_genre" not in query
+    assert query.rstrip().endswith("ORDER BY t.title, t.id LIMIT %s OFFSET %s")
+    assert params == []
+
+
+def test_filters_emit_only_their_semi_joins() -> None:
+    """Year and genre filters should not pull in the contributor tables."""
+    query, params = _compile([], year_from=1990, genre_ids=[1, 2], genre_mode="any")
+
+    assert "contributor" not in query
+    assert query.count("EXISTS") == 1
+    assert params == [1990, [1, 2]]
+
+
+def test_search_words_use_exists_and_rarest_word_candidates() -> None:
+    """Each word should be an EXISTS match; only the first drives trigram candidates."""
+    query, params = _compile(["keanu", "42"], contributor_id=7, role="actor")
+
+    assert query.count("t.id IN (") == 1
+    assert query.count("CAST(t.release_year AS TEXT) ILIKE %s") == 1
+    assert query.count("%s") == len(params) + 2
+    assert params[:6] == ["%keanu%"] * 6
+    assert params[6:] == ["%42%"] * 4 + [7, "actor"]
+
+
+def test_year_words_match_the_year_or_the_text() -> None:
+    """A whole-year word matches that release year by equality or any text field."""
+    query, params = _compile(["2001", "odyssey"])
+
+    assert "CAST(t.release_year AS TEXT)" not in query
+    assert query.count("sy.release_year = %s") == 1
+    assert query.count("OR t.release_year = %s") == 1
+    assert params[:8] == ["%2001%"] * 3 + [2001] + ["%2001%"] * 3 + [2001]
+    assert params[8:] == ["%odyssey%"] * 3
+
+
+def test_compiled_sql_is_cached_per_predicate_shape() -> None:
+    """Queries differing only in parameter values should reuse one compiled string."""
+    first, _ = _compile(["matrix"], release_year=1999)
+    second, _ = _compile(["heat"], release_year=1995)
+    other, _ = _compile(["matrix"])
+
+    assert first is second
+    assert other != first
+
+
+def test_fuzzy_shape_ranks_trigram_word_matches_by_similarity() -> None:
+    """Fuzzy queries should use the indexable `<%` operator and order by the best score."""
+    query = browse_data_provider.compile_browse_query(
+        browse_data_provider.BrowseQueryShape(
+            predicates=(("release_year", None),),
+            order_by=browse_data_provider.FUZZY_ORDER_BY,
+            paged=True,
+            fuzzy=True,
+        )
+    )
+
+    assert query.count("<%% ") == 2
+    assert "ILIKE" not in query
+    assert query.count("%s") == 4 + 1 + 2
+    assert query.rstrip().endswith(
+        "ORDER BY fuzzy.score DESC, t.title, t.id LIMIT %s OFFSET %s"
+    )
+
+
+def test_match_ids_query_wraps_the_unordered_page_query() -> None:
+    """Facet matches should use the same predicates, without ORDER BY or paging."""
+    predicates = browse_data_provider._browse_predicates(["atri"], 1999, None)
+    shape = browse_data_provider.BrowseQueryShape(
+        predicates=tuple(key for key, _ in predicates),
+        order_by="",
+        paged=False,
+    )
+
+    query = browse_data_provider.compile_match_ids_query(shape)
+
+    assert query.startswith("SELECT m.id FROM (")
+    assert browse_data_provider.compile_browse_query(shape) in query
+    assert "ORDER BY" not in query and "LIMIT" not in query
+    assert "GROUP BY" not in query
+    assert query.count("%s") == sum(len(params) for _, params in predicates)
+
+
+def test_fetch_browse_facets_count_the_match_ids_on_the_facet_bitmaps(monkeypatch) -> None:
+    """Facets should intersect the matched ids with the facet index, not GROUP BY in SQL."""
+    index = facet_index.FacetIndex(
+        genres=[(1, "Action"), (2, "Drama")],
+        titles=np.array([(10, 1999), (11, 2003), (12, -1)]),
+        title_genres=np.array([(10, 1), (11, 1), (12, 2)]),
+    )
+    calls: list[tuple] = []
+
+    def fake_match_ids(search_words, release_year, genre_id, **filters):
+        calls.append((search_words, release_year, genre_id, filters))
+        return [11, 12, 99]
+
+    monkeypatch.setattr(browse_data_provider, "fetch_browse_match_ids", fake_match_ids)
+    monkeypatch.setattr(browse_data_provider, "ensure_facet_index", lambda: index)
+
+    facets = browse_data_provider.fetch_browse_facets(
+        ["matrx"], None, None, ["genre", "year"], similarity_threshold=0.4, media_type="movie"
+    )
+
+    assert facets == {
+        "genre": [{"id": 1, "name": "Action", "count": 1}, {"id": 2, "name": "Drama", "count": 1}],
+        "year": [{"year": 2003, "count": 1}],
+    }
+    assert calls == [
+        (["matrx"], None, None, {"media_type": "movie", "similarity_threshold": 0.4})
+    ]
@@ -0,0 +1,145 @@
+"""Data provider tests for the in-memory catalog engine."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from app.core import config
+import app.data_providers.catalog_engine as catalog_engine
+import app.data_providers.contributor_data_provider as contributor_data_provider
+import app.data_providers.title_data_provider as title_data_provider
+from app.core.exceptions import ContributorPathSearchLimitExceeded
+from app.scripts.export_snapshot import write_snapshot
+
+CATALOG_ROWS = {
+    "media_type_lkup": [(1, "movie")],
+    "contributor_type_lkup": [(1, "actor"), (2, "actress"), (3, "director")],
+    "genre_type_lkup": [(1, "Sci-Fi"), (2, "Action")],
+    "title": [
+        (10, "tt0133093", "The Matrix", 1, 1999),
+        (11, "tt0234215", "The Matrix Reloaded", 1, 2003),
+        (12, None, "Animatrix", 1, None),
+    ],
+    "contributor": [
+        (7, "nm0000206", "Keanu Reeves"),
+        (8, "nm0905154", "Lana Wachowski"),
+        (9, "nm0000401", "Carrie-Anne Moss"),
+        (11, "nm0915989", "Hugo Weaving"),
+        (12, "nm0000158", "Tom Hanks"),
+    ],
+    "contributor_title_mapping": [
+        (1, 7, 1, 10),
+        (2, 8, 3, 10),
+        (3, 9, 2, 10),
+        (4, 7, 1, 11),
+        (5, 7, 3, 12),
+        (6, 11, 1, 12),
+    ],
+    "title_genre": [(1, 10, 1), (2, 10, 2), (3, 11, 2)],
+}
+
+
+@pytest.fixture(name="engine")
+def _engine(tmp_path, monkeypatch):
+    path = tmp_path / "catalog.sqlite3"
+    write_snapshot(path, CATALOG_ROWS)
+    conn = sqlite3.connect(path)
+    try:
+        engine = catalog_engine.load_catalog_engine(conn)
+    finally:
+        conn.close()
+    monkeypatch.setattr(config, "DATA_BACKEND", "memory")
+    yield engine
+    catalog_engine.unload_catalog_engine()
+
+
+def test_title_lookups_are_served_from_engine(engine) -> None:
+    """Provider functions should answer from the engine's arrays."""
+    assert title_data_provider.fetch_title_by_id(10) == (
+        10,
+        "tt0133093",
+        "The Matrix",
+        1999,
+        "movie",
+    )
+    assert title_data_provider.fetch_title_by_id(12) == (12, None, "Animatrix", None, "movie")
+    assert title_data_provider.fetch_title_by_id(404) is None
+    assert title_data_provider.fetch_genres_by_title_id(10) == ["Action", "Sci-Fi"]
+
+
+def test_adjacency_is_ordered_like_sql_providers(engine) -> None:
+    """CSR slices should be ordered by name, then role, as the SQL queries are."""
+    assert contributor_data_provider.fetch_contributors_by_title_id(10) == [
+        (9, "nm0000401", "Carrie-Anne Moss", "actress"),
+        (7, "nm0000206", "Keanu Reeves", "actor"),
+        (8, "nm0905154", "Lana Wachowski", "director"),
+    ]
+    assert [row[0] for row in title_data_provider.fetch_titles_by_contributor_id(7)] == [
+        12,
+        10,
+        11,
+    ]
+    assert contributor_data_provider.fetch_contributor_by_id(8) == (
+        8,
+        "nm0905154",
+        "Lana Wachowski",
+    )
+
+
+def test_memory_footprint_reports_arrays_and_total(engine) -> None:
+    """Footprint report should list each array and a total."""
+    report = engine.memory_footprint()
+
+    assert report["title_contributor_indices"] == 6 * 4
+    assert report["total"] == sum(value for key, value in report.items() if key != "total")
+
+
+def test_contributor_path_finds_shortest_chain(engine) -> None:
+    """Bidirectional BFS should return the shortest contributor/title chain."""
+    assert engine.fetch_contributor_path(9, 8, 6, 1000, 1.0) == [
+        ("contributor", 9, "nm0000401", "Carrie-Anne Moss"),
+        ("title", 10, "tt0133093", "The Matrix"),
+        ("contributor", 8, "nm0905154", "Lana Wachowski"),
+    ]
+    path = engine.fetch_contributor_path(11, 8, 6, 1000, 1.0)
+    assert [(row[0], row[1]) for row in path] == [
+        ("contributor", 11),
+        ("title", 12),
+        ("contributor", 7),
+        ("title", 10),
+        ("contributor", 8),
+    ]
+
+
+def test_contributor_path_respects_limits(engine) -> None:
+    """Degree limits return no path; node budgets raise a limit error."""
+    assert engine.fetch_contributor_path(11, 8, 1, 1000, 1.0) is None
+    assert engine.fetch_contributor_path(12, 8, 6, 1000, 1.0) is None
+
+    with pytest.raises(ContributorPathSearchLimitExceeded):
+        engine.fetch_contributor_path(11, 8, 6, 2, 1.0)
+
+
+def test_pooled_load_bypasses_request_admission_and_timeout(tmp_path, monkeypatch) -> None:
+    """A load triggered without a connection should not use a request-scoped read checkout."""
+    path = tmp_path / "catalog.sqlite3"
+    write_snapshot(path, CATALOG_ROWS)
+    conn = sqlite3.connect(path)
+    released: list = []
+
+    def fail_read_connection():
+        raise AssertionError("engine loads must not take a request read connection")
+
+    monkeypatch.setattr(catalog_engine.db, "get_read_connection", fail_read_connection)
+    monkeypatch.setattr(catalog_engine.db, "get_db_connection", lambda: conn)
+    monkeypatch.setattr(catalog_engine.db, "release_db_connection", released.append)
+    try:
+        engine = catalog_engine.load_catalog_engine()
+    finally:
+        conn.close()
+        catalog_engine.unload_catalog_engine()
+
+    assert engine.fetch_title_by_id(10)[2] == "The Matrix"
+    assert released == [conn]
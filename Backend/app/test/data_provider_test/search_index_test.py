@@ -0,0 +1,152 @@
+"""Data provider tests for the in-memory inverted search index."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import app.data_providers.facet_bitmaps as facet_bitmaps
+import app.data_providers.search_index as search_index
+from app.data_providers.catalog_engine import CatalogEngine
+
+
+@pytest.fixture(autouse=True)
+def _index():
+    engine = CatalogEngine(
+        media_types=[(1, "movie")],
+        roles=[(1, "actor"), (3, "director")],
+        genres=[(1, "Action"), (2, "Sci-Fi"), (3, "Drama")],
+        titles=[
+            (10, "tt0133093", "The Matrix", 1, 1999),
+            (11, "tt0234215", "The Matrix Reloaded", 1, 2003),
+            (12, "tt0111161", "The Shawshank Redemption", 1, 1994),
+            (13, "tt0120601", "Being John Malkovich", 1, 1999),
+        ],
+        contributors=[
+            (7, "nm0000206", "Keanu Reeves"),
+            (8, "nm0000209", "Tim Robbins"),
+            (9, "nm0000518", "John Malkovich"),
+        ],
+        mappings=np.array([(7, 1, 10), (7, 1, 11), (8, 1, 12), (9, 1, 13)]),
+        title_genres=np.array([(10, 1), (10, 2), (11, 1), (12, 3), (13, 3)]),
+    )
+    search_index.build_search_index(engine)
+    yield
+    search_index.unload_search_index()
+
+
+def _ids(rows: list[tuple]) -> list[int]:
+    return [row[0] for row in rows]
+
+
+def test_words_are_anded_across_title_contributor_genre_and_year() -> None:
+    """Each word may match a different field, but all words must match."""
+    rows = search_index.fetch_indexed_browse_titles(
+        search_words=["matrix", "KEANU", "1999"],
+        release_year=None,
+        genre_id=None,
+        offset=0,
+        page_size=10,
+    )
+
+    assert rows == [(10, "tt0133093", "The Matrix", 1999, "movie")]
+    assert _ids(
+        search_index.fetch_indexed_browse_titles(["drama", "john"], None, None, 0, 10)
+    ) == [13]
+
+
+def test_words_match_token_prefixes() -> None:
+    """Words of three or more characters also match as token prefixes."""
+    assert _ids(search_index.fetch_indexed_browse_titles(["reload"], None, None, 0, 10)) == [11]
+    assert _ids(search_index.fetch_indexed_browse_titles(["ma"], None, None, 0, 10)) == []
+
+
+def test_prefix_matches_every_vocabulary_expansion() -> None:
+    """A short prefix with hundreds of expansions should match all of them."""
+    engine = CatalogEngine(
+        media_types=[(1, "movie")],
+        roles=[(1, "actor")],
+        genres=[(1, "Drama")],
+        titles=[(title_id, None, f"word{title_id:04d}", 1, 2000) for title_id in range(1, 301)],
+        contributors=[],
+        mappings=np.empty((0, 3), dtype=np.int64),
+        title_genres=np.empty((0, 2), dtype=np.int64),
+    )
+    search_index.build_search_index(engine)
+
+    rows = search_index.fetch_indexed_browse_titles(["wor"], None, None, 0, 50)
+    matches = search_index.get_search_index().match(["wor"], None, None)
+
+    assert len(matches) == 300
+    assert _ids(rows) == list(range(1, 51))
+
+
+def test_filters_and_paging_follow_title_then_id_order() -> None:
+    """Filters intersect with the search and pages follow (title, id) order."""
+    assert _ids(search_index.fetch_indexed_browse_titles([], None, None, 1, 2)) == [10, 11]
+    assert _ids(search_index.fetch_indexed_browse_titles([], 1999, 3, 0, 10)) == [13]
+    assert _ids(search_index.fetch_indexed_browse_titles(["the"], None, None, 1, 1)) == [11]
+
+
+def test_facet_counts_cover_all_matches_not_just_the_page() -> None:
+    """Facet counts are taken over the whole match set, most common genre first."""
+    assert search_index.fetch_indexed_browse_facets([], None, None, ["genre", "year"]) == {
+        "genre": [
+            {"id": 1, "name": "Action", "count": 2},
+            {"id": 3, "name": "Drama", "count": 2},
+            {"id": 2, "name": "Sci-Fi", "count": 1},
+        ],
+        "year": [
+            {"year": 1994, "count": 1},
+            {"year": 1999, "count": 2},
+            {"year": 2003, "count": 1},
+        ],
+    }
+    assert search_index.fetch_indexed_browse_facets(["matrix"], None, None, ["genre"]) == {
+        "genre": [
+            {"id": 1, "name": "Action", "count": 2},
+            {"id": 2, "name": "Sci-Fi", "count": 1},
+        ],
+    }
+
+
+def test_facet_bitmaps_count_array_and_bitmap_containers_alike(monkeypatch) -> None:
+    """Dense (bitmap) and sparse (array) containers give the same counts."""
+    monkeypatch.setattr(facet_bitmaps, "ARRAY_CONTAINER_LIMIT", 1)
+    values = np.array([0, 0, 0, 1, 1, 2])
+    positions = np.array([1, 70_000, 70_001, 1, 5, 9])
+    family = facet_bitmaps.BitmapFamily(values, positions, 3)
+    matches = facet_bitmaps.dense_bitmap(np.array([1, 9, 70_001]), 70_002)
+
+    assert len(family.bitmap_words) == 2
+    assert family.count(matches).tolist() == [2, 1, 1]
+    assert family.cardinalities.tolist() == [3, 2, 1]
+
+
+def test_structured_filters_intersect_with_search() -> None:
+    """Range, genre any/all, media type and contributor filters match the SQL backends."""
+
+    def ids(words: list[str], **filters) -> list[int]:
+        return _ids(search_index.fetch_indexed_browse_titles(words, None, None, 0, 10, **filters))
+
+    assert ids([], year_from=1995, year_to=2003) == [13, 10, 11]
+    assert ids([], genre_ids=[2, 3]) == [13, 10, 12]
+    assert ids([], genre_ids=[1, 2], genre_mode="all") == [10]
+    assert ids(["the"], media_type="movie", contributor_id=7, role="actor") == [10, 11]
+    assert ids([], contributor_id=7, role="director") == []
+    assert ids([], media_type="series") == []
+
+
+def test_pages_follow_requested_sort_order() -> None:
+    """Every sort breaks ties by id, with cast size counting distinct contributors."""
+
+    def ids(sort: str, offset: int = 0) -> list[int]:
+        return _ids(search_index.fetch_indexed_browse_titles([], None, None, offset, 10, sort=sort))
+
+    assert ids("title_desc") == [12, 11, 10, 13]
+    assert ids("release_year_asc") == [12, 10, 13, 11]
+    assert ids("release_year_desc") == [11, 13, 10, 12]
+    assert ids("cast_size_desc") == [10, 11, 12, 13]
+    assert _ids(
+        search_index.fetch_indexed_browse_titles(["1999"], None, None, 1, 1, sort="title_desc")
+    ) == [13]
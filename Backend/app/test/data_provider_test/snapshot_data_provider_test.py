@@ -0,0 +1,193 @@
+"""Data provider tests for the read-only snapshot backend."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core import config
+import app.data_providers.browse_data_provider as browse_data_provider
+import app.data_providers.contributor_data_provider as contributor_data_provider
+import app.data_providers.facet_index as facet_index
+import app.data_providers.snapshot_data_provider as snapshot_data_provider
+import app.data_providers.title_data_provider as title_data_provider
+import app.service_logic.contributor_service_logic as contributor_service_logic
+from app.scripts.export_snapshot import write_snapshot
+
+CATALOG_ROWS = {
+    "media_type_lkup": [(1, "movie")],
+    "contributor_type_lkup": [(1, "actor"), (3, "director")],
+    "genre_type_lkup": [(1, "Action"), (2, "Sci-Fi"), (3, "Drama")],
+    "title": [
+        (10, "tt0133093", "The Matrix", 1, 1999),
+        (11, "tt0234215", "The Matrix Reloaded", 1, 2003),
+        (12, "tt0111161", "The Shawshank Redemption", 1, 1994),
+    ],
+    "contributor": [
+        (7, "nm0000206", "Keanu Reeves"),
+        (8, "nm0000209", "Tim Robbins"),
+        (9, "nm0000210", "Tim Roth"),
+    ],
+    "contributor_title_mapping": [
+        (1, 7, 1, 10),
+        (2, 7, 1, 11),
+        (3, 8, 1, 12),
+    ],
+    "title_genre": [
+        (1, 10, 1),
+        (2, 10, 2),
+        (3, 11, 1),
+        (4, 12, 3),
+    ],
+    "title_similarity": [
+        (10, 1, 11, 0.83),
+        (10, 2, 12, 0.1),
+    ],
+    "search_token_stats": [("", 3), ("the", 3), ("matrix", 2), ("keanu", 2)],
+}
+
+
+@pytest.fixture(autouse=True)
+def _snapshot(tmp_path, monkeypatch):
+    path = tmp_path / "catalog.sqlite3"
+    write_snapshot(path, CATALOG_ROWS)
+    monkeypatch.setattr(config, "DATA_BACKEND", "snapshot")
+    snapshot_data_provider.open_snapshot(str(path))
+    yield
+    facet_index.unload_facet_index()
+    snapshot_data_provider.close_snapshot()
+
+
+def test_fetch_browse_titles_matches_words_across_fields() -> None:
+    """Every word must match the title, a contributor, a genre or the year."""
+    rows = browse_data_provider.fetch_browse_titles(
+        search_words=["MATRIX", "keanu"],
+        release_year=None,
+        genre_id=None,
+        offset=0,
+        page_size=10,
+    )
+
+    assert [row[0] for row in rows] == [10, 11]
+
+
+def test_fetch_search_token_counts_reads_snapshot_statistics() -> None:
+    """Known tokens and the total title count should come from search_token_stats."""
+    counts = browse_data_provider.fetch_search_token_counts(["", "matrix", "unknown"])
+
+    assert counts == {"": 3, "matrix": 2}
+
+
+def test_fetch_browse_facets_use_the_page_matching_rules() -> None:
+    """Facets count substring matches, like the result page does."""
+    facets = browse_data_provider.fetch_browse_facets(["atri"], None, None, ["genre", "year"])
+
+    assert facets == {
+        "genre": [
+            {"id": 1, "name": "Action", "count": 2},
+            {"id": 2, "name": "Sci-Fi", "count": 1},
+        ],
+        "year": [{"year": 1999, "count": 1}, {"year": 2003, "count": 1}],
+    }
+
+
+def test_fetch_browse_titles_applies_filters_and_paging() -> None:
+    """Year/genre filters and LIMIT/OFFSET should apply on top of the search."""
+    rows = browse_data_provider.fetch_browse_titles(
+        search_words=[],
+        release_year=None,
+        genre_id=1,
+        offset=1,
+        page_size=10,
+    )
+
+    assert rows == [(11, "tt0234215", "The Matrix Reloaded", 2003, "movie")]
+
+
+def test_detail_fetches_are_served_from_snapshot() -> None:
+    """Provider functions should transparently read from the snapshot backend."""
+    assert title_data_provider.fetch_title_by_id(12) == (
+        12,
+        "tt0111161",
+        "The Shawshank Redemption",
+        1994,
+        "movie",
+    )
+    assert title_data_provider.fetch_genres_by_title_id(10) == ["Action", "Sci-Fi"]
+    assert title_data_provider.fetch_title_by_id(999) is None
+
+
+def test_fetch_related_titles_follows_rank_order_and_limit() -> None:
+    """Related titles are read from title_similarity in rank order."""
+    assert title_data_provider.fetch_related_titles(10, 1) == [
+        (11, "tt0234215", "The Matrix Reloaded", 2003, "movie", pytest.approx(0.83)),
+    ]
+    assert [row[0] for row in title_data_provider.fetch_related_titles(10, 10)] == [11, 12]
+    assert title_data_provider.fetch_related_titles(12, 10) == []
+
+
+def test_fetch_browse_titles_applies_structured_filters() -> None:
+    """Year ranges, genre any/all, media type and contributor role all narrow results."""
+
+    def ids(**filters) -> list[int]:
+        rows = browse_data_provider.fetch_browse_titles([], None, None, 0, 10, **filters)
+        return [row[0] for row in rows]
+
+    assert ids(year_from=1995, year_to=2003) == [10, 11]
+    assert ids(genre_ids=[2, 3]) == [10, 12]
+    assert ids(genre_ids=[1, 2], genre_mode="all") == [10]
+    assert ids(media_type="movie", contributor_id=7, role="actor") == [10, 11]
+    assert ids(contributor_id=7, role="director") == []
+
+
+def test_fetch_browse_titles_sort_orders() -> None:
+    """Sort orders use an id tiebreak; cast size comes from the exported cast_count."""
+
+    def ids(sort: str, words: list[str] | None = None) -> list[int]:
+        rows = browse_data_provider.fetch_browse_titles(words or [], None, None, 0, 10, sort=sort)
+        return [row[0] for row in rows]
+
+    assert ids("title_desc") == [12, 11, 10]
+    assert ids("release_year_asc") == [12, 10, 11]
+    assert ids("release_year_desc") == [11, 10, 12]
+    assert ids("relevance", ["matrix"]) == [10, 11]
+
+
+def test_iter_browse_titles_yields_id_ordered_batches() -> None:
+    """Export batches follow id order and honour the browse filters."""
+    batches = list(browse_data_provider.iter_browse_titles([], None, None, batch_size=2))
+    assert [[row[0] for row in batch] for batch in batches] == [[10, 11], [12]]
+
+    filtered = browse_data_provider.iter_browse_titles(["matrix"], None, 1, batch_size=10)
+    assert [row[0] for batch in filtered for row in batch] == [10, 11]
+
+
+def test_fetch_contributor_search_matches_name_substrings_with_keyset_pages() -> None:
+    """Snapshot search ranks substring matches by name coverage and pages by keyset."""
+    rows = contributor_data_provider.fetch_contributor_search(
+        "TIM R", page_size=10, similarity_threshold=0.5
+    )
+
+    assert [(row[0], row[3]) for row in rows] == [(9, 0), (8, 1)]
+    assert rows[0][4] == pytest.approx(5 / 8)
+
+    last_id, _, _, last_title_count, last_score = rows[0]
+    next_page = contributor_data_provider.fetch_contributor_search(
+        "tim r",
+        page_size=10,
+        similarity_threshold=0.5,
+        after=(last_score, last_title_count, last_id),
+    )
+    assert [row[0] for row in next_page] == [8]
+    assert contributor_data_provider.fetch_contributor_search("50%", 10, 0.5) == []
+
+
+def test_search_contributors_service_pages_through_the_snapshot() -> None:
+    """GET /browse/contributors works on the snapshot backend, cursor included."""
+    first = contributor_service_logic.search_contributors("tim", page_size=1)
+    second = contributor_service_logic.search_contributors(
+        "tim", page_size=1, cursor=first["next_cursor"]
+    )
+
+    assert [item["name"] for item in first["results"]] == ["Tim Roth"]
+    assert [item["name"] for item in second["results"]] == ["Tim Robbins"]
+    assert second["next_cursor"] is None
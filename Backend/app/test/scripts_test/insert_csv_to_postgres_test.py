@@ -0,0 +1,206 @@
+"""Tests for the CSV loader's row normalization helpers."""
+
+from __future__ import annotations
+
+from app.scripts import insert_csv_to_postgres as loader
+
+
+def _write(path, text: str):
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_title_records_are_keyed_and_fingerprinted(tmp_path) -> None:
+    """Rows without ids are skipped; genre order does not change the fingerprint."""
+    movies = _write(
+        tmp_path / "movies.csv",
+        "tconst,titleType,primaryTitle,startYear,genres\n"
+        'tt1,movie,First,2023.0,"Drama,History"\n'
+        ",movie,No Id,2020,Drama\n"
+        "tt2,movie,Second,\\N,\n",
+    )
+    reordered = _write(
+        tmp_path / "reordered.csv",
+        "tconst,titleType,primaryTitle,startYear,genres\n"
+        'tt1,movie, First ,2023,"History,Drama"\n',
+    )
+
+    records = loader.read_title_records(movies)
+
+    assert list(records) == ["tt1", "tt2"]
+    assert records["tt1"][:4] == ("tt1", "First", 2023, "Drama,History")
+    assert records["tt2"][:4] == ("tt2", "Second", None, None)
+    assert loader.read_title_records(reordered)["tt1"][4] == records["tt1"][4]
+
+
+def test_contributor_fingerprint_tracks_known_titles(tmp_path) -> None:
+    """A change in known-for titles must change the contributor fingerprint."""
+    people = _write(
+        tmp_path / "people.csv",
+        "nconst,primaryName,primaryProfession,knownForTitles\n"
+        'nm1,Ada,"actor,director","tt1,tt2"\n'
+        'nm1,Ada,"actor,director","tt1,tt3"\n',
+    )
+
+    records = loader.read_contributor_records(people)
+
+    assert records["nm1"][:4] == ("nm1", "Ada", "actor,director", "tt1,tt3")
+    assert records["nm1"][4] != loader.contributor_fingerprint(
+        "Ada", ["actor", "director"], ["tt1", "tt2"]
+    )
+
+
+def test_copy_value_escapes_text_format() -> None:
+    """COPY text encoding should escape separators and represent NULL."""
+    assert loader.copy_value(None) == "\\N"
+    assert loader.copy_value("a\tb\\c\nd") == "a\\tb\\\\c\\nd"
+    assert loader.copy_value(1999) == "1999"
+
+
+def test_byte_range_chunks_cover_every_row_once() -> None:
+    """Chunk boundaries should split the sample files without losing or repeating rows."""
+    for path, kind in ((loader.MOVIES_CSV, "title"), (loader.PEOPLE_CSV, "contributor")):
+        expected = list(loader.read_csv_rows(path))
+        for parts in (1, 3, 7, 64):
+            rows = [
+                row
+                for start, end in loader.split_byte_ranges(path, parts)
+                for _, row in loader.iter_chunk_rows(path, start, end)
+            ]
+            assert rows == expected, (kind, parts)
+
+
+class _FakeCursor:
+    def __init__(self, conn) -> None:
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+    def execute(self, query: str, params: tuple) -> None:
+        assert "ingest_checkpoint" in query
+        self.conn.pending = params
+
+
+class _FakeConnection:
+    def __init__(self) -> None:
+        self.pending = None
+        self.committed: list[tuple] = []
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def commit(self) -> None:
+        if self.pending is not None:
+            self.committed.append(self.pending)
+        self.pending = None
+
+
+def test_checkpointed_rows_resume_after_last_commit() -> None:
+    """Each commit's checkpoint should point at the first row of the next batch."""
+    path = loader.PEOPLE_CSV
+    expected = [row["nconst"] for row in loader.read_csv_rows(path)]
+    conn = _FakeConnection()
+
+    rows = list(loader.iter_checkpointed_rows(conn, "people", path, "nconst", 500, None))
+
+    assert [row["nconst"] for row in rows] == expected
+    source, offset, last_key, processed = conn.committed[1]
+    assert (source, last_key, processed) == ("people", expected[999], 1000)
+    assert conn.committed[-1][1:] == (path.stat().st_size, expected[-1], len(expected))
+
+    resumed = list(
+        loader.iter_checkpointed_rows(
+            _FakeConnection(),
+            "people",
+            path,
+            "nconst",
+            500,
+            (offset, last_key, processed),
+        )
+    )
+    assert [row["nconst"] for row in resumed] == expected[1000:]
+
+
+class _RecordingConnection:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+        self.commits = 0
+        self.row: tuple | None = None
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+    def execute(self, query: str, params: tuple = ()) -> None:
+        self.statements.append(" ".join(query.split()))
+
+    def fetchone(self) -> tuple | None:
+        return self.row
+
+    def commit(self) -> None:
+        self.commits += 1
+
+
+def test_count_triggers_are_recomputed_once_when_re_enabled() -> None:
+    """--rebuild-indexes turns the count triggers off, then refreshes every count in one go."""
+    conn = _RecordingConnection()
+
+    loader.disable_count_triggers(conn)
+    loader.enable_count_triggers(conn)
+
+    assert conn.statements[0] == (
+        "ALTER TABLE public.contributor_title_mapping DISABLE TRIGGER USER"
+    )
+    assert conn.statements[1] == (
+        "ALTER TABLE public.contributor_title_mapping ENABLE TRIGGER USER"
+    )
+    assert conn.statements[2].startswith("UPDATE title t SET cast_count")
+    assert conn.statements[3].startswith("UPDATE contributor c SET title_count")
+    assert conn.commits == 2
+
+
+def test_checkpointed_rows_keep_quoted_multi_line_fields(tmp_path) -> None:
+    """Records spanning lines should parse like csv.DictReader, and resume at record bounds."""
+    path = _write(
+        tmp_path / "people.csv",
+        'nconst,primaryName\nnm1,"Ann\nMarie"\nnm2,"Bo, ""Jr."""\r\nnm3,"Cy\r\nDe"\nnm4,Ed\n',
+    )
+    expected = list(loader.read_csv_rows(path))
+    conn = _FakeConnection()
+
+    rows = list(loader.iter_checkpointed_rows(conn, "people", path, "nconst", 2, None))
+
+    assert rows == expected
+    assert rows[0]["primaryName"] == "Ann\nMarie"
+    offset, last_key, processed = conn.committed[0][1:]
+    assert (last_key, processed) == ("nm2", 2)
+    resumed = list(
+        loader.iter_checkpointed_rows(
+            _FakeConnection(), "people", path, "nconst", 2, (offset, last_key, processed)
+        )
+    )
+    assert resumed == expected[2:]
+
+
+def test_chunk_table_names_are_unique_per_loading_session() -> None:
+    """Chunk tables carry the backend pid so overlapping loads keep their own staging data."""
+    conn = _RecordingConnection()
+    conn.row = (4242,)
+
+    table_names = loader.create_chunk_tables(conn, "title", 2)
+
+    assert table_names == [
+        "public.ingest_title_chunk_4242_0",
+        "public.ingest_title_chunk_4242_1",
+    ]
+    assert conn.statements[0] == "SELECT pg_backend_pid()"
+    assert "DROP TABLE IF EXISTS public.ingest_title_chunk_4242_0" in conn.statements
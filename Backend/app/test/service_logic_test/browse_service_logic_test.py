@@ -6,11 +6,21 @@ import pytest
 
 from app.core.exceptions import InvalidInputError
 import app.service_logic.browse_service_logic as browse_service_logic
+import app.service_logic.search_planner as search_planner
+
+
+@pytest.fixture(autouse=True)
+def _clear_token_counts(monkeypatch):
+    monkeypatch.setattr(browse_service_logic, "fetch_fuzzy_browse_titles", lambda **kwargs: [])
+    search_planner.clear_search_planner_cache()
+    yield
+    search_planner.clear_search_planner_cache()
 
 
 def test_browse_titles_maps_rows_and_passes_expected_params(monkeypatch) -> None:
-    """browse_titles should map provider rows and pass parsed search words."""
+    """browse_titles should map provider rows and pass planned search words."""
     captured: dict = {}
+    token_counts = {"": 1000, "the": 400, "tom": 50, "hanks": 5, "drama": 300, "extra": 20}
 
     def fake_fetch_browse_titles(**kwargs):
         captured.update(kwargs)
@@ -20,9 +30,14 @@ def test_browse_titles_maps_rows_and_passes_expected_params(monkeypatch) -> None
         ]
 
     monkeypatch.setattr(browse_service_logic, "fetch_browse_titles", fake_fetch_browse_titles)
+    monkeypatch.setattr(
+        search_planner,
+        "fetch_search_token_counts",
+        lambda tokens: {token: token_counts[token] for token in tokens if token in token_counts},
+    )
 
     result = browse_service_logic.browse_titles(
-        search_text="tom hanks drama extra-word",
+        search_text="The tom hanks drama extra-word",
         release_year=1999,
         genre=2,
         offset=28,
@@ -30,15 +45,24 @@ def test_browse_titles_maps_rows_and_passes_expected_params(monkeypatch) -> None
     )
 
     assert captured == {
-        "search_words": ["tom", "hanks", "drama"],
+        "search_words": ["extra-word", "hanks", "tom"],
         "release_year": 1999,
         "genre_id": 2,
         "offset": 28,
         "page_size": 28,
+        "sort": "title_asc",
+        "year_from": None,
+        "year_to": None,
+        "genre_ids": None,
+        "genre_mode": "any",
+        "media_type": None,
+        "contributor_id": None,
+        "role": None,
     }
     assert result == {
         "offset": 28,
         "page_size": 28,
+        "match_mode": "exact",
         "results": [
             {
                 "id": 1,
@@ -95,3 +119,185 @@ def test_browse_genres_returns_provider_payload(monkeypatch) -> None:
     monkeypatch.setattr(browse_service_logic, "fetch_browse_genres", lambda: expected)
 
     assert browse_service_logic.browse_genres() == expected
+
+
+def test_browse_titles_adds_facets_only_when_requested(monkeypatch) -> None:
+    """Facet counts should be fetched for the same search words and filters."""
+    captured: dict = {}
+
+    def fake_fetch_browse_facets(**kwargs):
+        captured.update(kwargs)
+        return {"year": [{"year": 1999, "count": 1}]}
+
+    monkeypatch.setattr(browse_service_logic, "fetch_browse_titles", lambda **kwargs: [])
+    monkeypatch.setattr(browse_service_logic, "fetch_browse_facets", fake_fetch_browse_facets)
+
+    without_facets = browse_service_logic.browse_titles(None, None, None, 0, 10)
+    with_facets = browse_service_logic.browse_titles(
+        "matrix",
+        None,
+        2,
+        0,
+        10,
+        facets=["year"],
+        genres=[1, 3],
+        genre_mode="all",
+    )
+
+    assert "facets" not in without_facets
+    assert with_facets["facets"] == {"year": [{"year": 1999, "count": 1}]}
+    assert captured == {
+        "search_words": ["matrix"],
+        "release_year": None,
+        "genre_id": 2,
+        "facets": ["year"],
+        "year_from": None,
+        "year_to": None,
+        "genre_ids": [1, 3],
+        "genre_mode": "all",
+        "media_type": None,
+        "contributor_id": None,
+        "role": None,
+    }
+
+
+def test_browse_titles_takes_facets_from_the_page_backend(monkeypatch) -> None:
+    """With the in-memory search backend, pages and facets both come from the index."""
+    monkeypatch.setattr(browse_service_logic.config, "SEARCH_BACKEND", "memory")
+    monkeypatch.setattr(browse_service_logic, "fetch_indexed_browse_titles", lambda **kwargs: [])
+    monkeypatch.setattr(
+        browse_service_logic,
+        "fetch_indexed_browse_facets",
+        lambda **kwargs: {"genre": []},
+    )
+
+    def fail_fetch(**kwargs):
+        raise AssertionError("Postgres should not be queried")
+
+    monkeypatch.setattr(browse_service_logic, "fetch_browse_facets", fail_fetch)
+
+    result = browse_service_logic.browse_titles(None, None, None, 0, 10, facets=["genre"])
+
+    assert result["facets"] == {"genre": []}
+
+
+def test_browse_titles_uses_title_order_for_relevance_without_search(monkeypatch) -> None:
+    """Relevance needs search words; without them the title order is used."""
+    captured: dict = {}
+
+    def fake_fetch_browse_titles(**kwargs):
+        captured.update(kwargs)
+        return []
+
+    monkeypatch.setattr(browse_service_logic, "fetch_browse_titles", fake_fetch_browse_titles)
+
+    browse_service_logic.browse_titles(None, None, None, 0, 10, sort="relevance")
+    assert captured["sort"] == "title_asc"
+
+    browse_service_logic.browse_titles("matrix", None, None, 0, 10, sort="relevance")
+    assert captured["sort"] == "relevance"
+
+
+def test_browse_titles_falls_back_to_fuzzy_when_exact_hits_are_few(monkeypatch) -> None:
+    """Auto mode retries a sparse first page fuzzily; fuzzy mode skips the exact query."""
+    exact_calls: list[dict] = []
+    fuzzy_calls: list[dict] = []
+    fuzzy_row = (3, "tt0000003", "The Matrix", 1999, "movie")
+
+    def fake_fetch_browse_titles(**kwargs):
+        exact_calls.append(kwargs)
+        return []
+
+    def fake_fetch_fuzzy_browse_titles(**kwargs):
+        fuzzy_calls.append(kwargs)
+        return [fuzzy_row]
+
+    monkeypatch.setattr(browse_service_logic.config, "SEARCH_FUZZY_MIN_EXACT_HITS", 3)
+    monkeypatch.setattr(browse_service_logic.config, "SEARCH_FUZZY_SIMILARITY_THRESHOLD", 0.5)
+    monkeypatch.setattr(browse_service_logic, "fetch_browse_titles", fake_fetch_browse_titles)
+    monkeypatch.setattr(
+        browse_service_logic, "fetch_fuzzy_browse_titles", fake_fetch_fuzzy_browse_titles
+    )
+
+    auto = browse_service_logic.browse_titles("matrx", None, None, 0, 10)
+    assert auto["match_mode"] == "fuzzy"
+    assert [item["id"] for item in auto["results"]] == [3]
+    assert len(exact_calls) == 1
+    assert fuzzy_calls[-1]["search_words"] == ["matrx"]
+    assert fuzzy_calls[-1]["similarity_threshold"] == 0.5
+
+    later_page = browse_service_logic.browse_titles("matrx", None, None, 10, 10)
+    assert later_page["match_mode"] == "exact"
+    assert len(fuzzy_calls) == 1
+
+    fuzzy = browse_service_logic.browse_titles(
+        "matrx", None, None, 10, 10, match="fuzzy", similarity_threshold=0.3
+    )
+    assert fuzzy["match_mode"] == "fuzzy"
+    assert len(exact_calls) == 2
+    assert fuzzy_calls[-1]["offset"] == 10
+    assert fuzzy_calls[-1]["similarity_threshold"] == 0.3
+
+    exact = browse_service_logic.browse_titles("matrx", None, None, 0, 10, match="exact")
+    assert exact["match_mode"] == "exact"
+    assert len(fuzzy_calls) == 2
+
+
+def test_browse_titles_counts_facets_over_fuzzy_matches(monkeypatch) -> None:
+    """A fuzzy page gets facet counts over the fuzzy matches, even with the index backend."""
+    facet_calls: list[dict] = []
+
+    def fake_fetch_browse_facets(**kwargs):
+        facet_calls.append(kwargs)
+        return {"year": [{"year": 1999, "count": 1}]}
+
+    def fail_fetch(**kwargs):
+        raise AssertionError("exact facets must not be used for a fuzzy page")
+
+    monkeypatch.setattr(browse_service_logic.config, "SEARCH_BACKEND", "memory")
+    monkeypatch.setattr(browse_service_logic.config, "SEARCH_FUZZY_SIMILARITY_THRESHOLD", 0.5)
+    monkeypatch.setattr(browse_service_logic, "fetch_indexed_browse_facets", fail_fetch)
+    monkeypatch.setattr(browse_service_logic, "fetch_browse_facets", fake_fetch_browse_facets)
+    monkeypatch.setattr(
+        browse_service_logic,
+        "fetch_fuzzy_browse_titles",
+        lambda **kwargs: [(3, "tt0000003", "The Matrix", 1999, "movie")],
+    )
+
+    result = browse_service_logic.browse_titles(
+        "matrx", None, None, 0, 10, facets=["year"], match="fuzzy"
+    )
+
+    assert result["match_mode"] == "fuzzy"
+    assert result["facets"] == {"year": [{"year": 1999, "count": 1}]}
+    assert facet_calls[0]["search_words"] == ["matrx"]
+    assert facet_calls[0]["similarity_threshold"] == 0.5
+
+
+def test_export_titles_renders_batches_and_closes_the_cursor(monkeypatch) -> None:
+    """Export should render provider batches as NDJSON or CSV and close the source."""
+    closed: list[bool] = []
+
+    def fake_iter_browse_titles(**kwargs):
+        assert kwargs["search_words"] == ["matrix"]
+        try:
+            yield [(10, "tt0133093", "The Matrix", 1999, "movie")]
+            yield [(11, None, "The Matrix, Reloaded", None, "movie")]
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(browse_service_logic, "iter_browse_titles", fake_iter_browse_titles)
+
+    ndjson = "".join(browse_service_logic.export_titles("matrix", None, None, "ndjson"))
+    csv_text = "".join(browse_service_logic.export_titles("matrix", None, None, "csv"))
+
+    assert ndjson.splitlines()[1] == (
+        '{"id": 11, "imdb_reference_id": null, "title": "The Matrix, Reloaded", '
+        '"release_year": null, "media_type": "movie"}'
+    )
+    assert csv_text.splitlines() == [
+        "id,imdb_reference_id,title,release_year,media_type",
+        "10,tt0133093,The Matrix,1999,movie",
+        '11,,"The Matrix, Reloaded",,movie',
+    ]
+    assert closed == [True, True]
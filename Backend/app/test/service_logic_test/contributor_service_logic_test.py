@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import pytest
 
-from app.core.exceptions import ContributorNotFound
+from app.core.exceptions import ContributorNotFound, ContributorPathNotFound, InvalidInputError
 import app.service_logic.contributor_service_logic as contributor_service_logic
 
 
@@ -52,6 +52,26 @@ def test_get_contributor_details_maps_contributor_and_titles(monkeypatch) -> Non
     }
 
 
+def test_get_contributor_details_skips_titles_when_not_requested(monkeypatch) -> None:
+    """Header-only requests should not load the filmography."""
+
+    def fail_fetch(contributor_id):
+        raise AssertionError("titles should not be fetched")
+
+    monkeypatch.setattr(
+        contributor_service_logic,
+        "fetch_contributor_by_id",
+        lambda contributor_id: (7, "nm0000206", "Keanu Reeves"),
+    )
+    monkeypatch.setattr(contributor_service_logic, "fetch_titles_by_contributor_id", fail_fetch)
+
+    result = contributor_service_logic.get_contributor_details(
+        7, fields={"id", "imdb_reference_id", "name"}
+    )
+
+    assert result == {"id": 7, "imdb_reference_id": "nm0000206", "name": "Keanu Reeves"}
+
+
 def test_get_contributor_details_raises_not_found_when_missing(monkeypatch) -> None:
     """Missing contributor row should raise ContributorNotFound."""
     monkeypatch.setattr(contributor_service_logic, "fetch_contributor_by_id", lambda _: None)
@@ -60,3 +80,95 @@ def test_get_contributor_details_raises_not_found_when_missing(monkeypatch) -> N
         contributor_service_logic.get_contributor_details(404)
 
     assert exc.value.message == "Contributor with ID 404 not found"
+
+
+def test_get_contributor_path_maps_path_rows(monkeypatch) -> None:
+    """Path rows should map to typed steps with the number of shared titles as degrees."""
+    captured: dict = {}
+
+    def fake_fetch_contributor_path(contributor_id, other_contributor_id, **kwargs):
+        captured.update(kwargs)
+        return [
+            ("contributor", 9, "nm0000401", "Carrie-Anne Moss"),
+            ("title", 10, "tt0133093", "The Matrix"),
+            ("contributor", 8, "nm0905154", "Lana Wachowski"),
+        ]
+
+    monkeypatch.setattr(
+        contributor_service_logic,
+        "fetch_contributor_by_id",
+        lambda contributor_id: (contributor_id, None, "Someone"),
+    )
+    monkeypatch.setattr(
+        contributor_service_logic,
+        "fetch_contributor_path",
+        fake_fetch_contributor_path,
+    )
+
+    result = contributor_service_logic.get_contributor_path(9, 8, max_degrees=2)
+
+    assert captured["max_degrees"] == 2
+    assert result["degrees"] == 1
+    assert result["path"][1] == {
+        "type": "title",
+        "id": 10,
+        "imdb_reference_id": "tt0133093",
+        "name": "The Matrix",
+    }
+
+
+def test_get_contributor_path_raises_when_not_connected(monkeypatch) -> None:
+    """A missing path should raise ContributorPathNotFound."""
+    monkeypatch.setattr(
+        contributor_service_logic,
+        "fetch_contributor_by_id",
+        lambda contributor_id: (contributor_id, None, "Someone"),
+    )
+    monkeypatch.setattr(
+        contributor_service_logic,
+        "fetch_contributor_path",
+        lambda *args, **kwargs: None,
+    )
+
+    with pytest.raises(ContributorPathNotFound) as exc:
+        contributor_service_logic.get_contributor_path(9, 12, max_degrees=None)
+
+    assert exc.value.error_code == 1003
+
+
+def test_search_contributors_pages_with_keyset_cursor(monkeypatch) -> None:
+    """A full page should carry a cursor that resumes after its last row."""
+    calls: list[dict] = []
+    rows = [
+        (7, "nm0000206", "Keanu Reeves", 42, 1.0),
+        (8, None, "Keanu Kapuni", 1, 1.0),
+        (9, None, "Keana Smith", 3, 0.6),
+    ]
+
+    def fake_fetch_contributor_search(query, page_size, similarity_threshold, after=None):
+        calls.append({"query": query, "page_size": page_size, "after": after})
+        return rows[:page_size] if after is None else rows[2:]
+
+    monkeypatch.setattr(
+        contributor_service_logic, "fetch_contributor_search", fake_fetch_contributor_search
+    )
+
+    first = contributor_service_logic.search_contributors("keanu", page_size=2)
+    second = contributor_service_logic.search_contributors(
+        "keanu", page_size=2, cursor=first["next_cursor"]
+    )
+
+    assert [item["id"] for item in first["results"]] == [7, 8]
+    assert first["results"][0]["title_count"] == 42
+    assert calls[0] == {"query": "keanu", "page_size": 3, "after": None}
+    assert calls[1]["after"] == (1.0, 1, 8)
+    assert [item["id"] for item in second["results"]] == [9]
+    assert second["next_cursor"] is None
+
+
+def test_search_contributors_rejects_malformed_cursor() -> None:
+    """Cursors that do not decode to a sort key are invalid input."""
+    with pytest.raises(InvalidInputError) as exc:
+        contributor_service_logic.search_contributors("keanu", page_size=2, cursor="bm9wZQ")
+
+    assert exc.value.message == "Invalid input: cursor is invalid"
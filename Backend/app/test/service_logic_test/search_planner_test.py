@@ -0,0 +1,84 @@
+"""Service logic tests for browse search word planning."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core import config
+import app.service_logic.search_planner as search_planner
+
+TOKEN_COUNTS = {"": 1000, "the": 600, "of": 450, "lord": 12, "rings": 8, "war": 90}
+
+
+@pytest.fixture(autouse=True)
+def _token_counts(monkeypatch):
+    lookups: list[list[str]] = []
+
+    def fake_fetch_search_token_counts(tokens: list[str]) -> dict[str, int]:
+        lookups.append(sorted(tokens))
+        return {token: TOKEN_COUNTS[token] for token in tokens if token in TOKEN_COUNTS}
+
+    monkeypatch.setattr(
+        search_planner,
+        "fetch_search_token_counts",
+        fake_fetch_search_token_counts,
+    )
+    search_planner.clear_search_planner_cache()
+    yield lookups
+    search_planner.clear_search_planner_cache()
+
+
+def test_plan_orders_rarest_first_and_drops_stopwords() -> None:
+    """Frequent words should be dropped and the rest ordered by title count."""
+    words = ["The", "Lord", "of", "the", "Rings", "war"]
+
+    assert search_planner.plan_search_words(words) == ["rings", "lord", "war"]
+
+
+def test_plan_keeps_most_selective_word_when_all_are_stopwords() -> None:
+    """A query of only frequent words should still search by its rarest word."""
+    assert search_planner.plan_search_words(["the", "of"]) == ["of"]
+
+
+def test_plan_treats_short_unknown_words_as_unselective(monkeypatch) -> None:
+    """Unknown short fragments match broadly; unknown long words are rare."""
+    monkeypatch.setattr(config, "SEARCH_STOPWORD_FRACTION", 1.0)
+
+    assert search_planner.plan_search_words(["xy", "war", "zyzzyva"]) == ["zyzzyva", "war", "xy"]
+
+
+def test_plan_without_statistics_keeps_word_order(monkeypatch) -> None:
+    """Without a total title count the words are only de-duplicated."""
+    monkeypatch.setattr(search_planner, "fetch_search_token_counts", lambda tokens: {})
+
+    assert search_planner.plan_search_words(["war", "the", "WAR"]) == ["war", "the"]
+
+
+def test_plan_caches_token_counts(_token_counts) -> None:
+    """Repeated words should be served from the per-process cache."""
+    search_planner.plan_search_words(["lord", "rings"])
+    search_planner.plan_search_words(["rings", "war"])
+
+    assert _token_counts == [["", "lord", "rings"], ["war"]]
+
+
+def test_plan_search_keeps_year_and_genre_words_as_search_words() -> None:
+    """A year or genre word may be part of a title, so it is not turned into a filter."""
+    plan = search_planner.plan_search(["2001", "Lord", "war"], None, None, None, "any")
+
+    assert plan == search_planner.SearchPlan(
+        words=["2001", "lord", "war"],
+        release_year=None,
+        genre_id=None,
+        genre_ids=None,
+        genre_mode="any",
+    )
+
+
+def test_plan_search_passes_explicit_filters_through() -> None:
+    """Filters set by the request are kept alongside the search words."""
+    plan = search_planner.plan_search(["2003", "war"], 1999, 3, [1], "any")
+
+    assert plan.words == ["2003", "war"]
+    assert plan.release_year == 1999
+    assert (plan.genre_id, plan.genre_ids, plan.genre_mode) == (3, [1], "any")
@@ -57,6 +57,29 @@ def test_get_title_details_maps_title_genres_and_contributors(monkeypatch) -> No
     }
 
 
+def test_get_title_details_skips_sections_left_out_of_fields(monkeypatch) -> None:
+    """Only requested sections should be queried and only requested fields returned."""
+
+    def fail_fetch(title_id):
+        raise AssertionError("section should not be fetched")
+
+    monkeypatch.setattr(
+        title_service_logic,
+        "fetch_title_by_id",
+        lambda title_id: (10, "tt0133093", "The Matrix", 1999, "movie"),
+    )
+    monkeypatch.setattr(
+        title_service_logic, "fetch_genres_by_title_id", lambda title_id: ["Action"]
+    )
+    monkeypatch.setattr(title_service_logic, "fetch_contributors_by_title_id", fail_fetch)
+
+    header_only = title_service_logic.get_title_details(10, fields={"id", "title"})
+    with_genres = title_service_logic.get_title_details(10, fields={"id", "genres"})
+
+    assert header_only == {"id": 10, "title": "The Matrix"}
+    assert with_genres == {"id": 10, "genres": ["Action"]}
+
+
 def test_get_title_details_raises_not_found_when_title_missing(monkeypatch) -> None:
     """Missing title row should raise TitleNotFound."""
     monkeypatch.setattr(title_service_logic, "fetch_title_by_id", lambda _: None)
@@ -65,3 +88,42 @@ def test_get_title_details_raises_not_found_when_title_missing(monkeypatch) -> N
         title_service_logic.get_title_details(999)
 
     assert exc.value.message == "Movie with ID 999 not found"
+
+
+def test_get_related_titles_maps_rows_with_scores(monkeypatch) -> None:
+    """Related titles should keep provider order and expose similarity scores."""
+    monkeypatch.setattr(
+        title_service_logic,
+        "fetch_title_by_id",
+        lambda title_id: (10, "tt0133093", "The Matrix", 1999, "movie"),
+    )
+
+    def fake_fetch_related_titles(title_id: int, limit: int):
+        assert (title_id, limit) == (10, 5)
+        return [(11, "tt0234215", "The Matrix Reloaded", 2003, "movie", 0.83)]
+
+    monkeypatch.setattr(title_service_logic, "fetch_related_titles", fake_fetch_related_titles)
+
+    result = title_service_logic.get_related_titles(10, 5)
+
+    assert result == {
+        "title_id": 10,
+        "results": [
+            {
+                "id": 11,
+                "imdb_reference_id": "tt0234215",
+                "title": "The Matrix Reloaded",
+                "release_year": 2003,
+                "media_type": "movie",
+                "score": 0.83,
+            }
+        ],
+    }
+
+
+def test_get_related_titles_raises_not_found_when_title_missing(monkeypatch) -> None:
+    """Missing title row should raise TitleNotFound before reading similarities."""
+    monkeypatch.setattr(title_service_logic, "fetch_title_by_id", lambda _: None)
+
+    with pytest.raises(TitleNotFound):
+        title_service_logic.get_related_titles(999, 10)